@@ -5,6 +5,7 @@ from frappe.utils import (
 	add_days,
 	add_months,
 	cint,
+	create_batch,
 	date_diff,
 	flt,
 	get_first_day,
@@ -20,6 +21,9 @@ from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 )
 from erpnext.accounts.utils import get_account_currency
 
+# number of invoices whose bookings are computed and posted together
+DEFERRED_ACCOUNTING_BATCH_SIZE = 500
+
 
 def validate_service_stop_date(doc):
 	"""Validates service_stop_date for Purchase Invoice and Sales Invoice"""
@@ -83,14 +87,13 @@ def convert_deferred_expense_to_expense(deferred_process, start_date=None, end_d
 		and item.enable_deferred_expense = 1 and item.parent=p.name
 		and item.docstatus = 1 and ifnull(item.amount, 0) > 0
 		{conditions}
+		order by item.parent
 	""",
 		(end_date, start_date),
 	)  # nosec
 
 	# For each invoice, book deferred expense
-	for invoice in invoices:
-		doc = frappe.get_doc("Purchase Invoice", invoice)
-		book_deferred_income_or_expense(doc, deferred_process, end_date)
+	book_deferred_income_or_expense_in_batches("Purchase Invoice", invoices, deferred_process, end_date)
 
 	if frappe.flags.deferred_accounting_error:
 		send_mail(deferred_process)
@@ -113,19 +116,18 @@ def convert_deferred_revenue_to_income(deferred_process, start_date=None, end_da
 		and item.enable_deferred_revenue = 1 and item.parent=p.name
 		and item.docstatus = 1 and ifnull(item.amount, 0) > 0
 		{conditions}
+		order by item.parent
 	""",
 		(end_date, start_date),
 	)  # nosec
 
-	for invoice in invoices:
-		doc = frappe.get_doc("Sales Invoice", invoice)
-		book_deferred_income_or_expense(doc, deferred_process, end_date)
+	book_deferred_income_or_expense_in_batches("Sales Invoice", invoices, deferred_process, end_date)
 
 	if frappe.flags.deferred_accounting_error:
 		send_mail(deferred_process)
 
 
-def get_booking_dates(doc, item, posting_date=None, prev_posting_date=None):
+def get_booking_dates(doc, item, posting_date=None, prev_posting_date=None, booking_ledger=None):
 	if not posting_date:
 		posting_date = add_days(today(), -1)
 
@@ -135,7 +137,13 @@ def get_booking_dates(doc, item, posting_date=None, prev_posting_date=None):
 		"deferred_revenue_account" if doc.doctype == "Sales Invoice" else "deferred_expense_account"
 	)
 
-	if not prev_posting_date:
+	if not prev_posting_date and booking_ledger:
+		if last_booking_date := booking_ledger.get_last_booking_date(item.name, item.get(deferred_account)):
+			start_date = getdate(add_days(last_booking_date, 1))
+		else:
+			start_date = item.service_start_date
+
+	elif not prev_posting_date:
 		prev_gl_entry = frappe.db.sql(
 			"""
 			select name, posting_date from `tabGL Entry` where company=%s and account=%s and
@@ -189,7 +197,15 @@ def get_booking_dates(doc, item, posting_date=None, prev_posting_date=None):
 
 
 def calculate_monthly_amount(
-	doc, item, last_gl_entry, start_date, end_date, total_days, total_booking_days, account_currency
+	doc,
+	item,
+	last_gl_entry,
+	start_date,
+	end_date,
+	total_days,
+	total_booking_days,
+	account_currency,
+	booking_ledger=None,
 ):
 	amount, base_amount = 0, 0
 
@@ -207,7 +223,7 @@ def calculate_monthly_amount(
 		actual_months = rounded(total_months * prorate_factor, 1)
 
 		already_booked_amount, already_booked_amount_in_account_currency = get_already_booked_amount(
-			doc, item
+			doc, item, booking_ledger
 		)
 		base_amount = flt(item.base_net_amount / actual_months, item.precision("base_net_amount"))
 
@@ -230,7 +246,7 @@ def calculate_monthly_amount(
 			amount = rounded(partial_month, 1) * amount
 	else:
 		already_booked_amount, already_booked_amount_in_account_currency = get_already_booked_amount(
-			doc, item
+			doc, item, booking_ledger
 		)
 		base_amount = flt(item.base_net_amount - already_booked_amount, item.precision("base_net_amount"))
 		if account_currency == doc.company_currency:
@@ -243,7 +259,9 @@ def calculate_monthly_amount(
 	return amount, base_amount
 
 
-def calculate_amount(doc, item, last_gl_entry, total_days, total_booking_days, account_currency):
+def calculate_amount(
+	doc, item, last_gl_entry, total_days, total_booking_days, account_currency, booking_ledger=None
+):
 	amount, base_amount = 0, 0
 	if not last_gl_entry:
 		base_amount = flt(
@@ -255,7 +273,7 @@ def calculate_amount(doc, item, last_gl_entry, total_days, total_booking_days, a
 			amount = flt(item.net_amount * total_booking_days / flt(total_days), item.precision("net_amount"))
 	else:
 		already_booked_amount, already_booked_amount_in_account_currency = get_already_booked_amount(
-			doc, item
+			doc, item, booking_ledger
 		)
 
 		base_amount = flt(item.base_net_amount - already_booked_amount, item.precision("base_net_amount"))
@@ -269,7 +287,7 @@ def calculate_amount(doc, item, last_gl_entry, total_days, total_booking_days, a
 	return amount, base_amount
 
 
-def get_already_booked_amount(doc, item):
+def get_already_booked_amount(doc, item, booking_ledger=None):
 	if doc.doctype == "Sales Invoice":
 		total_credit_debit, total_credit_debit_currency = "debit", "debit_in_account_currency"
 		deferred_account = "deferred_revenue_account"
@@ -277,6 +295,15 @@ def get_already_booked_amount(doc, item):
 		total_credit_debit, total_credit_debit_currency = "credit", "credit_in_account_currency"
 		deferred_account = "deferred_expense_account"
 
+	if booking_ledger:
+		already_booked_amount, already_booked_amount_in_account_currency = booking_ledger.get_booked_amount(
+			item.name, item.get(deferred_account)
+		)
+		if doc.currency == doc.company_currency:
+			already_booked_amount_in_account_currency = already_booked_amount
+
+		return already_booked_amount, already_booked_amount_in_account_currency
+
 	gl_entries_details = frappe.db.sql(
 		"""
 		select sum({}) as total_credit, sum({}) as total_credit_in_account_currency, voucher_detail_no
@@ -315,8 +342,17 @@ def get_already_booked_amount(doc, item):
 	return already_booked_amount, already_booked_amount_in_account_currency
 
 
-def book_deferred_income_or_expense(doc, deferred_process, posting_date=None):
+def book_deferred_income_or_expense(
+	doc, deferred_process, posting_date=None, booking_ledger=None, buffered_gl_entries=None
+):
+	"""Book deferred income/expense of all items of `doc` up to `posting_date`.
+
+	`booking_ledger` (a `DeferredBookingLedger`) replaces the per item ledger lookups and
+	GL entries are appended to `buffered_gl_entries` instead of being posted, if passed."""
 	enable_check = "enable_deferred_revenue" if doc.doctype == "Sales Invoice" else "enable_deferred_expense"
+	deferred_account = (
+		"deferred_revenue_account" if doc.doctype == "Sales Invoice" else "deferred_expense_account"
+	)
 
 	accounts_frozen_upto = frappe.db.get_single_value("Accounts Settings", "acc_frozen_upto")
 
@@ -328,7 +364,11 @@ def book_deferred_income_or_expense(doc, deferred_process, posting_date=None):
 		prev_posting_date=None,
 	):
 		start_date, end_date, last_gl_entry = get_booking_dates(
-			doc, item, posting_date=posting_date, prev_posting_date=prev_posting_date
+			doc,
+			item,
+			posting_date=posting_date,
+			prev_posting_date=prev_posting_date,
+			booking_ledger=booking_ledger,
 		)
 		if not (start_date and end_date):
 			return
@@ -354,10 +394,11 @@ def book_deferred_income_or_expense(doc, deferred_process, posting_date=None):
 				total_days,
 				total_booking_days,
 				account_currency,
+				booking_ledger,
 			)
 		else:
 			amount, base_amount = calculate_amount(
-				doc, item, last_gl_entry, total_days, total_booking_days, account_currency
+				doc, item, last_gl_entry, total_days, total_booking_days, account_currency, booking_ledger
 			)
 
 		if not amount:
@@ -399,6 +440,16 @@ def book_deferred_income_or_expense(doc, deferred_process, posting_date=None):
 					item.cost_center,
 					item,
 					deferred_process,
+					buffered_gl_entries,
+				)
+
+			if booking_ledger and not frappe.flags.deferred_accounting_error:
+				booking_ledger.add_booking(
+					item.name,
+					item.get(deferred_account),
+					gl_posting_date,
+					base_amount,
+					amount,
 				)
 
 		# Returned in case of any errors because it tries to submit the same record again and again in case of errors
@@ -429,6 +480,154 @@ def book_deferred_income_or_expense(doc, deferred_process, posting_date=None):
 			)
 
 
+class DeferredBookingLedger:
+	"""Deferred amounts already booked for a set of invoices, with the date of their last booking.
+
+	Everything is fetched in two grouped queries (GL Entries and Journal Entries) and kept up to
+	date with `add_booking` while the bookings of the batch are buffered."""
+
+	def __init__(self, doctype, invoices):
+		self.bookings = {}
+
+		dr_or_cr = "debit" if doctype == "Sales Invoice" else "credit"
+		gl_bookings = frappe.db.sql(
+			f"""
+			select voucher_detail_no as detail_no, account, max(posting_date) as posting_date,
+				sum({dr_or_cr}) as amount, sum({dr_or_cr}_in_account_currency) as amount_in_account_currency
+			from `tabGL Entry` where voucher_type=%s and voucher_no in %s and is_cancelled = 0
+			group by voucher_detail_no, account
+		""",
+			(doctype, tuple(invoices)),
+			as_dict=True,
+		)  # nosec
+
+		journal_bookings = frappe.db.sql(
+			f"""
+			SELECT c.reference_detail_no as detail_no, c.account, max(p.posting_date) as posting_date,
+				sum(c.{dr_or_cr}) as amount, sum(c.{dr_or_cr}_in_account_currency) as amount_in_account_currency
+			FROM `tabJournal Entry` p, `tabJournal Entry Account` c WHERE p.name = c.parent
+			and c.reference_type=%s and c.reference_name in %s and p.docstatus < 2
+			group by c.reference_detail_no, c.account
+		""",
+			(doctype, tuple(invoices)),
+			as_dict=True,
+		)  # nosec
+
+		for booking in gl_bookings + journal_bookings:
+			self.add_booking(
+				booking.detail_no,
+				booking.account,
+				booking.posting_date,
+				booking.amount,
+				booking.amount_in_account_currency,
+			)
+
+	def add_booking(self, detail_no, account, posting_date, base_amount, amount):
+		booking = self.bookings.setdefault(
+			(detail_no, account),
+			frappe._dict(posting_date=None, base_amount=0.0, amount=0.0),
+		)
+		if posting_date and (not booking.posting_date or getdate(posting_date) > booking.posting_date):
+			booking.posting_date = getdate(posting_date)
+
+		booking.base_amount += flt(base_amount)
+		booking.amount += flt(amount)
+
+	def get_last_booking_date(self, detail_no, account):
+		if booking := self.bookings.get((detail_no, account)):
+			return booking.posting_date
+
+	def get_booked_amount(self, detail_no, account):
+		if booking := self.bookings.get((detail_no, account)):
+			return booking.base_amount, booking.amount
+
+		return 0, 0
+
+
+def book_deferred_income_or_expense_in_batches(doctype, invoices, deferred_process, posting_date=None):
+	"""Book deferred income/expense for `invoices` in batches of `DEFERRED_ACCOUNTING_BATCH_SIZE`.
+
+	The bookings of a batch are computed against a single `DeferredBookingLedger` and posted with
+	one commit. The invoice type and the last invoice of every committed batch are saved on the
+	Process Deferred Accounting document, so an interrupted run resumes after it."""
+	checkpoint_type, checkpoint = get_checkpoint(deferred_process)
+	if checkpoint_type == doctype and checkpoint in invoices:
+		invoices = invoices[invoices.index(checkpoint) + 1 :]
+
+	for batch in create_batch(invoices, DEFERRED_ACCOUNTING_BATCH_SIZE):
+		booking_ledger = DeferredBookingLedger(doctype, batch)
+		buffered_gl_entries = []
+
+		for invoice in batch:
+			doc = frappe.get_doc(doctype, invoice)
+			book_deferred_income_or_expense(
+				doc,
+				deferred_process,
+				posting_date,
+				booking_ledger=booking_ledger,
+				buffered_gl_entries=buffered_gl_entries,
+			)
+
+		if not post_buffered_gl_entries(buffered_gl_entries):
+			# book the batch entry by entry so that only the failing invoices are left out
+			for invoice in batch:
+				doc = frappe.get_doc(doctype, invoice)
+				book_deferred_income_or_expense(doc, deferred_process, posting_date)
+
+		checkpoint_type = doctype
+		set_checkpoint(deferred_process, doctype, batch[-1])
+		frappe.db.commit()
+
+	# the checkpoint of another invoice type belongs to a phase that is still pending
+	if checkpoint_type == doctype:
+		set_checkpoint(deferred_process, None, None)
+
+
+def get_checkpoint(deferred_process):
+	if not deferred_process:
+		return None, None
+
+	return frappe.db.get_value(
+		"Process Deferred Accounting",
+		deferred_process,
+		["last_processed_invoice_type", "last_processed_invoice"],
+	) or (None, None)
+
+
+def set_checkpoint(deferred_process, invoice_type, invoice):
+	if deferred_process:
+		frappe.db.set_value(
+			"Process Deferred Accounting",
+			deferred_process,
+			{"last_processed_invoice_type": invoice_type, "last_processed_invoice": invoice},
+			update_modified=False,
+		)
+
+
+def post_buffered_gl_entries(gl_entries):
+	"""Post buffered GL entries, grouped by voucher and posting date. Returns False on failure."""
+	from erpnext.accounts.general_ledger import make_gl_entries
+
+	gl_map_by_voucher = {}
+	for gle in gl_entries:
+		gl_map_by_voucher.setdefault((gle.voucher_type, gle.voucher_no, gle.posting_date), []).append(gle)
+
+	try:
+		for gl_map in gl_map_by_voucher.values():
+			# entries of different periods can share a posting date when the books are frozen
+			make_gl_entries(gl_map, merge_entries=False)
+	except Exception as e:
+		frappe.db.rollback()
+		frappe.log_error(
+			f"Error while processing deferred accounting for {gl_map[0].voucher_type} {gl_map[0].voucher_no}"
+		)
+		if frappe.flags.in_test:
+			raise e
+		return False
+
+	return True
+
+
 def process_deferred_accounting(posting_date=None):
 	"""Converts deferred income/expense into income/expense
 	Executed via background jobs on every month end"""
@@ -476,6 +675,7 @@ def make_gl_entries(
 	cost_center,
 	item,
 	deferred_process=None,
+	buffered_gl_entries=None,
 ):
 	# GL Entry for crediting the amount in the deferred expense
 	from erpnext.accounts.general_ledger import make_gl_entries
@@ -522,6 +722,11 @@ def make_gl_entries(
 		)
 	)
 
+	if buffered_gl_entries is not None:
+		# posted together with the rest of the batch in `post_buffered_gl_entries`
+		buffered_gl_entries.extend(gl_entries)
+		return
+
 	if gl_entries:
 		try:
 			make_gl_entries(gl_entries, cancel=(doc.docstatus == 2), merge_entries=True)
@@ -13,7 +13,7 @@ from frappe.utils import flt, get_link_to_form
 import erpnext
 from erpnext.accounts.doctype.journal_entry.journal_entry import get_balance_on
 from erpnext.accounts.utils import get_currency_precision
-from erpnext.setup.utils import get_exchange_rate
+from erpnext.setup.utils import get_exchange_rates
 
 
 class ExchangeRateRevaluation(Document):
@@ -256,12 +256,17 @@ class ExchangeRateRevaluation(Document):
 		)
 
 		if account_details:
+			exchange_rates = get_exchange_rates(
+				{(d.account_currency, company_currency) for d in account_details if not d.zero_balance},
+				posting_date,
+			)
+
 			# Handle Accounts with balance in both Account/Base Currency
 			for d in [x for x in account_details if not x.zero_balance]:
 				current_exchange_rate = (
 					d.balance / d.balance_in_account_currency if d.balance_in_account_currency else 0
 				)
-				new_exchange_rate = get_exchange_rate(d.account_currency, company_currency, posting_date)
+				new_exchange_rate = exchange_rates.get((d.account_currency, company_currency))
 				new_balance_in_base_currency = flt(d.balance_in_account_currency * new_exchange_rate)
 				gain_loss = flt(new_balance_in_base_currency, precision) - flt(d.balance, precision)
 
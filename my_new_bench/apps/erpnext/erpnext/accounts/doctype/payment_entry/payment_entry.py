@@ -42,6 +42,7 @@ from erpnext.accounts.party import (
 	complete_contact_details,
 	get_default_contact,
 	get_party_account,
+	get_party_accounts,
 )
 from erpnext.accounts.utils import (
 	cancel_exchange_gain_loss_journal,
@@ -56,7 +57,7 @@ from erpnext.controllers.accounts_controller import (
 	get_supplier_block_status,
 	validate_taxes_and_charges,
 )
-from erpnext.setup.utils import get_exchange_rate
+from erpnext.setup.utils import get_exchange_rate, preload_exchange_rates
 
 
 class InvalidPaymentEntry(ValidationError):
@@ -312,20 +313,6 @@ class PaymentEntry(AccountsController):
 					title=_("Invalid Allocated Amount"),
 				)
 
-	def term_based_allocation_enabled_for_reference(
-		self, reference_doctype: str, reference_name: str
-	) -> bool:
-		if (
-			reference_doctype
-			and reference_doctype in ["Sales Invoice", "Sales Order", "Purchase Order", "Purchase Invoice"]
-			and reference_name
-		):
-			if template := frappe.db.get_value(reference_doctype, reference_name, "payment_terms_template"):
-				return frappe.db.get_value(
-					"Payment Terms Template", template, "allocate_payment_based_on_payment_terms"
-				)
-		return False
-
 	def validate_allocated_amount_with_latest_data(self):
 		if not self.references:
 			return
@@ -354,13 +341,14 @@ class PaymentEntry(AccountsController):
 			d = frappe._dict(d)
 			latest_lookup.setdefault((d.voucher_type, d.voucher_no), frappe._dict())[d.payment_term] = d
 
+		term_based_allocation = get_term_based_allocation_map(self.references)
+
 		for idx, d in enumerate(self.get("references"), start=1):
 			latest = latest_lookup.get((d.reference_doctype, d.reference_name)) or frappe._dict()
+			term_based_allocation_enabled = term_based_allocation.get((d.reference_doctype, d.reference_name))
 
 			# If term based allocation is enabled, throw
-			if (
-				d.payment_term is None or d.payment_term == ""
-			) and self.term_based_allocation_enabled_for_reference(d.reference_doctype, d.reference_name):
+			if (d.payment_term is None or d.payment_term == "") and term_based_allocation_enabled:
 				frappe.throw(
 					_(
 						"{0} has Payment Term based allocation enabled. Select a Payment Term for Row #{1} in Payment References section"
@@ -396,7 +384,7 @@ class PaymentEntry(AccountsController):
 					and latest.payment_term_outstanding
 					and (flt(d.allocated_amount) > flt(latest.payment_term_outstanding))
 				)
-				and self.term_based_allocation_enabled_for_reference(d.reference_doctype, d.reference_name)
+				and term_based_allocation_enabled
 			):
 				frappe.throw(
 					_(
@@ -491,22 +479,33 @@ class PaymentEntry(AccountsController):
 		update_ref_details_only_for: list | None = None,
 		reference_exchange_details: dict | None = None,
 	) -> None:
-		for d in self.get("references"):
-			if not d.allocated_amount:
-				continue
-
-			if update_ref_details_only_for and (
-				(d.reference_doctype, d.reference_name) not in update_ref_details_only_for
-			):
-				continue
-
-			ref_details = get_reference_details(
-				d.reference_doctype,
-				d.reference_name,
-				self.party_account_currency,
-				self.party_type,
-				self.party,
+		references = [
+			d
+			for d in self.get("references")
+			if d.allocated_amount
+			and not (
+				update_ref_details_only_for
+				and (d.reference_doctype, d.reference_name) not in update_ref_details_only_for
 			)
+		]
+		reference_details = get_reference_details_map(
+			references, self.party_account_currency, self.party_type, self.party
+		)
+
+		for d in references:
+			ref_details = reference_details.get((d.reference_doctype, d.reference_name))
+			if not ref_details:
+				# raises for missing vouchers, same as the unbatched lookup
+				ref_details = get_reference_details(
+					d.reference_doctype,
+					d.reference_name,
+					self.party_account_currency,
+					self.party_type,
+					self.party,
+				)
+			else:
+				# rows sharing a voucher must not see each other's exchange rate override
+				ref_details = frappe._dict(ref_details)
 
 			# Only update exchange rate when the reference is Journal Entry
 			if (
@@ -574,9 +573,13 @@ class PaymentEntry(AccountsController):
 		if not valid_reference_doctypes:
 			return
 
-		for d in self.get("references"):
-			if not d.allocated_amount:
-				continue
+		references = [d for d in self.get("references") if d.allocated_amount]
+		ref_vouchers = get_reference_vouchers(
+			[d for d in references if d.reference_doctype in valid_reference_doctypes]
+		)
+		journal_entries_validated = False
+
+		for d in references:
 			if d.reference_doctype not in valid_reference_doctypes:
 				frappe.throw(
 					_("Reference Doctype must be one of {0}").format(
@@ -585,11 +588,10 @@ class PaymentEntry(AccountsController):
 				)
 
 			elif d.reference_name:
-				if not frappe.db.exists(d.reference_doctype, d.reference_name):
+				ref_doc = ref_vouchers.get((d.reference_doctype, d.reference_name))
+				if not ref_doc:
 					frappe.throw(_("{0} {1} does not exist").format(d.reference_doctype, d.reference_name))
 
-				ref_doc = frappe.get_doc(d.reference_doctype, d.reference_name)
-
 				if d.reference_doctype != "Journal Entry":
 					if self.party != ref_doc.get(scrub(self.party_type)):
 						frappe.throw(
@@ -597,19 +599,20 @@ class PaymentEntry(AccountsController):
 								_(d.reference_doctype), d.reference_name, _(self.party_type), self.party
 							)
 						)
-				else:
+				elif not journal_entries_validated:
+					# validates every Journal Entry reference in one go
 					self.validate_journal_entry()
+					journal_entries_validated = True
 
 				if d.reference_doctype in frappe.get_hooks("invoice_doctypes"):
 					if self.party_type == "Customer":
-						ref_party_account = (
-							get_party_account_based_on_invoice_discounting(d.reference_name)
-							or ref_doc.debit_to
-						)
+						ref_party_account = get_party_account_based_on_invoice_discounting(
+							d.reference_name
+						) or ref_doc.get("debit_to")
 					elif self.party_type == "Supplier":
-						ref_party_account = ref_doc.credit_to
+						ref_party_account = ref_doc.get("credit_to")
 					elif self.party_type == "Employee":
-						ref_party_account = ref_doc.payable_account
+						ref_party_account = ref_doc.get("payable_account")
 
 					if (
 						ref_party_account != self.party_account
@@ -624,13 +627,13 @@ class PaymentEntry(AccountsController):
 							)
 						)
 
-					if ref_doc.doctype == "Purchase Invoice" and ref_doc.get("on_hold"):
+					if d.reference_doctype == "Purchase Invoice" and ref_doc.get("on_hold"):
 						frappe.throw(
 							_("{0} {1} is on hold").format(_(d.reference_doctype), d.reference_name),
 							title=_("Invalid Purchase Invoice"),
 						)
 
-				if ref_doc.docstatus != 1:
+				if ref_doc.get("docstatus") != 1:
 					frappe.throw(
 						_("{0} {1} must be submitted").format(_(d.reference_doctype), d.reference_name)
 					)
@@ -646,15 +649,16 @@ class PaymentEntry(AccountsController):
 	def validate_paid_invoices(self):
 		no_oustanding_refs = {}
 
-		for d in self.get("references"):
-			if not d.allocated_amount:
-				continue
+		references = [
+			d
+			for d in self.get("references")
+			if d.allocated_amount and d.reference_doctype in ("Sales Invoice", "Purchase Invoice")
+		]
+		ref_vouchers = get_reference_vouchers(references)
 
-			if d.reference_doctype in ("Sales Invoice", "Purchase Invoice"):
-				outstanding_amount, is_return = frappe.get_cached_value(
-					d.reference_doctype, d.reference_name, ["outstanding_amount", "is_return"]
-				)
-				if outstanding_amount <= 0 and not is_return:
+		for d in references:
+			if ref_doc := ref_vouchers.get((d.reference_doctype, d.reference_name)):
+				if ref_doc.outstanding_amount <= 0 and not ref_doc.is_return:
 					no_oustanding_refs.setdefault(d.reference_doctype, []).append(d)
 
 		for reference_doctype, references in no_oustanding_refs.items():
@@ -2368,17 +2372,38 @@ def get_outstanding_reference_documents(args, validate=False):
 			outstanding_invoices, args.get("company")
 		)
 
+		invoice_doctypes = frappe.get_hooks("invoice_doctypes")
+		invoice_vouchers = get_reference_vouchers(
+			[
+				frappe._dict(reference_doctype=d.voucher_type, reference_name=d.voucher_no)
+				for d in outstanding_invoices
+				if d.voucher_type in invoice_doctypes
+			]
+		)
+
+		if party_account_currency != company_currency:
+			journal_entry_dates = [
+				getdate(d.posting_date) for d in outstanding_invoices if d.voucher_type == "Journal Entry"
+			]
+			if journal_entry_dates:
+				preload_exchange_rates(
+					[(party_account_currency, company_currency)],
+					min(journal_entry_dates),
+					max(journal_entry_dates),
+				)
+
 		for d in outstanding_invoices:
+			invoice = invoice_vouchers.get((d.voucher_type, d.voucher_no)) or frappe._dict()
 			d["exchange_rate"] = 1
 			if party_account_currency != company_currency:
-				if d.voucher_type in frappe.get_hooks("invoice_doctypes"):
-					d["exchange_rate"] = frappe.db.get_value(d.voucher_type, d.voucher_no, "conversion_rate")
+				if d.voucher_type in invoice_doctypes:
+					d["exchange_rate"] = invoice.conversion_rate
 				elif d.voucher_type == "Journal Entry":
 					d["exchange_rate"] = get_exchange_rate(
 						party_account_currency, company_currency, d.posting_date
 					)
 			if d.voucher_type in ("Purchase Invoice"):
-				d["bill_no"] = frappe.db.get_value(d.voucher_type, d.voucher_no, "bill_no")
+				d["bill_no"] = invoice.bill_no
 
 		# Get negative outstanding sales /purchase invoices
 		if args.get("party_type") != "Employee":
@@ -2429,14 +2454,19 @@ def get_outstanding_reference_documents(args, validate=False):
 def split_invoices_based_on_payment_terms(outstanding_invoices, company) -> list:
 	"""Split a list of invoices based on their payment terms."""
 	exc_rates = get_currency_data(outstanding_invoices, company)
+	payment_schedules = get_payment_schedules_for_split(outstanding_invoices, exc_rates)
 
 	outstanding_invoices_after_split = []
 	for entry in outstanding_invoices:
 		if entry.voucher_type in ["Sales Invoice", "Purchase Invoice"]:
-			if payment_term_template := frappe.db.get_value(
-				entry.voucher_type, entry.voucher_no, "payment_terms_template"
-			):
-				split_rows = get_split_invoice_rows(entry, payment_term_template, exc_rates)
+			# only invoices with payment term based allocation have their schedule fetched
+			if entry.voucher_no in payment_schedules:
+				split_rows = get_split_invoice_rows(
+					entry,
+					exc_rates[entry.voucher_no].payment_terms_template,
+					exc_rates,
+					payment_schedules[entry.voucher_no],
+				)
 				if not split_rows:
 					continue
 
@@ -2466,31 +2496,80 @@ def get_currency_data(outstanding_invoices: list, company: str | None = None) ->
 		for x in frappe.db.get_all(
 			doctype,
 			filters={"name": ["in", invoices]},
-			fields=["name", "currency", "conversion_rate", "party_account_currency"],
+			fields=[
+				"name",
+				"currency",
+				"conversion_rate",
+				"party_account_currency",
+				"payment_terms_template",
+			],
 		):
 			exc_rates[x.name] = frappe._dict(
 				conversion_rate=x.conversion_rate,
 				currency=x.currency,
 				party_account_currency=x.party_account_currency,
 				company_currency=company_currency,
+				payment_terms_template=x.payment_terms_template,
 			)
 
 	return exc_rates
 
 
-def get_split_invoice_rows(invoice: dict, payment_term_template: str, exc_rates: dict) -> list:
-	"""Split invoice based on its payment schedule table."""
-	split_rows = []
-	allocate_payment_based_on_payment_terms = frappe.db.get_value(
-		"Payment Terms Template", payment_term_template, "allocate_payment_based_on_payment_terms"
+def get_payment_schedules_for_split(outstanding_invoices: list, exc_rates: dict) -> dict:
+	"""
+	Fetch the payment schedules of all invoices whose template allocates payment based on payment terms.\n
+	Example: {invoice_name: [payment_schedule_row, ...], ...}
+	"""
+	templates = {x.payment_terms_template for x in exc_rates.values() if x.payment_terms_template}
+	if not templates:
+		return {}
+
+	term_based_templates = frappe.get_all(
+		"Payment Terms Template",
+		filters={"name": ["in", list(templates)], "allocate_payment_based_on_payment_terms": 1},
+		pluck="name",
 	)
+	invoices = [
+		x.voucher_no
+		for x in outstanding_invoices
+		if (exc_rates.get(x.voucher_no) or {}).get("payment_terms_template") in term_based_templates
+	]
+	if not invoices:
+		return {}
+
+	payment_schedules = frappe._dict()
+	for row in frappe.get_all(
+		"Payment Schedule", filters={"parent": ["in", invoices]}, fields=["*"], order_by="due_date"
+	):
+		payment_schedules.setdefault(row.parent, []).append(row)
 
-	if not allocate_payment_based_on_payment_terms:
-		return [invoice]
+	# invoices without schedule rows are still marked as term based
+	for invoice in invoices:
+		payment_schedules.setdefault(invoice, [])
+
+	return payment_schedules
+
+
+def get_split_invoice_rows(
+	invoice: dict, payment_term_template: str, exc_rates: dict, payment_schedule: list | None = None
+) -> list:
+	"""Split invoice based on its payment schedule table.
+
+	`payment_schedule` can be passed in when it has already been fetched in bulk.
+	"""
+	split_rows = []
+	if payment_schedule is None:
+		allocate_payment_based_on_payment_terms = frappe.db.get_value(
+			"Payment Terms Template", payment_term_template, "allocate_payment_based_on_payment_terms"
+		)
+
+		if not allocate_payment_based_on_payment_terms:
+			return [invoice]
+
+		payment_schedule = frappe.get_all(
+			"Payment Schedule", filters={"parent": invoice.voucher_no}, fields=["*"], order_by="due_date"
+		)
 
-	payment_schedule = frappe.get_all(
-		"Payment Schedule", filters={"parent": invoice.voucher_no}, fields=["*"], order_by="due_date"
-	)
 	for payment_term in payment_schedule:
 		if not payment_term.outstanding > 0.1:
 			continue
@@ -2745,44 +2824,69 @@ def get_company_defaults(company):
 
 
 def get_outstanding_on_journal_entry(voucher_no, party_type, party):
-	ple = frappe.qb.DocType("Payment Ledger Entry")
+	return get_outstanding_on_journal_entries([voucher_no], party_type, party).get(voucher_no, (0, 0))
 
-	outstanding = (
-		frappe.qb.from_(ple)
-		.select(Sum(ple.amount_in_account_currency))
-		.where(
-			(ple.against_voucher_no == voucher_no)
-			& (ple.party_type == party_type)
-			& (ple.party == party)
-			& (ple.delinked == 0)
-		)
-	).run()
 
-	outstanding_amount = outstanding[0][0] if outstanding else 0
+def get_outstanding_on_journal_entries(voucher_nos, party_type, party) -> dict:
+	"""
+	Fetch the outstanding and total amount of the `party` on all `voucher_nos` with one query.\n
+	Example: {voucher_no: (outstanding_amount, total_amount), ...}
+	"""
+	voucher_nos = set(voucher_nos)
+	if not voucher_nos:
+		return {}
+
+	ple = frappe.qb.DocType("Payment Ledger Entry")
 
-	total = (
+	amounts = {}
+	for against_voucher_no, voucher_no, amount in (
 		frappe.qb.from_(ple)
-		.select(Sum(ple.amount_in_account_currency))
+		.select(ple.against_voucher_no, ple.voucher_no, Sum(ple.amount_in_account_currency))
 		.where(
-			(ple.voucher_no == voucher_no)
+			(ple.against_voucher_no.isin(voucher_nos) | ple.voucher_no.isin(voucher_nos))
 			& (ple.party_type == party_type)
 			& (ple.party == party)
 			& (ple.delinked == 0)
 		)
-	).run()
+		.groupby(ple.against_voucher_no, ple.voucher_no)
+	).run():
+		if against_voucher_no in voucher_nos:
+			outstanding_amount, total_amount = amounts.get(against_voucher_no, (0, 0))
+			amounts[against_voucher_no] = (outstanding_amount + flt(amount), total_amount)
 
-	total_amount = total[0][0] if total else 0
+		if voucher_no in voucher_nos:
+			outstanding_amount, total_amount = amounts.get(voucher_no, (0, 0))
+			amounts[voucher_no] = (outstanding_amount, total_amount + flt(amount))
 
-	return outstanding_amount, total_amount
+	return amounts
 
 
 @frappe.whitelist()
 def get_reference_details(
 	reference_doctype, reference_name, party_account_currency, party_type=None, party=None
 ):
+	ref_doc = frappe.get_doc(reference_doctype, reference_name)
+	return get_reference_details_from_voucher(
+		ref_doc, reference_doctype, reference_name, party_account_currency, party_type, party
+	)
+
+
+def get_reference_details_from_voucher(
+	ref_doc,
+	reference_doctype,
+	reference_name,
+	party_account_currency,
+	party_type=None,
+	party=None,
+	journal_entry_amounts=None,
+	party_account=None,
+):
+	"""Compute reference details from a loaded voucher (a `Document` or a `frappe._dict` of its fields).
+
+	`journal_entry_amounts` (outstanding, total) and the `party_account` of an order can be passed
+	when they are already loaded."""
 	total_amount = outstanding_amount = exchange_rate = account = None
 
-	ref_doc = frappe.get_doc(reference_doctype, reference_name)
 	company_currency = ref_doc.get("company_currency") or erpnext.get_company_currency(ref_doc.company)
 
 	# Only applies for Reverse Payment Entries
@@ -2793,12 +2897,14 @@ def get_reference_details(
 		total_amount = outstanding_amount = ref_doc.get("dunning_amount")
 		exchange_rate = 1
 
-	elif reference_doctype == "Journal Entry" and ref_doc.docstatus == 1:
-		if ref_doc.multi_currency:
-			exchange_rate = get_exchange_rate(party_account_currency, company_currency, ref_doc.posting_date)
+	elif reference_doctype == "Journal Entry" and ref_doc.get("docstatus") == 1:
+		if ref_doc.get("multi_currency"):
+			exchange_rate = get_exchange_rate(
+				party_account_currency, company_currency, ref_doc.get("posting_date")
+			)
 		else:
 			exchange_rate = 1
-			outstanding_amount, total_amount = get_outstanding_on_journal_entry(
+			outstanding_amount, total_amount = journal_entry_amounts or get_outstanding_on_journal_entry(
 				reference_name, party_type, party
 			)
 
@@ -2831,7 +2937,7 @@ def get_reference_details(
 			# Get the exchange rate from the original ref doc
 			# or get it based on the posting date of the ref doc.
 			exchange_rate = ref_doc.get("conversion_rate") or get_exchange_rate(
-				party_account_currency, company_currency, ref_doc.posting_date
+				party_account_currency, company_currency, ref_doc.get("posting_date")
 			)
 
 		if reference_doctype in ("Sales Invoice", "Purchase Invoice"):
@@ -2846,10 +2952,12 @@ def get_reference_details(
 			party_type = "Customer" if reference_doctype == "Sales Order" else "Supplier"
 			party_field = "customer" if reference_doctype == "Sales Order" else "supplier"
 			party = ref_doc.get(party_field)
-			account = get_party_account(party_type, party, ref_doc.company)
+			account = party_account or get_party_account(party_type, party, ref_doc.company)
 	else:
 		# Get the exchange rate based on the posting date of the ref doc.
-		exchange_rate = get_exchange_rate(party_account_currency, company_currency, ref_doc.posting_date)
+		exchange_rate = get_exchange_rate(
+			party_account_currency, company_currency, ref_doc.get("posting_date")
+		)
 
 	res = frappe._dict(
 		{
@@ -2867,6 +2975,164 @@ def get_reference_details(
 	return res
 
 
+REFERENCE_VOUCHER_FIELDS = (
+	"name",
+	"docstatus",
+	"company",
+	"company_currency",
+	"posting_date",
+	"due_date",
+	"conversion_rate",
+	"grand_total",
+	"base_grand_total",
+	"rounded_total",
+	"base_rounded_total",
+	"outstanding_amount",
+	"advance_paid",
+	"dunning_amount",
+	"multi_currency",
+	"is_return",
+	"on_hold",
+	"bill_no",
+	"debit_to",
+	"credit_to",
+	"payable_account",
+	"customer",
+	"supplier",
+	"employee",
+	"shareholder",
+	"payment_terms_template",
+)
+
+
+def get_reference_vouchers(references) -> dict:
+	"""
+	Fetch the fields of all vouchers set in `References`, with one query per reference doctype.\n
+	Example: {(reference_doctype, reference_name): frappe._dict, ...}
+	"""
+	if not references:
+		return {}
+
+	names_by_doctype = {}
+	for row in references:
+		if row.reference_doctype and row.reference_name:
+			names_by_doctype.setdefault(row.reference_doctype, set()).add(row.reference_name)
+
+	vouchers = {}
+	for doctype, names in names_by_doctype.items():
+		valid_columns = frappe.get_meta(doctype).get_valid_columns()
+		fields = [field for field in REFERENCE_VOUCHER_FIELDS if field in valid_columns]
+
+		for row in frappe.get_all(doctype, filters={"name": ["in", list(names)]}, fields=fields):
+			vouchers[(doctype, row.name)] = row
+
+	return vouchers
+
+
+def get_reference_details_map(
+	references, party_account_currency, party_type=None, party=None, vouchers=None
+) -> dict:
+	"""
+	Batched counterpart of `get_reference_details` for all rows of `References`.\n
+	References whose voucher does not exist are left out of the result.
+
+	Example: {(reference_doctype, reference_name): reference_details, ...}
+	"""
+	if vouchers is None:
+		vouchers = get_reference_vouchers(references)
+
+	journal_entry_amounts = get_outstanding_on_journal_entries(
+		[
+			name
+			for (doctype, name), voucher in vouchers.items()
+			if doctype == "Journal Entry" and voucher.docstatus == 1 and not voucher.multi_currency
+		],
+		party_type,
+		party,
+	)
+	order_party_accounts = get_order_party_accounts(vouchers)
+
+	reference_details = {}
+	for row in references or []:
+		key = (row.reference_doctype, row.reference_name)
+		if key in reference_details or key not in vouchers:
+			continue
+
+		reference_details[key] = get_reference_details_from_voucher(
+			vouchers[key],
+			row.reference_doctype,
+			row.reference_name,
+			party_account_currency,
+			party_type,
+			party,
+			journal_entry_amounts=journal_entry_amounts.get(row.reference_name, (0, 0))
+			if row.reference_doctype == "Journal Entry"
+			else None,
+			party_account=order_party_accounts.get(key),
+		)
+
+	return reference_details
+
+
+def get_order_party_accounts(vouchers) -> dict:
+	"""
+	Fetch the party account of all Sales and Purchase Orders in `vouchers`, per party type and company.\n
+	Example: {(reference_doctype, reference_name): account, ...}
+	"""
+	parties = {}
+	for (doctype, name), voucher in vouchers.items():
+		if doctype in ("Sales Order", "Purchase Order"):
+			party_type, party_field = (
+				("Customer", "customer") if doctype == "Sales Order" else ("Supplier", "supplier")
+			)
+			parties.setdefault((party_type, voucher.company), {})[(doctype, name)] = voucher.get(party_field)
+
+	order_party_accounts = {}
+	for (party_type, company), order_parties in parties.items():
+		accounts = get_party_accounts(party_type, order_parties.values(), company)
+		for key, order_party in order_parties.items():
+			order_party_accounts[key] = accounts[order_party]
+
+	return order_party_accounts
+
+
+def get_term_based_allocation_map(references=None, vouchers=None) -> dict:
+	"""
+	Fetch whether `Payment Term` based allocation is enabled for each voucher set in `References`.\n
+	Example: {(reference_doctype, reference_name): allocate_payment_based_on_payment_terms, ...}
+	"""
+	if not references:
+		return {}
+
+	if vouchers is None:
+		vouchers = get_reference_vouchers(references)
+
+	templates = {
+		voucher.payment_terms_template
+		for (doctype, _name), voucher in vouchers.items()
+		if doctype in ("Sales Invoice", "Sales Order", "Purchase Order", "Purchase Invoice")
+		and voucher.get("payment_terms_template")
+	}
+
+	if not templates:
+		return {}
+
+	allocation_enabled = dict(
+		frappe.get_all(
+			"Payment Terms Template",
+			filters={"name": ["in", list(templates)]},
+			fields=["name", "allocate_payment_based_on_payment_terms"],
+			as_list=True,
+		)
+	)
+
+	return {
+		key: allocation_enabled.get(voucher.payment_terms_template)
+		for key, voucher in vouchers.items()
+		if voucher.get("payment_terms_template") in templates
+	}
+
+
 @frappe.whitelist()
 def get_payment_entry(
 	dt,
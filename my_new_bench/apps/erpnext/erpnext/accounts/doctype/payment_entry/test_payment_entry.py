@@ -13,6 +13,7 @@ from erpnext.accounts.doctype.payment_entry.payment_entry import (
 	get_party_details,
 	get_payment_entry,
 	get_reference_details,
+	get_reference_details_map,
 )
 from erpnext.accounts.doctype.purchase_invoice.test_purchase_invoice import (
 	make_purchase_invoice,
@@ -1163,6 +1164,57 @@ class TestPaymentEntry(FrappeTestCase):
 		}
 		self.assertDictEqual(ref_details, expected_response)
 
+	def test_reference_details_map_matches_reference_details(self):
+		si = create_sales_invoice(qty=1, rate=100)
+		so = make_sales_order(qty=1, rate=100)
+		je = frappe.get_doc(
+			{
+				"doctype": "Journal Entry",
+				"company": si.company,
+				"posting_date": nowdate(),
+				"accounts": [
+					{
+						"account": si.debit_to,
+						"party_type": "Customer",
+						"party": si.customer,
+						"debit_in_account_currency": 100,
+						"cost_center": si.items[0].cost_center,
+					},
+					{
+						"account": si.items[0].income_account,
+						"credit_in_account_currency": 100,
+						"cost_center": si.items[0].cost_center,
+					},
+				],
+			}
+		).submit()
+
+		pe = get_payment_entry("Sales Invoice", si.name)
+		pe.append(
+			"references",
+			{"reference_doctype": "Sales Order", "reference_name": so.name, "allocated_amount": 100},
+		)
+		pe.append(
+			"references",
+			{"reference_doctype": "Journal Entry", "reference_name": je.name, "allocated_amount": 100},
+		)
+
+		reference_details = get_reference_details_map(
+			pe.references, pe.paid_from_account_currency, pe.party_type, pe.party
+		)
+		self.assertEqual(len(reference_details), 3)
+		for ref in pe.references:
+			self.assertDictEqual(
+				reference_details[(ref.reference_doctype, ref.reference_name)],
+				get_reference_details(
+					ref.reference_doctype,
+					ref.reference_name,
+					pe.paid_from_account_currency,
+					pe.party_type,
+					pe.party,
+				),
+			)
+
 	@change_settings(
 		"Accounts Settings",
 		{
@@ -903,25 +903,48 @@ def get_pos_reserved_qty_from_table(child_table, item_code, warehouse):
 	  float: The total reserved quantity for the item in the given
 	                warehouse from submitted, unconsolidated POS Invoices.
 	"""
+	return get_pos_reserved_qty_map(child_table, item_code, warehouse).get((item_code, warehouse), 0)
+
+
+def get_pos_reserved_qty_details(item_code=None) -> dict:
+	"""Returns a dict like {("item_code", "warehouse"): "reserved_qty", ... } for the
+	submitted POS Invoices which are not consolidated yet."""
+	reserved_qty = frappe._dict()
+
+	for child_table in ("POS Invoice Item", "Packed Item"):
+		for key, qty in get_pos_reserved_qty_map(child_table, item_code).items():
+			reserved_qty[key] = flt(reserved_qty.get(key)) + qty
+
+	return reserved_qty
+
+
+def get_pos_reserved_qty_map(child_table, item_code=None, warehouse=None) -> dict:
+	"""Returns a dict like {("item_code", "warehouse"): "reserved_qty", ... } from one child table
+	of the submitted POS Invoices which are not consolidated yet, grouped in one query."""
 	p_inv = frappe.qb.DocType("POS Invoice")
 	p_item = frappe.qb.DocType(child_table)
 
 	qty_column = "qty" if child_table == "Packed Item" else "stock_qty"
 
-	reserved_qty = (
+	query = (
 		frappe.qb.from_(p_inv)
 		.from_(p_item)
-		.select(Sum(p_item[qty_column]).as_("stock_qty"))
+		.select(p_item.item_code, p_item.warehouse, Sum(p_item[qty_column]).as_("stock_qty"))
 		.where(
 			(p_inv.name == p_item.parent)
 			& (IfNull(p_inv.consolidated_invoice, "") == "")
 			& (p_item.docstatus == 1)
-			& (p_item.item_code == item_code)
-			& (p_item.warehouse == warehouse)
 		)
-	).run(as_dict=True)
+		.groupby(p_item.item_code, p_item.warehouse)
+	)
+
+	if item_code:
+		query = query.where(p_item.item_code == item_code)
+
+	if warehouse:
+		query = query.where(p_item.warehouse == warehouse)
 
-	return flt(reserved_qty[0].stock_qty) if reserved_qty else 0
+	return {(row.item_code, row.warehouse): flt(row.stock_qty) for row in query.run(as_dict=True)}
 
 
 @frappe.whitelist()
@@ -49,6 +49,14 @@ frappe.ui.form.on("Process Deferred Accounting", {
 		}
 	},
 
+	refresh: function (frm) {
+		if (frm.doc.docstatus === 1 && frm.doc.last_processed_invoice) {
+			frm.add_custom_button(__("Resume"), () => {
+				frm.call("resume").then(() => frm.reload_doc());
+			});
+		}
+	},
+
 	onload: function (frm) {
 		if (frm.doc.posting_date && frm.doc.docstatus === 0) {
 			frm.set_value("start_date", frappe.datetime.add_months(frm.doc.posting_date, -1));
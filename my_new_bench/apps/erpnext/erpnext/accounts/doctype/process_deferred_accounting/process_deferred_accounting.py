@@ -27,6 +27,8 @@ class ProcessDeferredAccounting(Document):
 		amended_from: DF.Link | None
 		company: DF.Link
 		end_date: DF.Date
+		last_processed_invoice: DF.Data | None
+		last_processed_invoice_type: DF.Link | None
 		posting_date: DF.Date
 		start_date: DF.Date
 		type: DF.Literal["", "Income", "Expense"]
@@ -37,11 +39,38 @@ class ProcessDeferredAccounting(Document):
 			frappe.throw(_("End date cannot be before start date"))
 
 	def on_submit(self):
-		conditions = build_conditions(self.type, self.account, self.company)
+		self.process_invoices()
+
+	@frappe.whitelist()
+	def resume(self):
+		"""Continue an interrupted run after `last_processed_invoice`."""
+		self.check_permission("submit")
+		if self.docstatus != 1 or not self.last_processed_invoice:
+			frappe.throw(_("Only interrupted Process Deferred Accounting entries can be resumed"))
+
+		self.process_invoices()
+
+	def process_invoices(self):
+		invoice_types = self.get_invoice_types()
+		if self.last_processed_invoice_type in invoice_types:
+			# the invoice types before the interrupted one are already booked
+			invoice_types = invoice_types[invoice_types.index(self.last_processed_invoice_type) :]
+
+		for invoice_type in invoice_types:
+			if invoice_type == "Sales Invoice":
+				conditions = build_conditions("Income", self.account, self.company)
+				convert_deferred_revenue_to_income(self.name, self.start_date, self.end_date, conditions)
+			else:
+				conditions = build_conditions("Expense", self.account, self.company)
+				convert_deferred_expense_to_expense(self.name, self.start_date, self.end_date, conditions)
+
+	def get_invoice_types(self):
 		if self.type == "Income":
-			convert_deferred_revenue_to_income(self.name, self.start_date, self.end_date, conditions)
-		else:
-			convert_deferred_expense_to_expense(self.name, self.start_date, self.end_date, conditions)
+			return ["Sales Invoice"]
+		elif self.type == "Expense":
+			return ["Purchase Invoice"]
+
+		return ["Sales Invoice", "Purchase Invoice"]
 
 	def on_cancel(self):
 		self.ignore_linked_doctypes = ["GL Entry"]
@@ -5,7 +5,9 @@ import unittest
 
 import frappe
 
+from erpnext.accounts.deferred_revenue import DeferredBookingLedger
 from erpnext.accounts.doctype.account.test_account import create_account
+from erpnext.accounts.doctype.purchase_invoice.test_purchase_invoice import make_purchase_invoice
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import (
 	check_gl_entries,
 	create_sales_invoice,
@@ -78,6 +80,158 @@ class TestProcessDeferredAccounting(unittest.TestCase):
 		check_gl_entries(self, si.name, original_gle, "2023-07-01")
 		change_acc_settings()
 
+	def test_resume_after_last_processed_invoice(self):
+		change_acc_settings(book_deferred_entries_based_on="Months")
+
+		deferred_account = create_account(
+			account_name="Deferred Revenue for Resume",
+			parent_account="Current Liabilities - _TC",
+			company="_Test Company",
+		)
+
+		item = create_item("_Test Item for Deferred Accounting")
+		item.enable_deferred_revenue = 1
+		item.deferred_revenue_account = deferred_account
+		item.no_of_months = 12
+		item.save()
+
+		invoices = []
+		for _i in range(2):
+			si = create_sales_invoice(
+				item=item.name, rate=3000, update_stock=0, posting_date="2023-05-01", do_not_submit=True
+			)
+			si.items[0].enable_deferred_revenue = 1
+			si.items[0].service_start_date = "2023-05-01"
+			si.items[0].service_end_date = "2023-07-31"
+			si.items[0].deferred_revenue_account = deferred_account
+			si.submit()
+			invoices.append(si.name)
+
+		invoices.sort()
+
+		pda = frappe.get_doc(
+			dict(
+				doctype="Process Deferred Accounting",
+				company="_Test Company",
+				account=deferred_account,
+				posting_date="2023-07-31",
+				start_date="2023-05-01",
+				end_date="2023-07-31",
+				type="Income",
+			)
+		).insert()
+		# simulate a run interrupted after the first invoice
+		pda.db_set({"last_processed_invoice_type": "Sales Invoice", "last_processed_invoice": invoices[0]})
+		pda.submit()
+
+		booking_ledger = DeferredBookingLedger("Sales Invoice", invoices)
+		si_items = {
+			d.parent: d.name
+			for d in frappe.get_all("Sales Invoice Item", {"parent": ["in", invoices]}, ["name", "parent"])
+		}
+		self.assertEqual(booking_ledger.get_booked_amount(si_items[invoices[0]], deferred_account), (0, 0))
+		self.assertEqual(
+			booking_ledger.get_booked_amount(si_items[invoices[1]], deferred_account), (3000, 3000)
+		)
+
+		pda.reload()
+		self.assertFalse(pda.last_processed_invoice)
+
+		pda.cancel()
+		change_acc_settings()
+
+	def test_resume_in_purchase_invoice_phase(self):
+		change_acc_settings(book_deferred_entries_based_on="Months")
+
+		deferred_revenue_account = create_account(
+			account_name="Deferred Revenue for Resume",
+			parent_account="Current Liabilities - _TC",
+			company="_Test Company",
+		)
+		deferred_expense_account = create_account(
+			account_name="Deferred Expense for Resume",
+			parent_account="Current Assets - _TC",
+			company="_Test Company",
+		)
+
+		item = create_item("_Test Item for Deferred Accounting", is_purchase_item=True)
+		item.enable_deferred_revenue = 1
+		item.deferred_revenue_account = deferred_revenue_account
+		item.enable_deferred_expense = 1
+		item.item_defaults[0].deferred_expense_account = deferred_expense_account
+		item.no_of_months = 12
+		item.save()
+
+		si = create_sales_invoice(
+			item=item.name, rate=3000, update_stock=0, posting_date="2023-05-01", do_not_submit=True
+		)
+		si.items[0].enable_deferred_revenue = 1
+		si.items[0].service_start_date = "2023-05-01"
+		si.items[0].service_end_date = "2023-07-31"
+		si.items[0].deferred_revenue_account = deferred_revenue_account
+		si.submit()
+
+		purchase_invoices = []
+		for _i in range(2):
+			pi = make_purchase_invoice(item=item.name, qty=1, rate=3000, do_not_save=True)
+			pi.set_posting_time = 1
+			pi.posting_date = "2023-05-01"
+			pi.items[0].enable_deferred_expense = 1
+			pi.items[0].service_start_date = "2023-05-01"
+			pi.items[0].service_end_date = "2023-07-31"
+			pi.items[0].deferred_expense_account = deferred_expense_account
+			pi.submit()
+			purchase_invoices.append(pi.name)
+
+		purchase_invoices.sort()
+
+		# without a type both the Sales Invoice and the Purchase Invoice phases run
+		pda = frappe.get_doc(
+			dict(
+				doctype="Process Deferred Accounting",
+				company="_Test Company",
+				posting_date="2023-07-31",
+				start_date="2023-05-01",
+				end_date="2023-07-31",
+			)
+		)
+		pda.flags.ignore_mandatory = True
+		pda.insert()
+		# simulate a run interrupted after the first purchase invoice, the sales invoices are booked
+		pda.db_set(
+			{
+				"last_processed_invoice_type": "Purchase Invoice",
+				"last_processed_invoice": purchase_invoices[0],
+			}
+		)
+		pda.submit()
+
+		sales_ledger = DeferredBookingLedger("Sales Invoice", [si.name])
+		self.assertEqual(sales_ledger.get_booked_amount(si.items[0].name, deferred_revenue_account), (0, 0))
+
+		purchase_ledger = DeferredBookingLedger("Purchase Invoice", purchase_invoices)
+		pi_items = {
+			d.parent: d.name
+			for d in frappe.get_all(
+				"Purchase Invoice Item", {"parent": ["in", purchase_invoices]}, ["name", "parent"]
+			)
+		}
+		self.assertEqual(
+			purchase_ledger.get_booked_amount(pi_items[purchase_invoices[0]], deferred_expense_account),
+			(0, 0),
+		)
+		self.assertEqual(
+			purchase_ledger.get_booked_amount(pi_items[purchase_invoices[1]], deferred_expense_account),
+			(3000, 3000),
+		)
+
+		pda.reload()
+		self.assertFalse(pda.last_processed_invoice_type)
+		self.assertFalse(pda.last_processed_invoice)
+
+		pda.cancel()
+		change_acc_settings()
+
 	def test_pda_submission_and_cancellation(self):
 		pda = frappe.get_doc(
 			dict(
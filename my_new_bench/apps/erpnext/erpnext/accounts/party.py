@@ -7,6 +7,7 @@ from frappe import _, msgprint, qb, scrub
 from frappe.contacts.doctype.address.address import get_company_address, get_default_address
 from frappe.core.doctype.user_permission.user_permission import get_permitted_documents
 from frappe.model.utils import get_fetch_values
+from frappe.query_builder import Tuple
 from frappe.query_builder.functions import Abs, Count, Date, Sum
 from frappe.utils import (
 	add_days,
@@ -55,6 +56,102 @@ class DuplicatePartyAccountError(frappe.ValidationError):
 	pass
 
 
+def get_party_defaults(party_type, party, company=None):
+	"""Return the defaults of a Customer / Supplier in `company`, resolved through the
+	party -> party group -> company fallbacks:
+	`account`, `advance_account`, `payment_terms_template`, `billing_address`, `shipping_address`.
+
+	The resolved record is cached until the party, its group, the company or one of the party's
+	addresses changes (see `clear_party_defaults_cache`). Changes written with `frappe.db.set_value`
+	bypass the document hooks and must be followed by a `clear_party_defaults_cache` call."""
+	return frappe.cache.hget(
+		f"party_defaults::{party_type}::{party}",
+		company or "",
+		lambda: _get_party_defaults(party_type, party, company),
+	)
+
+
+def _get_party_defaults(party_type, party, company=None):
+	party_group_doctype = "Customer Group" if party_type == "Customer" else "Supplier Group"
+	party_details = (
+		frappe.db.get_value(
+			party_type, party, [f"{scrub(party_group_doctype)} as party_group", "payment_terms"], as_dict=True
+		)
+		or frappe._dict()
+	)
+
+	party_accounts = {}
+	if company:
+		parents = [(party_type, party)]
+		if party_details.party_group:
+			parents.append((party_group_doctype, party_details.party_group))
+
+		party_account = frappe.qb.DocType("Party Account")
+		for row in (
+			frappe.qb.from_(party_account)
+			.select(party_account.parenttype, party_account.account, party_account.advance_account)
+			.where(
+				(Tuple(party_account.parenttype, party_account.parent).isin(parents))
+				& (party_account.company == company)
+			)
+		).run(as_dict=True):
+			party_accounts[row.parenttype] = row
+
+	def get_configured_account(fieldname, company_fieldname):
+		for parenttype in (party_type, party_group_doctype):
+			if account := party_accounts.get(parenttype, {}).get(fieldname):
+				return account
+
+		if company:
+			return frappe.get_cached_value("Company", company, company_fieldname)
+
+	payment_terms_template = party_details.payment_terms
+	if not payment_terms_template and party_details.party_group:
+		payment_terms_template = frappe.get_cached_value(
+			party_group_doctype, party_details.party_group, "payment_terms"
+		)
+	if not payment_terms_template and company:
+		payment_terms_template = frappe.get_cached_value("Company", company, "payment_terms")
+
+	return frappe._dict(
+		account=get_configured_account(
+			"account",
+			"default_receivable_account" if party_type == "Customer" else "default_payable_account",
+		),
+		advance_account=get_configured_account(
+			"advance_account",
+			"default_advance_received_account"
+			if party_type == "Customer"
+			else "default_advance_paid_account",
+		),
+		payment_terms_template=payment_terms_template,
+		billing_address=get_default_address(party_type, party),
+		shipping_address=get_party_shipping_address(party_type, party),
+	)
+
+
+def clear_party_defaults_cache(doc, method=None, *args, **kwargs):
+	"""Invalidate cached party defaults, hooked on the documents they are resolved from."""
+	if doc.doctype in ("Customer", "Supplier"):
+		frappe.cache.delete_value(f"party_defaults::{doc.doctype}::{doc.name}")
+		if method == "after_rename" and args:
+			# args: old name, new name, merge
+			frappe.cache.delete_value(f"party_defaults::{doc.doctype}::{args[0]}")
+
+	elif doc.doctype == "Address":
+		links = list(doc.get("links") or [])
+		if doc_before_save := doc.get_doc_before_save():
+			links += doc_before_save.get("links") or []
+
+		for link in links:
+			if link.link_doctype in ("Customer", "Supplier"):
+				frappe.cache.delete_value(f"party_defaults::{link.link_doctype}::{link.link_name}")
+
+	else:
+		# party groups and companies are shared by many parties
+		frappe.cache.delete_keys("party_defaults::")
+
+
 @frappe.whitelist()
 def get_party_details(
 	party=None,
@@ -204,7 +301,13 @@ def set_address_details(
 		"customer_address" if party_type in ["Lead", "Prospect"] else party_type.lower() + "_address"
 	)
 
-	party_details[party_billing_field] = party_address or get_default_address(party_type, party.name)
+	if not party_address:
+		if party_type in ("Customer", "Supplier"):
+			party_address = get_party_defaults(party_type, party.name, company).billing_address
+		else:
+			party_address = get_default_address(party_type, party.name)
+
+	party_details[party_billing_field] = party_address
 	if doctype:
 		party_details.update(
 			get_fetch_values(doctype, party_billing_field, party_details[party_billing_field])
@@ -226,9 +329,13 @@ def set_address_details(
 		party_shipping_display = "dispatch_address_display"
 		default_shipping = dispatch_address
 
-	party_details[party_shipping_field] = default_shipping or get_party_shipping_address(
-		party_type, party.name
-	)
+	if not default_shipping:
+		if party_type in ("Customer", "Supplier"):
+			default_shipping = get_party_defaults(party_type, party.name, company).shipping_address
+		else:
+			default_shipping = get_party_shipping_address(party_type, party.name)
+
+	party_details[party_shipping_field] = default_shipping
 
 	party_details[party_shipping_display] = render_address(
 		party_details[party_shipping_field], check_permissions=not ignore_permissions
@@ -436,25 +543,13 @@ def get_party_account(party_type, party=None, company=None, include_advance=Fals
 
 		return frappe.get_cached_value("Company", company, default_account_name)
 
-	account = frappe.db.get_value(
-		"Party Account", {"parenttype": party_type, "parent": party, "company": company}, "account"
-	)
-
-	if not account and party_type in ["Customer", "Supplier"]:
-		party_group_doctype = "Customer Group" if party_type == "Customer" else "Supplier Group"
-		group = frappe.get_cached_value(party_type, party, scrub(party_group_doctype))
+	if party_type in ["Customer", "Supplier"]:
+		account = get_party_defaults(party_type, party, company).account
+	else:
 		account = frappe.db.get_value(
-			"Party Account",
-			{"parenttype": party_group_doctype, "parent": group, "company": company},
-			"account",
+			"Party Account", {"parenttype": party_type, "parent": party, "company": company}, "account"
 		)
 
-	if not account and party_type in ["Customer", "Supplier"]:
-		default_account_name = (
-			"default_receivable_account" if party_type == "Customer" else "default_payable_account"
-		)
-		account = frappe.get_cached_value("Company", company, default_account_name)
-
 	existing_gle_currency = get_party_gle_currency(party_type, party, company)
 	if existing_gle_currency:
 		if account:
@@ -478,7 +573,56 @@ def get_party_account(party_type, party=None, company=None, include_advance=Fals
 	return account
 
 
+def get_party_accounts(party_type, parties, company):
+	"""Batched `get_party_account` for many Customers / Suppliers of one `company`.
+
+	The currencies of existing GL Entries of all `parties` are read with one query.
+	Example: {party: account, ...}"""
+	parties = list(set(parties))
+	if not parties:
+		return {}
+
+	gl = qb.DocType("GL Entry")
+	gle_currencies = dict(
+		qb.from_(gl)
+		.select(gl.party, gl.account_currency)
+		.distinct()
+		.where(
+			(gl.docstatus == 1)
+			& (gl.company == company)
+			& (gl.party_type == party_type)
+			& (gl.party.isin(parties))
+			& (gl.is_cancelled == 0)
+		)
+		.run()
+	)
+
+	accounts = {}
+	for party in parties:
+		account = get_party_defaults(party_type, party, company).account
+
+		if existing_gle_currency := gle_currencies.get(party):
+			if (
+				not account
+				or frappe.get_cached_value("Account", account, "account_currency") != existing_gle_currency
+			):
+				account = get_party_gle_account(party_type, party, company)
+
+		if not account:
+			account_type = frappe.get_cached_value("Party Type", party_type, "account_type")
+			account = frappe.get_cached_value(
+				"Company", company, "default_" + account_type.lower() + "_account"
+			)
+
+		accounts[party] = account
+
+	return accounts
+
+
 def get_party_advance_account(party_type, party, company):
+	if party_type in ("Customer", "Supplier"):
+		return get_party_defaults(party_type, party, company).advance_account
+
 	account = frappe.db.get_value(
 		"Party Account",
 		{"parenttype": party_type, "parent": party, "company": company},
@@ -653,7 +797,7 @@ def get_due_date_from_template(template_name, posting_date, bill_date):
 	"""
 	due_date = getdate(bill_date or posting_date)
 
-	template = frappe.get_doc("Payment Terms Template", template_name)
+	template = frappe.get_cached_doc("Payment Terms Template", template_name)
 
 	for term in template.terms:
 		if term.due_date_based_on == "Day(s) after invoice date":
@@ -764,27 +908,8 @@ def set_taxes(
 def get_payment_terms_template(party_name, party_type, company=None):
 	if party_type not in ("Customer", "Supplier"):
 		return
-	template = None
-
-	if party_type == "Customer":
-		customer = frappe.get_cached_value(
-			"Customer", party_name, fieldname=["payment_terms", "customer_group"], as_dict=1
-		)
-		template = customer.payment_terms
-
-		if not template and customer.customer_group:
-			template = frappe.get_cached_value("Customer Group", customer.customer_group, "payment_terms")
-	else:
-		supplier = frappe.get_cached_value(
-			"Supplier", party_name, fieldname=["payment_terms", "supplier_group"], as_dict=1
-		)
-		template = supplier.payment_terms
-		if not template and supplier.supplier_group:
-			template = frappe.get_cached_value("Supplier Group", supplier.supplier_group, "payment_terms")
 
-	if not template and company:
-		template = frappe.get_cached_value("Company", company, fieldname="payment_terms")
-	return template
+	return get_party_defaults(party_type, party_name, company).payment_terms_template
 
 
 def validate_party_frozen_disabled(party_type, party_name):
@@ -13,8 +13,6 @@ from erpnext.accounts.doctype.fiscal_year.fiscal_year import get_from_and_to_dat
 from erpnext.accounts.party import get_party_account
 from erpnext.setup.utils import get_exchange_rate
 
-__exchange_rates = {}
-
 
 def get_currency(filters):
 	"""
@@ -71,19 +69,14 @@ def get_rate_as_at(date, from_currency, to_currency):
 	Gets exchange rate as at `date` for `from_currency` - `to_currency` exchange rate.
 	This calls `get_exchange_rate` so that we can get the correct exchange rate as per
 	the user's Accounts Settings.
-	It is made efficient by memoising results to `__exchange_rates`
+	Lookups are memoised per request by `get_exchange_rate` itself
 	:param date: exchange rate as at this date
 	:param from_currency: Base currency
 	:param to_currency: Quote currency
 	:return: Retrieved exchange rate
 	"""
 
-	rate = __exchange_rates.get(f"{from_currency}-{to_currency}@{date}")
-	if not rate:
-		rate = get_exchange_rate(from_currency, to_currency, date) or 1
-		__exchange_rates[f"{from_currency}-{to_currency}@{date}"] = rate
-
-	return rate
+	return get_exchange_rate(from_currency, to_currency, date) or 1
 
 
 def convert_to_presentation_currency(gl_entries, currency_info, filters=None):
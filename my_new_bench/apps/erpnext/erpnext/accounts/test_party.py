@@ -1,7 +1,8 @@
 import frappe
 from frappe.tests.utils import FrappeTestCase
 
-from erpnext.accounts.party import get_default_price_list
+from erpnext.accounts.doctype.account.test_account import create_account
+from erpnext.accounts.party import get_default_price_list, get_party_account, get_party_defaults
 
 
 class PartyTestCase(FrappeTestCase):
@@ -16,3 +17,74 @@ class PartyTestCase(FrappeTestCase):
 		customer.save()
 		price_list = get_default_price_list(customer)
 		assert price_list is None
+
+	def test_party_defaults_are_refreshed_on_party_update(self):
+		customer = frappe.get_doc(
+			{
+				"doctype": "Customer",
+				"customer_name": "_Test Customer for Party Defaults",
+			}
+		).insert(ignore_permissions=True, ignore_mandatory=True)
+
+		self.assertEqual(
+			get_party_account("Customer", customer.name, "_Test Company"),
+			frappe.get_cached_value("Company", "_Test Company", "default_receivable_account"),
+		)
+
+		receivable_account = create_account(
+			account_name="_Test Receivable for Party Defaults",
+			parent_account="Accounts Receivable - _TC",
+			account_type="Receivable",
+			company="_Test Company",
+		)
+		customer.append("accounts", {"company": "_Test Company", "account": receivable_account})
+		customer.save()
+
+		self.assertEqual(get_party_account("Customer", customer.name, "_Test Company"), receivable_account)
+
+	def test_party_defaults_ignore_accounts_of_other_parents(self):
+		customer = frappe.get_doc(
+			{
+				"doctype": "Customer",
+				"customer_name": "_Test Customer for Party Account Parents",
+				"customer_group": "_Test Customer Group",
+			}
+		).insert(ignore_permissions=True, ignore_mandatory=True)
+
+		receivable_account = create_account(
+			account_name="_Test Receivable for Party Account Parents",
+			parent_account="Accounts Receivable - _TC",
+			account_type="Receivable",
+			company="_Test Company",
+		)
+		# a group named like the customer, that is not the customer's group
+		if not frappe.db.exists("Customer Group", customer.name):
+			frappe.get_doc(
+				{
+					"doctype": "Customer Group",
+					"customer_group_name": customer.name,
+					"parent_customer_group": "All Customer Groups",
+					"accounts": [{"company": "_Test Company", "account": receivable_account}],
+				}
+			).insert(ignore_permissions=True)
+
+		self.assertEqual(
+			get_party_account("Customer", customer.name, "_Test Company"),
+			frappe.get_cached_value("Company", "_Test Company", "default_receivable_account"),
+		)
+
+	def test_party_defaults_are_refreshed_on_db_set(self):
+		customer = frappe.get_doc(
+			{
+				"doctype": "Customer",
+				"customer_name": "_Test Customer for Party Defaults db_set",
+			}
+		).insert(ignore_permissions=True, ignore_mandatory=True)
+
+		get_party_defaults("Customer", customer.name, "_Test Company")
+		customer.db_set("payment_terms", "_Test Payment Term Template")
+
+		self.assertEqual(
+			get_party_defaults("Customer", customer.name, "_Test Company").payment_terms_template,
+			"_Test Payment Term Template",
+		)
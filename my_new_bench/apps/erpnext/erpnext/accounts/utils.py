@@ -1979,7 +1979,7 @@ def update_voucher_outstanding(voucher_type, voucher_no, account, party_type, pa
 		and voucher_outstanding
 	):
 		outstanding = voucher_outstanding[0]
-		ref_doc = frappe.get_doc(voucher_type, voucher_no)
+		ref_doc = frappe.get_lazy_doc(voucher_type, voucher_no)
 		previous_outstanding_amount = ref_doc.outstanding_amount
 		outstanding_amount = flt(
 			outstanding["outstanding_in_account_currency"], ref_doc.precision("outstanding_amount")
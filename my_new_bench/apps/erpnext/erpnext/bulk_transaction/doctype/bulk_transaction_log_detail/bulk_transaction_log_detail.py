@@ -14,6 +14,7 @@ class BulkTransactionLogDetail(Document):
 	if TYPE_CHECKING:
 		from frappe.types import DF
 
+		batch_id: DF.Data | None
 		date: DF.Date | None
 		error_description: DF.LongText | None
 		from_doctype: DF.Link | None
@@ -1,9 +1,108 @@
 # Copyright (c) 2023, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
-# import frappe
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from erpnext.selling.doctype.sales_order.test_sales_order import make_sales_order
+from erpnext.utilities import bulk_transaction
+from erpnext.utilities.bulk_transaction import (
+	get_progress,
+	job,
+	retry_failed_transactions,
+	transaction_processing,
+)
+
 
 class TestBulkTransactionLogDetail(FrappeTestCase):
-	pass
+	def setUp(self):
+		# chunks are committed by the job, keep them in the test transaction
+		patcher = patch.object(frappe.db, "commit")
+		patcher.start()
+		self.addCleanup(patcher.stop)
+
+	def get_invoice_count(self, sales_orders):
+		return frappe.db.count("Sales Invoice Item", {"sales_order": ("in", sales_orders)})
+
+	def test_documents_are_split_in_chunks(self):
+		data = [{"name": f"SO-{i}"} for i in range(5)]
+
+		with (
+			patch.dict(frappe.conf, {"bulk_transaction_chunk_size": 2}),
+			patch.object(bulk_transaction.frappe, "enqueue") as enqueue,
+		):
+			transaction_processing(data, "Sales Order", "Sales Invoice")
+
+		chunks = [call.kwargs["deserialized_data"] for call in enqueue.call_args_list]
+		self.assertEqual(chunks, [data[0:2], data[2:4], data[4:]])
+		self.assertEqual({call.kwargs["total"] for call in enqueue.call_args_list}, {5})
+		self.assertEqual(len({call.kwargs["batch_id"] for call in enqueue.call_args_list}), 1)
+
+	def test_rerun_chunk_skips_handled_documents(self):
+		sales_orders = [make_sales_order().name for _ in range(3)]
+		data = [{"name": name} for name in sales_orders]
+		batch_id = frappe.generate_hash(length=10)
+		task = bulk_transaction.task
+
+		def fail_last_order(doc_name, from_doctype, to_doctype):
+			if doc_name == sales_orders[-1]:
+				frappe.throw("Failed")
+			task(doc_name, from_doctype, to_doctype)
+
+		with patch.object(bulk_transaction, "task", side_effect=fail_last_order) as mocked_task:
+			job(data, "Sales Order", "Sales Invoice", batch_id=batch_id, total=len(data))
+			self.assertEqual(self.get_invoice_count(sales_orders), 2)
+			self.assertEqual(get_progress(batch_id), {"count": 3, "failed": 1})
+
+			# e.g. the worker died after the chunk was committed
+			mocked_task.reset_mock()
+			job(data, "Sales Order", "Sales Invoice", batch_id=batch_id, total=len(data))
+			mocked_task.assert_not_called()
+
+		self.assertEqual(self.get_invoice_count(sales_orders), 2)
+		self.assertEqual(get_progress(batch_id), {"count": 3, "failed": 1})
+		self.assertEqual(frappe.db.count("Bulk Transaction Log Detail", {"batch_id": batch_id}), 3)
+
+	def test_progress_of_chunks(self):
+		sales_orders = [make_sales_order().name for _ in range(3)]
+		batch_id = frappe.generate_hash(length=10)
+
+		with patch.object(bulk_transaction, "publish_progress") as publish_progress:
+			job([{"name": sales_orders[0]}], "Sales Order", "Sales Invoice", batch_id=batch_id, total=3)
+			job(
+				[{"name": name} for name in sales_orders[1:]],
+				"Sales Order",
+				"Sales Invoice",
+				batch_id=batch_id,
+				total=3,
+			)
+
+		self.assertEqual([call.args[0].count for call in publish_progress.call_args_list], [1, 3])
+
+	def test_retry_failed_transactions(self):
+		sales_order = make_sales_order().name
+		batch_id = frappe.generate_hash(length=10)
+
+		with patch.object(bulk_transaction, "task", side_effect=frappe.ValidationError):
+			job([{"name": sales_order}], "Sales Order", "Sales Invoice", batch_id=batch_id, total=1)
+
+		self.assertEqual(get_progress(batch_id), {"count": 1, "failed": 1})
+		self.assertEqual(self.get_invoice_count([sales_order]), 0)
+
+		failed_docs = frappe.get_all(
+			"Bulk Transaction Log Detail",
+			filters={"batch_id": batch_id, "transaction_status": "Failed"},
+			fields=["name", "transaction_name", "from_doctype", "to_doctype"],
+		)
+		retry_failed_transactions(failed_docs)
+
+		self.assertEqual(self.get_invoice_count([sales_order]), 1)
+		log = frappe.db.get_value(
+			"Bulk Transaction Log Detail",
+			failed_docs[0].name,
+			["transaction_status", "retried"],
+			as_dict=True,
+		)
+		self.assertEqual(log, {"transaction_status": "Success", "retried": 1})
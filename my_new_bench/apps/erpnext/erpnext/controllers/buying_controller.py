@@ -5,6 +5,7 @@
 import frappe
 from frappe import ValidationError, _, msgprint
 from frappe.contacts.doctype.address.address import render_address
+from frappe.query_builder.functions import Max, Sum
 from frappe.utils import cint, flt, getdate
 from frappe.utils.data import nowtime
 
@@ -246,17 +247,15 @@ class BuyingController(SubcontractingController):
 
 		return [d.item_code for d in self.items if d.is_fixed_asset]
 
-	def set_landed_cost_voucher_amount(self):
+	def set_landed_cost_voucher_amount(self, landed_cost_amounts=None):
+		if landed_cost_amounts is None:
+			landed_cost_amounts = get_landed_cost_voucher_amounts([self.name])
+
 		for d in self.get("items"):
-			lc_voucher_data = frappe.db.sql(
-				"""select sum(applicable_charges), cost_center
-				from `tabLanded Cost Item`
-				where docstatus = 1 and purchase_receipt_item = %s and receipt_document = %s""",
-				(d.name, self.name),
-			)
-			d.landed_cost_voucher_amount = lc_voucher_data[0][0] if lc_voucher_data else 0.0
-			if not d.cost_center and lc_voucher_data and lc_voucher_data[0][1]:
-				d.db_set("cost_center", lc_voucher_data[0][1])
+			lc_voucher_data = landed_cost_amounts.get((self.name, d.name))
+			d.landed_cost_voucher_amount = flt(lc_voucher_data.amount) if lc_voucher_data else 0.0
+			if not d.cost_center and lc_voucher_data and lc_voucher_data.cost_center:
+				d.db_set("cost_center", lc_voucher_data.cost_center)
 
 	def validate_from_warehouse(self):
 		for item in self.get("items"):
@@ -1026,6 +1025,28 @@ def get_asset_item_details(asset_items):
 	return asset_items_data
 
 
+def get_landed_cost_voucher_amounts(receipt_documents):
+	"""Returns the submitted landed cost of the given receipt documents,
+	as a dict like {("receipt_document", "purchase_receipt_item"): {"amount", "cost_center"}, ... }."""
+	if not receipt_documents:
+		return {}
+
+	lcv_item = frappe.qb.DocType("Landed Cost Item")
+	data = (
+		frappe.qb.from_(lcv_item)
+		.select(
+			lcv_item.receipt_document,
+			lcv_item.purchase_receipt_item,
+			Sum(lcv_item.applicable_charges).as_("amount"),
+			Max(lcv_item.cost_center).as_("cost_center"),
+		)
+		.where((lcv_item.docstatus == 1) & (lcv_item.receipt_document.isin(receipt_documents)))
+		.groupby(lcv_item.receipt_document, lcv_item.purchase_receipt_item)
+	).run(as_dict=True)
+
+	return {(d.receipt_document, d.purchase_receipt_item): d for d in data}
+
+
 def validate_item_type(doc, fieldname, message):
 	# iterate through items and check if they are valid sales or purchase items
 	items = [d.item_code for d in doc.items if d.item_code]
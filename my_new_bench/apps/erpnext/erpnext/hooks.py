@@ -381,6 +381,17 @@ doc_events = {
 		"validate": [
 			"erpnext.regional.italy.utils.set_state_code",
 		],
+		"on_change": "erpnext.accounts.party.clear_party_defaults_cache",
+		"on_trash": "erpnext.accounts.party.clear_party_defaults_cache",
+	},
+	("Customer", "Supplier"): {
+		"on_change": "erpnext.accounts.party.clear_party_defaults_cache",
+		"on_trash": "erpnext.accounts.party.clear_party_defaults_cache",
+		"after_rename": "erpnext.accounts.party.clear_party_defaults_cache",
+	},
+	("Customer Group", "Supplier Group", "Company"): {
+		"on_change": "erpnext.accounts.party.clear_party_defaults_cache",
+		"on_trash": "erpnext.accounts.party.clear_party_defaults_cache",
 	},
 	"Contact": {
 		"on_trash": "erpnext.support.doctype.issue.issue.update_issue",
@@ -3,7 +3,7 @@
 
 import functools
 import re
-from collections import deque
+from collections import defaultdict, deque
 from operator import itemgetter
 
 import frappe
@@ -301,11 +301,13 @@ class BOM(WebsiteGenerator):
 
 	def on_update(self):
 		frappe.cache().hdel("bom_children", self.name)
+		frappe.cache().hdel("bom_explosion", self.name)
 		self.check_recursion()
 
 	def on_submit(self):
 		self.manage_default_bom()
 		self.update_bom_creator_status()
+		get_bom_explosion(self.name)
 
 	def on_cancel(self):
 		self.db_set("is_active", 0)
@@ -315,6 +317,7 @@ class BOM(WebsiteGenerator):
 		self.validate_bom_links()
 		self.manage_default_bom()
 		self.update_bom_creator_status()
+		frappe.cache().hdel("bom_explosion", self.name)
 
 	def update_bom_creator_status(self):
 		if not self.bom_creator:
@@ -475,9 +478,9 @@ class BOM(WebsiteGenerator):
 			rate = get_valuation_rate(arg)
 		elif arg:
 			# Customer Provided parts and Supplier sourced parts will have zero rate
-			if not frappe.db.get_value("Item", arg["item_code"], "is_customer_provided_item") and not arg.get(
-				"sourced_by_supplier"
-			):
+			if not get_rm_item_value(
+				self.flags.rm_rate_map, arg["item_code"], "is_customer_provided_item"
+			) and not arg.get("sourced_by_supplier"):
 				if arg.get("bom_no") and self.set_rate_of_sub_assembly_item_based_on_bom:
 					rate = flt(self.get_bom_unitcost(arg["bom_no"])) * (arg.get("conversion_factor") or 1)
 				else:
@@ -543,6 +546,9 @@ class BOM(WebsiteGenerator):
 			)
 
 	def get_bom_unitcost(self, bom_no):
+		if rate_map := self.flags.rm_rate_map:
+			return rate_map.bom_unit_costs.get(bom_no) or 0
+
 		bom = frappe.db.sql(
 			"""select name, base_total_cost/quantity as unit_cost from `tabBOM`
 			where is_active = 1 and name = %s""",
@@ -858,17 +864,20 @@ class BOM(WebsiteGenerator):
 		"Create Raw Material-Rate map for Exploded Items. Fetch rate from Items table or Subassembly BOM."
 		rm_rate_map = {}
 
+		# Get Item-Rate from Subassembly BOMs
+		explosion_item_rates = defaultdict(dict)
+		if bom_nos := list({item.bom_no for item in self.get("items") if item.bom_no}):
+			for row in frappe.get_all(
+				"BOM Explosion Item",
+				filters={"parent": ("in", bom_nos)},
+				fields=["parent", "item_code", "rate"],
+				order_by=None,  # to avoid sort index creation at db level (granular change)
+			):
+				explosion_item_rates[row.parent][row.item_code] = flt(row.rate)
+
 		for item in self.get("items"):
 			if item.bom_no:
-				# Get Item-Rate from Subassembly BOM
-				explosion_items = frappe.get_all(
-					"BOM Explosion Item",
-					filters={"parent": item.bom_no},
-					fields=["item_code", "rate"],
-					order_by=None,  # to avoid sort index creation at db level (granular change)
-				)
-				explosion_item_rate = {item.item_code: flt(item.rate) for item in explosion_items}
-				rm_rate_map.update(explosion_item_rate)
+				rm_rate_map.update(explosion_item_rates[item.bom_no])
 			else:
 				rm_rate_map[item.item_code] = flt(item.base_rate) / flt(item.conversion_factor or 1.0)
 
@@ -1040,12 +1049,21 @@ class BOM(WebsiteGenerator):
 
 
 def get_bom_item_rate(args, bom_doc):
+	rate_map = bom_doc.flags.rm_rate_map
 	if bom_doc.rm_cost_as_per == "Valuation Rate":
-		rate = get_valuation_rate(args) * (args.get("conversion_factor") or 1)
+		valuation_rate = (
+			rate_map.valuation_rates.get((args["item_code"], args.get("company")))
+			if rate_map and not args.get("set_rate_based_on_warehouse")
+			else None
+		)
+		if valuation_rate is None:
+			valuation_rate = get_valuation_rate(args)
+
+		rate = valuation_rate * (args.get("conversion_factor") or 1)
 	elif bom_doc.rm_cost_as_per == "Last Purchase Rate":
 		rate = (
 			flt(args.get("last_purchase_rate"))
-			or flt(frappe.db.get_value("Item", args["item_code"], "last_purchase_rate"))
+			or flt(get_rm_item_value(rate_map, args["item_code"], "last_purchase_rate"))
 		) * (args.get("conversion_factor") or 1)
 	elif bom_doc.rm_cost_as_per == "Price List":
 		if not bom_doc.buying_price_list:
@@ -1074,6 +1092,146 @@ def get_bom_item_rate(args, bom_doc):
 	return flt(rate)
 
 
+def get_rm_item_value(rate_map, item_code, fieldname):
+	if rate_map and item_code in rate_map.items:
+		return rate_map.items[item_code].get(fieldname)
+
+	return frappe.db.get_value("Item", item_code, fieldname)
+
+
+def prefetch_rm_rates(boms: list[str]) -> frappe._dict:
+	"""Prefetch what `BOM.get_rm_rate` reads for every raw material row of the given BOMs:
+	item details, company wise valuation rates and unit cost of sub-assembly BOMs.
+
+	Set the result as `flags.rm_rate_map` of those BOMs before updating their cost."""
+	bom = frappe.qb.DocType("BOM")
+	bom_item = frappe.qb.DocType("BOM Item")
+
+	rows = (
+		frappe.qb.from_(bom_item)
+		.join(bom)
+		.on(bom_item.parent == bom.name)
+		.select(bom.company, bom_item.item_code, bom_item.bom_no)
+		.where((bom_item.parent.isin(boms)) & (bom_item.parenttype == "BOM"))
+		.distinct()
+	).run(as_dict=True)
+
+	rate_map = frappe._dict(items={}, valuation_rates={}, bom_unit_costs={})
+	if not rows:
+		return rate_map
+
+	rate_map.items = {
+		d.name: d
+		for d in frappe.get_all(
+			"Item",
+			filters={"name": ("in", list({d.item_code for d in rows}))},
+			fields=["name", "is_customer_provided_item", "last_purchase_rate"],
+		)
+	}
+
+	company_wise_items = defaultdict(set)
+	for d in rows:
+		company_wise_items[d.company].add(d.item_code)
+
+	for company, item_codes in company_wise_items.items():
+		for item_code, valuation_rate in get_valuation_rates(list(item_codes), company).items():
+			rate_map.valuation_rates[(item_code, company)] = valuation_rate
+
+	if bom_nos := list({d.bom_no for d in rows if d.bom_no}):
+		rate_map.bom_unit_costs = dict(
+			frappe.qb.from_(bom)
+			.select(bom.name, bom.base_total_cost / bom.quantity)
+			.where((bom.name.isin(bom_nos)) & (bom.is_active == 1))
+			.run()
+		)
+
+	return rate_map
+
+
+def get_valuation_rates(item_codes: list[str], company: str) -> dict[str, float]:
+	"""`get_valuation_rate` of several items of a company, with one query for all bins"""
+	from frappe.query_builder.functions import IfNull, Sum
+
+	bin_table = frappe.qb.DocType("Bin")
+	wh_table = frappe.qb.DocType("Warehouse")
+	valuation_rates = dict(
+		frappe.qb.from_(bin_table)
+		.join(wh_table)
+		.on(bin_table.warehouse == wh_table.name)
+		.select(
+			bin_table.item_code,
+			IfNull(Sum(bin_table.stock_value) / Sum(bin_table.actual_qty), 0.0),
+		)
+		.where((bin_table.item_code.isin(item_codes)) & (wh_table.company == company))
+		.groupby(bin_table.item_code)
+		.run()
+	)
+
+	if items_without_rate := [item_code for item_code, rate in valuation_rates.items() if rate <= 0]:
+		last_valuation_rates = get_last_valuation_rates(items_without_rate)
+		for item_code in items_without_rate:
+			valuation_rates[item_code] = last_valuation_rates.get(item_code, 0)
+
+	if missing_items := [item_code for item_code in item_codes if not valuation_rates.get(item_code)]:
+		valuation_rates.update(
+			frappe.get_all(
+				"Item",
+				filters={"name": ("in", missing_items)},
+				fields=["name", "valuation_rate"],
+				as_list=True,
+			)
+		)
+
+	return {item_code: flt(valuation_rates.get(item_code)) for item_code in item_codes}
+
+
+def get_last_valuation_rate(item_code):
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	last_val_rate = (
+		frappe.qb.from_(sle)
+		.select(sle.valuation_rate)
+		.where((sle.item_code == item_code) & (sle.valuation_rate > 0) & (sle.is_cancelled == 0))
+		.orderby(sle.posting_datetime, order=frappe.qb.desc)
+		.orderby(sle.creation, order=frappe.qb.desc)
+		.limit(1)
+	).run(as_dict=True)
+
+	return flt(last_val_rate[0].get("valuation_rate")) if last_val_rate else 0
+
+
+def get_last_valuation_rates(item_codes: list[str]) -> dict[str, float]:
+	"""`get_last_valuation_rate` of several items, with one query for the latest posting
+	of each item and one for the entries posted then"""
+	from frappe.query_builder import Tuple
+	from frappe.query_builder.functions import Max
+
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	conditions = (sle.item_code.isin(item_codes)) & (sle.valuation_rate > 0) & (sle.is_cancelled == 0)
+
+	last_postings = (
+		frappe.qb.from_(sle)
+		.select(sle.item_code, Max(sle.posting_datetime))
+		.where(conditions)
+		.groupby(sle.item_code)
+	).run()
+
+	if not last_postings:
+		return {}
+
+	entries = (
+		frappe.qb.from_(sle)
+		.select(sle.item_code, sle.valuation_rate)
+		.where(conditions & Tuple(sle.item_code, sle.posting_datetime).isin(last_postings))
+		.orderby(sle.creation, order=frappe.qb.desc)
+	).run()
+
+	last_valuation_rates = {}
+	for item_code, valuation_rate in entries:
+		last_valuation_rates.setdefault(item_code, flt(valuation_rate))
+
+	return last_valuation_rates
+
+
 def get_valuation_rate(data):
 	"""
 	1) Get average valuation rate from all warehouses
@@ -1112,17 +1270,7 @@ def get_valuation_rate(data):
 
 	if (valuation_rate is not None) and valuation_rate <= 0:
 		# Explicit null value check. If None, Bins don't exist, neither does SLE
-		sle = frappe.qb.DocType("Stock Ledger Entry")
-		last_val_rate = (
-			frappe.qb.from_(sle)
-			.select(sle.valuation_rate)
-			.where((sle.item_code == item_code) & (sle.valuation_rate > 0) & (sle.is_cancelled == 0))
-			.orderby(sle.posting_datetime, order=frappe.qb.desc)
-			.orderby(sle.creation, order=frappe.qb.desc)
-			.limit(1)
-		).run(as_dict=True)
-
-		valuation_rate = flt(last_val_rate[0].get("valuation_rate")) if last_val_rate else 0
+		valuation_rate = get_last_valuation_rate(item_code)
 
 	if not valuation_rate:
 		valuation_rate = frappe.db.get_value("Item", item_code, "valuation_rate")
@@ -1308,6 +1456,61 @@ def get_children(parent=None, is_root=False, **filters):
 		return bom_items
 
 
+def get_bom_explosion(bom_no):
+	"""Return the multi-level structure of a submitted BOM as a flat list in tree order.
+
+	Every row carries its `indent`, the `parent_bom` it belongs to, the stock qty per unit
+	of that parent (`qty_factor`) and per unit of `bom_no` (`cumulative_qty_factor`).
+	Submitted BOMs do not change, so explosions are cached and child explosions are reused
+	while building their parents."""
+	explosion = frappe.cache().hget("bom_explosion", bom_no)
+	if explosion is not None:
+		return explosion
+
+	bom = frappe.db.get_value("BOM", bom_no, ["item", "quantity", "docstatus"], as_dict=True)
+	if not bom:
+		return []
+
+	bom_items = frappe.get_all(
+		"BOM Item",
+		fields=["item_code", "bom_no", "stock_qty"],
+		filters={"parent": bom_no, "parenttype": "BOM"},
+		order_by="idx",
+	)
+
+	explosion = []
+	for d in bom_items:
+		qty_factor = flt(d.stock_qty) / (flt(bom.quantity) or 1.0)
+		explosion.append(
+			frappe._dict(
+				item_code=d.item_code,
+				bom_no=d.bom_no,
+				stock_qty=flt(d.stock_qty),
+				parent_bom=bom_no,
+				parent_item=bom.item,
+				parent_bom_qty=bom.quantity,
+				indent=0,
+				qty_factor=qty_factor,
+				cumulative_qty_factor=qty_factor,
+			)
+		)
+
+		if d.bom_no:
+			explosion.extend(
+				frappe._dict(
+					row,
+					indent=row.indent + 1,
+					cumulative_qty_factor=row.cumulative_qty_factor * qty_factor,
+				)
+				for row in get_bom_explosion(d.bom_no)
+			)
+
+	if bom.docstatus == 1:
+		frappe.cache().hset("bom_explosion", bom_no, explosion)
+
+	return explosion
+
+
 def add_additional_cost(stock_entry, work_order):
 	# Add non stock items cost in the additional cost
 	stock_entry.additional_costs = []
@@ -12,7 +12,15 @@ from frappe.utils import cstr, flt
 from erpnext.controllers.tests.test_subcontracting_controller import (
 	set_backflush_based_on,
 )
-from erpnext.manufacturing.doctype.bom.bom import BOMRecursionError, item_query, make_variant_bom
+from erpnext.manufacturing.doctype.bom.bom import (
+	BOMRecursionError,
+	get_bom_explosion,
+	get_last_valuation_rate,
+	get_last_valuation_rates,
+	item_query,
+	make_variant_bom,
+	prefetch_rm_rates,
+)
 from erpnext.manufacturing.doctype.bom_update_log.test_bom_update_log import (
 	update_cost_in_all_boms_in_test,
 )
@@ -318,6 +326,26 @@ class TestBOM(FrappeTestCase):
 		supplied_items = sorted([d.rm_item_code for d in sco.supplied_items])
 		self.assertEqual(bom_items, supplied_items)
 
+	@timeout
+	def test_prefetched_rm_rates(self):
+		bom = frappe.get_doc("BOM", get_default_bom("_Test FG Item 2"))
+
+		for rm_cost_as_per in ("Valuation Rate", "Last Purchase Rate"):
+			bom.rm_cost_as_per = rm_cost_as_per
+			bom.flags.rm_rate_map = None
+			bom.calculate_cost()
+			expected = [(d.item_code, d.rate) for d in bom.items]
+
+			bom.flags.rm_rate_map = prefetch_rm_rates([bom.name])
+			bom.calculate_cost()
+			self.assertEqual([(d.item_code, d.rate) for d in bom.items], expected)
+
+		item_codes = [d.item_code for d in bom.items]
+		self.assertEqual(
+			get_last_valuation_rates(item_codes),
+			{item_code: rate for item_code in item_codes if (rate := get_last_valuation_rate(item_code))},
+		)
+
 	@timeout
 	def test_bom_tree_representation(self):
 		bom_tree = {
@@ -344,6 +372,63 @@ class TestBOM(FrappeTestCase):
 		for reqd_item, created_item in zip(reqd_order, created_order, strict=False):
 			self.assertEqual(reqd_item, created_item.item_code)
 
+	def test_bom_explosion(self):
+		bom_tree = {
+			"Assembly": {
+				"SubAssembly1": {"ChildPart1": {}, "ChildPart2": {}},
+				"ChildPart3": {},
+				"SubAssembly2": {"SubSubAssy1": {"ChildPart4": {}}},
+			}
+		}
+		parent_bom = create_nested_bom(bom_tree, prefix="_Test Explosion ")
+
+		def preorder(tree, indent=0):
+			for item_code, subtree in tree.items():
+				yield "_Test Explosion " + item_code, indent
+				yield from preorder(subtree, indent + 1)
+
+		explosion = get_bom_explosion(parent_bom.name)
+		self.assertEqual([(d.item_code, d.indent) for d in explosion], list(preorder(bom_tree["Assembly"])))
+
+		sub_assembly = next(d for d in explosion if d.item_code == "_Test Explosion SubSubAssy1")
+		self.assertEqual(sub_assembly.parent_item, "_Test Explosion SubAssembly2")
+		self.assertEqual(sub_assembly.parent_bom, get_default_bom("_Test Explosion SubAssembly2"))
+
+	def test_bom_explosion_qty_factors(self):
+		prefix = "_Test Explosion Qty "
+		for item_code in ("Assembly", "SubAssembly", "Part"):
+			make_item(prefix + item_code, {"is_stock_item": 1})
+
+		def create_bom(item_code, quantity, items):
+			bom = frappe.get_doc(
+				doctype="BOM",
+				item=prefix + item_code,
+				quantity=quantity,
+				company="_Test Company",
+				currency="INR",
+			)
+			for child_item_code, qty in items:
+				bom.append("items", {"item_code": prefix + child_item_code, "qty": qty})
+			bom.insert()
+			bom.submit()
+			return bom
+
+		create_bom("SubAssembly", 2, [("Part", 3)])
+		bom = create_bom("Assembly", 1, [("SubAssembly", 4), ("Part", 2.5)])
+
+		self.assertEqual(
+			[
+				(d.item_code, d.indent, flt(d.qty_factor), flt(d.cumulative_qty_factor))
+				for d in get_bom_explosion(bom.name)
+			],
+			[
+				(prefix + "SubAssembly", 0, 4.0, 4.0),
+				# 3 parts per 2 sub assemblies, 4 sub assemblies per assembly
+				(prefix + "Part", 1, 1.5, 6.0),
+				(prefix + "Part", 0, 2.5, 2.5),
+			],
+		)
+
 	@timeout
 	def test_generated_variant_bom(self):
 		from erpnext.controllers.item_variant import create_variant
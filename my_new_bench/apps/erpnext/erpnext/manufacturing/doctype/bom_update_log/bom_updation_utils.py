@@ -12,6 +12,8 @@ if TYPE_CHECKING:
 import frappe
 from frappe import _
 
+RM_RATE_MAP_CHUNK_SIZE = 500
+
 
 def replace_bom(boms: dict, log_name: str) -> None:
 	"Replace current BOM with new BOM in parent BOMs."
@@ -26,6 +28,7 @@ def replace_bom(boms: dict, log_name: str) -> None:
 	parent_boms = get_ancestor_boms(new_bom)
 
 	for bom in parent_boms:
+		frappe.cache().hdel("bom_explosion", bom)
 		bom_obj = frappe.get_doc("BOM", bom)
 		# this is only used for versioning and we do not want
 		# to make separate db calls by using load_doc_before_save
@@ -114,9 +117,15 @@ def get_bom_unit_cost(bom_name: str) -> float:
 
 def update_cost_in_boms(bom_list: list[str]) -> None:
 	"Updates cost in given BOMs. Returns current and total updated BOMs."
+	from erpnext.manufacturing.doctype.bom.bom import prefetch_rm_rates
 
 	for index, bom in enumerate(bom_list):
+		if index % RM_RATE_MAP_CHUNK_SIZE == 0:
+			# rates of the raw materials of the next chunk of BOMs, fetched in bulk
+			rm_rate_map = prefetch_rm_rates(bom_list[index : index + RM_RATE_MAP_CHUNK_SIZE])
+
 		bom_doc = frappe.get_doc("BOM", bom, for_update=True)
+		bom_doc.flags.rm_rate_map = rm_rate_map
 		bom_doc.calculate_cost(save_updates=True, update_hour_rate=True)
 		bom_doc.db_update()
 
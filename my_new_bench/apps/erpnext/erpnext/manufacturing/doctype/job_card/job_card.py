@@ -2,7 +2,9 @@
 # For license information, please see license.txt
 import datetime
 import json
+from bisect import bisect_left, bisect_right
 from collections import OrderedDict
+from contextlib import contextmanager
 
 import frappe
 from frappe import _, bold
@@ -28,6 +30,7 @@ from erpnext.manufacturing.doctype.manufacturing_settings.manufacturing_settings
 	get_mins_between_operations,
 )
 from erpnext.manufacturing.doctype.workstation_type.workstation_type import get_workstations
+from erpnext.support.doctype.issue.issue import get_holidays
 
 
 class OverlapError(frappe.ValidationError):
@@ -125,6 +128,9 @@ class JobCard(Document):
 		workstation_type: DF.Link | None
 	# end: auto-generated types
 
+	# job cards scheduled by the capacity planner are written with `frappe.insert_many`
+	batch_safe_methods = ("before_validate", "validate", "before_save", "on_update")
+
 	def onload(self):
 		excess_transfer = frappe.db.get_single_value("Manufacturing Settings", "job_card_excess_transfer")
 		self.set_onload("job_card_excess_transfer", excess_transfer)
@@ -244,13 +250,16 @@ class JobCard(Document):
 
 		time_logs = sorted(time_logs, key=lambda x: x.get("to_time"))
 
+		if non_working_time := next((d for d in time_logs if d.get("non_working")), None):
+			return non_working_time
+
 		production_capacity = 1
 		if self.workstation:
 			production_capacity = (
 				frappe.get_cached_value("Workstation", self.workstation, "production_capacity") or 1
 			)
 
-		if self.get_open_job_cards(args.get("employee")):
+		if args.get("employee") and self.get_open_job_cards(args.get("employee")):
 			frappe.throw(
 				_(
 					"Employee {0} is currently working on another workstation. Please assign another employee."
@@ -309,6 +318,12 @@ class JobCard(Document):
 		if args.get("remaining_time_in_mins") and get_datetime(args.from_time) >= get_datetime(args.to_time):
 			args.to_time = add_to_date(args.from_time, minutes=args.get("remaining_time_in_mins"))
 
+		planner = get_capacity_planner()
+		if planner and not (args.get("employee") or args.get("name") or args.get("parent")):
+			return planner.get_time_logs(
+				doctype, self.workstation_type, self.workstation, args.from_time, args.to_time
+			)
+
 		jc = frappe.qb.DocType("Job Card")
 		jctl = frappe.qb.DocType(doctype)
 
@@ -444,6 +459,8 @@ class JobCard(Document):
 		if data:
 			if data.get("planned_start_time"):
 				args.planned_start_time = get_datetime(data.planned_start_time)
+			elif data.get("non_working"):
+				args.planned_start_time = get_datetime(data.to_time)
 			else:
 				args.planned_start_time = get_datetime(data.to_time + get_mins_between_operations())
 
@@ -1090,6 +1107,272 @@ class JobCard(Document):
 		frappe.db.set_value("Workstation", self.workstation, "status", status)
 
 
+class BusyIntervals:
+	"""Time logs of one workstation (type) ordered by start, so that the logs overlapping
+	a slot are found by bisecting instead of querying for every candidate slot.
+
+	Outside the working hours and on the holidays of the workstation, the scheduled time is
+	seeded with non-working intervals day by day as the slots are looked up."""
+
+	def __init__(self, doctype, workstation_type=None, workstation=None):
+		self.doctype = doctype
+		self.workstation_type = workstation_type
+		self.workstation = workstation
+		self.loaded_from = None
+		self.row_names = set()
+		self.starts = []
+		self.time_logs = []
+		self.max_duration = datetime.timedelta(0)
+		self.working_hours = []
+		self.holidays = set()
+		self.seeded_dates = set()
+
+	def matches(self, job_card):
+		return (not self.workstation_type or self.workstation_type == job_card.workstation_type) and (
+			not self.workstation or self.workstation == job_card.workstation
+		)
+
+	def set_working_time(self, working_hours, holidays):
+		self.working_hours = sorted((get_time(d.start_time), get_time(d.end_time)) for d in working_hours)
+		self.holidays = {getdate(d) for d in holidays}
+
+	def get_overlaps(self, from_time, to_time):
+		from_time, to_time = get_datetime(from_time), get_datetime(to_time)
+		self.load(from_time)
+		self.seed_non_working_time(from_time, to_time)
+
+		start = bisect_left(self.starts, from_time - self.max_duration)
+		end = bisect_right(self.starts, to_time)
+
+		return sorted(
+			(d for d in self.time_logs[start:end] if self.overlaps(d, from_time, to_time)),
+			key=lambda d: d.to_time,
+		)
+
+	@staticmethod
+	def overlaps(time_log, from_time, to_time):
+		# a slot starting in working time may run into the next non-working interval,
+		# `JobCard.check_workstation_time` splits it at the end of the working hours
+		if time_log.get("non_working"):
+			return time_log.from_time <= from_time < time_log.to_time
+
+		return (time_log.from_time < to_time and time_log.to_time > from_time) or (
+			time_log.from_time >= from_time and time_log.to_time <= to_time
+		)
+
+	def add(self, time_log):
+		if time_log.row_name in self.row_names:
+			return
+
+		time_log.from_time, time_log.to_time = (
+			get_datetime(time_log.from_time),
+			get_datetime(time_log.to_time),
+		)
+		idx = bisect_left(self.starts, time_log.from_time)
+		self.starts.insert(idx, time_log.from_time)
+		self.time_logs.insert(idx, time_log)
+		self.row_names.add(time_log.row_name)
+		self.max_duration = max(self.max_duration, time_log.to_time - time_log.from_time)
+
+	def load(self, from_time):
+		"""Load the time logs ending at or after `from_time` that are not loaded yet"""
+		if self.loaded_from is not None and from_time >= self.loaded_from:
+			return
+
+		jc = frappe.qb.DocType("Job Card")
+		jctl = frappe.qb.DocType(self.doctype)
+
+		query = (
+			frappe.qb.from_(jctl)
+			.from_(jc)
+			.select(
+				jc.name.as_("name"),
+				jctl.name.as_("row_name"),
+				jctl.from_time,
+				jctl.to_time,
+				jc.workstation,
+				jc.workstation_type,
+			)
+			.where((jctl.parent == jc.name) & (jctl.to_time >= from_time))
+		)
+
+		if self.loaded_from is not None:
+			query = query.where(jctl.to_time < self.loaded_from)
+
+		if self.workstation_type:
+			query = query.where(jc.workstation_type == self.workstation_type)
+
+		if self.workstation:
+			query = query.where(jc.workstation == self.workstation)
+
+		if self.doctype == "Job Card Time Log":
+			query = query.where(jc.docstatus < 2)
+		else:
+			query = query.where((jc.docstatus == 0) & (jc.total_time_in_mins == 0))
+
+		for time_log in query.run(as_dict=True):
+			self.add(time_log)
+
+		self.loaded_from = from_time
+
+	def seed_non_working_time(self, from_time, to_time):
+		"""Add the non-working intervals of the days between `from_time` and `to_time`"""
+		if not self.working_hours:
+			return
+
+		date = getdate(from_time)
+		while date <= getdate(to_time):
+			if date not in self.seeded_dates:
+				self.seeded_dates.add(date)
+				for start, end in self.get_non_working_time(date):
+					self.add(
+						frappe._dict(
+							name=None,
+							row_name=f"non-working-{start}",
+							from_time=start,
+							to_time=end,
+							workstation=self.workstation,
+							workstation_type=self.workstation_type,
+							non_working=1,
+						)
+					)
+
+			date += datetime.timedelta(days=1)
+
+	def get_non_working_time(self, date):
+		day_start = datetime.datetime.combine(date, datetime.time())
+		day_end = day_start + datetime.timedelta(days=1)
+		if date in self.holidays:
+			return [(day_start, day_end)]
+
+		intervals = []
+		start = day_start
+		for slot_start, slot_end in self.working_hours:
+			slot_start = datetime.datetime.combine(date, slot_start)
+			if slot_start > start:
+				intervals.append((start, slot_start))
+
+			start = max(start, datetime.datetime.combine(date, slot_end))
+
+		if start < day_end:
+			intervals.append((start, day_end))
+
+		return intervals
+
+
+class CapacityPlanner:
+	"""Busy intervals of every workstation touched while scheduling job cards, and the
+	job cards scheduled against them that are yet to be inserted"""
+
+	def __init__(self):
+		self.intervals = {}
+		self.job_cards = []
+
+	def get_time_logs(self, doctype, workstation_type, workstation, from_time, to_time):
+		key = (doctype, workstation_type or None, workstation or None)
+		if key not in self.intervals:
+			self.intervals[key] = self.make_intervals(*key)
+
+		return self.intervals[key].get_overlaps(from_time, to_time)
+
+	def make_intervals(self, doctype, workstation_type, workstation):
+		intervals = BusyIntervals(doctype, workstation_type, workstation)
+		if doctype != "Job Card Scheduled Time":
+			return intervals
+
+		for job_card in self.job_cards:
+			if intervals.matches(job_card):
+				self.reserve(intervals, job_card)
+
+		if workstation:
+			self.set_working_time(intervals)
+
+		return intervals
+
+	@staticmethod
+	def set_working_time(intervals):
+		workstation = frappe.get_cached_doc("Workstation", intervals.workstation)
+		if not workstation.working_hours or cint(
+			frappe.db.get_single_value("Manufacturing Settings", "allow_overtime")
+		):
+			return
+
+		holidays = []
+		if workstation.holiday_list and not cint(
+			frappe.db.get_single_value("Manufacturing Settings", "allow_production_on_holidays")
+		):
+			holidays = get_holidays(workstation.holiday_list)
+
+		intervals.set_working_time(workstation.working_hours, holidays)
+
+	def add_job_card(self, job_card):
+		"""Reserve the scheduled time of a job card and insert it when the block exits"""
+		self.job_cards.append(job_card)
+		for intervals in self.intervals.values():
+			if intervals.doctype == "Job Card Scheduled Time" and intervals.matches(job_card):
+				self.reserve(intervals, job_card)
+
+	@staticmethod
+	def reserve(intervals, job_card):
+		for row in job_card.scheduled_time_logs:
+			intervals.add(
+				frappe._dict(
+					name=job_card.name,
+					row_name=row.name or f"{id(job_card)}-{row.idx}",
+					from_time=row.from_time,
+					to_time=row.to_time,
+					workstation=job_card.workstation,
+					workstation_type=job_card.workstation_type,
+				)
+			)
+
+	def insert_job_cards(self):
+		job_cards, self.job_cards = self.job_cards, []
+		if not job_cards:
+			return
+
+		frappe.insert_many(job_cards)
+
+		# automatically added scheduling rows shouldn't change status to WIP
+		if scheduled := [doc for doc in job_cards if doc.scheduled_time_logs and doc.status != "Open"]:
+			frappe.db.set_value(
+				"Job Card", {"name": ("in", [doc.name for doc in scheduled])}, "status", "Open"
+			)
+			for doc in scheduled:
+				doc.status = "Open"
+
+		for doc in job_cards:
+			frappe.msgprint(
+				_("Job card {0} created").format(get_link_to_form("Job Card", doc.name)), alert=True
+			)
+
+
+def get_capacity_planner():
+	return getattr(frappe.local, "job_card_capacity_planner", None)
+
+
+@contextmanager
+def capacity_planning():
+	"""Schedule all job cards created within the block against one in-memory view of
+	workstation capacity, loaded once per workstation, and insert them together when the
+	block exits.
+
+	`WorkOrder.create_job_card` runs the operations of a work order in one block and
+	`release_work_orders` the operations of many work orders. A nested block reuses the
+	planner of the outer one."""
+	if planner := get_capacity_planner():
+		yield planner
+		return
+
+	frappe.local.job_card_capacity_planner = planner = CapacityPlanner()
+	try:
+		yield planner
+	finally:
+		frappe.local.job_card_capacity_planner = None
+
+	planner.insert_job_cards()
+
+
 @frappe.whitelist()
 def make_time_log(args):
 	if isinstance(args, str):
@@ -2,18 +2,21 @@
 # See license.txt
 
 
+from itertools import pairwise
 from typing import Literal
+from unittest.mock import patch
 
 import frappe
 from frappe.test_runner import make_test_records
 from frappe.tests.utils import FrappeTestCase, change_settings
-from frappe.utils import random_string
+from frappe.utils import get_datetime, random_string
 from frappe.utils.data import add_to_date, now, today
 
 from erpnext.manufacturing.doctype.job_card.job_card import (
 	JobCardOverTransferError,
 	OperationMismatchError,
 	OverlapError,
+	capacity_planning,
 	make_corrective_job_card,
 	make_material_request,
 )
@@ -21,8 +24,9 @@ from erpnext.manufacturing.doctype.job_card.job_card import (
 	make_stock_entry as make_stock_entry_from_jc,
 )
 from erpnext.manufacturing.doctype.work_order.test_work_order import make_wo_order_test_record
-from erpnext.manufacturing.doctype.work_order.work_order import WorkOrder
+from erpnext.manufacturing.doctype.work_order.work_order import WorkOrder, release_work_orders
 from erpnext.manufacturing.doctype.workstation.test_workstation import make_workstation
+from erpnext.setup.doctype.holiday_list.test_holiday_list import make_holiday_list
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
 
 
@@ -176,6 +180,111 @@ class TestJobCard(FrappeTestCase):
 		jc2.save()
 		self.assertTrue(jc2.name)
 
+	def test_capacity_planning_overlaps(self):
+		workstation = make_workstation(workstation_name=random_string(5)).name
+
+		jc1 = frappe.get_last_doc("Job Card", {"work_order": self.work_order.name})
+		jc1.workstation = workstation
+		for from_time, to_time in (
+			("2021-01-01 00:00:00", "2021-01-01 08:00:00"),
+			("2021-01-01 09:00:00", "2021-01-01 10:00:00"),
+			("2021-01-02 00:00:00", "2021-01-02 02:00:00"),
+		):
+			jc1.append("time_logs", {"from_time": from_time, "to_time": to_time, "completed_qty": 0})
+		jc1.save()
+
+		jc2 = frappe.new_doc("Job Card")
+		jc2.workstation = workstation
+		slots = [
+			("2021-01-01 07:00:00", "2021-01-01 09:30:00"),
+			("2021-01-01 08:00:00", "2021-01-01 09:00:00"),
+			("2021-01-01 10:00:00", "2021-01-02 03:00:00"),
+			("2020-12-31 00:00:00", "2021-01-01 00:30:00"),
+		]
+
+		def get_overlaps():
+			return [
+				[
+					d.row_name
+					for d in jc2.get_time_logs(frappe._dict(from_time=f, to_time=t), "Job Card Time Log")
+				]
+				for f, t in slots
+			]
+
+		expected = get_overlaps()
+		with capacity_planning():
+			self.assertEqual(get_overlaps(), expected)
+
+	@change_settings("Manufacturing Settings", {"allow_overtime": 0, "allow_production_on_holidays": 0})
+	def test_capacity_planning_skips_non_working_time(self):
+		workstation = make_workstation(workstation_name=random_string(5))
+		workstation.append("working_hours", {"start_time": "09:00:00", "end_time": "13:00:00"})
+		workstation.append("working_hours", {"start_time": "14:00:00", "end_time": "18:00:00"})
+		workstation.holiday_list = make_holiday_list(
+			random_string(5),
+			from_date="2021-01-01",
+			to_date="2021-01-31",
+			holiday_dates=[{"holiday_date": "2021-01-02", "description": "test holiday"}],
+		).name
+		workstation.save()
+
+		def get_scheduled_time():
+			jc = frappe.new_doc("Job Card")
+			jc.workstation = workstation.name
+			planned_start_time = get_datetime("2021-01-01 12:00:00")
+			jc.schedule_time_logs(
+				frappe._dict(
+					planned_start_time=planned_start_time,
+					planned_end_time=add_to_date(planned_start_time, minutes=360),
+					time_in_mins=360,
+				)
+			)
+			return [(str(d.from_time), str(d.to_time)) for d in jc.scheduled_time_logs]
+
+		expected = [
+			("2021-01-01 12:00:00", "2021-01-01 13:00:00"),
+			("2021-01-01 14:00:00", "2021-01-01 18:00:00"),
+			("2021-01-03 09:00:00", "2021-01-03 10:00:00"),
+		]
+		self.assertEqual(get_scheduled_time(), expected)
+		with capacity_planning():
+			self.assertEqual(get_scheduled_time(), expected)
+
+	@change_settings("Manufacturing Settings", {"disable_capacity_planning": 0})
+	def test_release_work_orders(self):
+		work_orders = [
+			make_wo_order_test_record(item="_Test FG Item 2", qty=2, do_not_submit=True) for _ in range(2)
+		]
+		for row in work_orders[0].operations:
+			frappe.db.set_value("Workstation", row.workstation, "production_capacity", 1)
+
+		with patch("frappe.insert_many", wraps=frappe.insert_many) as insert_many:
+			release_work_orders([wo.name for wo in work_orders])
+
+		insert_many.assert_called_once()
+
+		job_cards = frappe.get_all(
+			"Job Card",
+			filters={"work_order": ("in", [wo.name for wo in work_orders])},
+			fields=["name", "workstation", "status"],
+		)
+		self.assertEqual(len(job_cards), sum(len(wo.operations) for wo in work_orders))
+		self.assertEqual({jc.status for jc in job_cards}, {"Open"})
+
+		scheduled_time = {}
+		for jc in job_cards:
+			scheduled_time.setdefault(jc.workstation, []).extend(
+				frappe.get_all(
+					"Job Card Scheduled Time", filters={"parent": jc.name}, fields=["from_time", "to_time"]
+				)
+			)
+
+		# the job cards of the second work order are scheduled after the ones of the first
+		for time_logs in scheduled_time.values():
+			time_logs.sort(key=lambda d: d.from_time)
+			for previous, current in pairwise(time_logs):
+				self.assertLessEqual(previous.to_time, current.from_time)
+
 	def test_job_card_multiple_materials_transfer(self):
 		"Test transferring RMs separately against Job Card with multiple RMs."
 		self.transfer_material_against = "Job Card"
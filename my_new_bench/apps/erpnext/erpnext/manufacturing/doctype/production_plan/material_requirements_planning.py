@@ -0,0 +1,414 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+from collections import defaultdict
+
+import frappe
+from frappe.query_builder import Case, Tuple
+from frappe.query_builder.functions import IfNull, Sum
+from frappe.utils import add_days, ceil, cint, flt, getdate, nowdate
+
+
+class MaterialRequirementsPlanner:
+	"""Time-phased netting of material requirements over multi-level BOMs.
+
+	Items get a low-level code, the deepest BOM level they are used at, so that all the
+	requirements of an item are known before it is netted. Level by level, the stock, open
+	Purchase Orders, Material Requests and Work Orders of all item-warehouses of the level are
+	loaded with one query each, and every item-warehouse is netted once against them in date
+	order. Shortages of items manufactured in house are exploded into the next level, required
+	by the date their production has to start: the due date less the item's lead time."""
+
+	def __init__(
+		self,
+		company,
+		for_warehouse=None,
+		include_safety_stock=False,
+		ignore_existing_ordered_qty=False,
+		include_non_stock_items=False,
+		consider_minimum_order_qty=False,
+	):
+		self.company = company
+		self.for_warehouse = for_warehouse
+		self.include_safety_stock = include_safety_stock
+		self.ignore_existing_ordered_qty = ignore_existing_ordered_qty
+		self.include_non_stock_items = include_non_stock_items
+		self.consider_minimum_order_qty = consider_minimum_order_qty
+
+		self.productions = []
+		self.demands = []
+		self.skip_items = set()
+		self.items = {}
+		self.bom_items = {}
+		self.levels = {}
+		self.requirements = defaultdict(list)
+
+	def add_production(self, item_code, bom_no, qty, start_date=None, warehouse=None, sales_order=None):
+		"""Require the components of `qty` units of `item_code` by `start_date`"""
+		self.productions.append(
+			frappe._dict(
+				item_code=item_code,
+				bom_no=bom_no,
+				qty=flt(qty),
+				date=getdate(start_date or nowdate()),
+				warehouse=warehouse,
+				sales_order=sales_order,
+			)
+		)
+
+	def add_demand(self, item_code, qty, required_date=None, warehouse=None, sales_order=None):
+		"""Require `qty` units of `item_code` by `required_date`"""
+		self.demands.append(
+			frappe._dict(
+				item_code=item_code,
+				qty=flt(qty),
+				date=getdate(required_date or nowdate()),
+				warehouse=warehouse,
+				sales_order=sales_order,
+			)
+		)
+
+	def skip_item(self, item_code):
+		"""Do not plan `item_code` when it is used in a BOM, it is planned elsewhere"""
+		self.skip_items.add(item_code)
+
+	def run(self):
+		"""Return the planned orders, in the fields of Material Request Plan Item"""
+		self.set_levels()
+
+		for production in self.productions:
+			self.explode(production.bom_no, production.qty, production.date, production)
+
+		for demand in self.demands:
+			warehouse = (
+				self.for_warehouse or demand.warehouse or self.items[demand.item_code].default_warehouse
+			)
+			self.requirements[(demand.item_code, warehouse)].append(demand)
+
+		planned_orders = []
+		for level in range(max(self.levels.values(), default=-1) + 1):
+			keys = [key for key in list(self.requirements) if self.levels[key[0]] == level]
+			if not keys:
+				continue
+
+			bins = self.get_bins(keys)
+			receipts = self.get_receipts(keys)
+			for key in keys:
+				planned_orders.extend(self.net(key, bins.get(key, frappe._dict()), receipts.get(key, [])))
+
+		return planned_orders
+
+	def set_levels(self):
+		"""Load the items and BOMs of the whole structure, one query per BOM level"""
+		items = {d.item_code: 0 for d in self.demands}
+		boms = {d.bom_no: -1 for d in self.productions}
+
+		while items or boms:
+			self.load_items(items)
+			for item_code, level in items.items():
+				self.levels[item_code] = level
+				if bom_no := self.get_bom(item_code):
+					boms[bom_no] = max(boms.get(bom_no, level), level)
+
+			self.load_bom_items(boms)
+			next_items = {}
+			for bom_no, level in boms.items():
+				for d in self.bom_items[bom_no]:
+					if d.item_code in self.skip_items or self.levels.get(d.item_code, -1) > level:
+						continue
+
+					next_items[d.item_code] = max(next_items.get(d.item_code, 0), level + 1)
+
+			items, boms = next_items, {}
+
+	def load_items(self, item_codes):
+		item_codes = [item_code for item_code in item_codes if item_code not in self.items]
+		if not item_codes:
+			return
+
+		item = frappe.qb.DocType("Item")
+		item_default = frappe.qb.DocType("Item Default")
+		item_uom = frappe.qb.DocType("UOM Conversion Detail")
+
+		for d in (
+			frappe.qb.from_(item)
+			.left_join(item_default)
+			.on((item_default.parent == item.name) & (item_default.company == self.company))
+			.left_join(item_uom)
+			.on((item_uom.parent == item.name) & (item_uom.uom == item.purchase_uom))
+			.select(
+				item.name.as_("item_code"),
+				item.item_name,
+				item.description,
+				item.stock_uom,
+				item.purchase_uom,
+				item.default_bom,
+				item.default_material_request_type,
+				item.lead_time_days,
+				item.safety_stock,
+				item.min_order_qty,
+				item_uom.conversion_factor,
+				item_default.default_warehouse,
+			)
+			.where(item.name.isin(item_codes))
+		).run(as_dict=True):
+			self.items[d.item_code] = d
+
+	def load_bom_items(self, boms):
+		bom_nos = [bom_no for bom_no in boms if bom_no not in self.bom_items]
+		if not bom_nos:
+			return
+
+		bom = frappe.qb.DocType("BOM")
+		bom_item = frappe.qb.DocType("BOM Item")
+		item = frappe.qb.DocType("Item")
+
+		query = (
+			frappe.qb.from_(bom_item)
+			.join(bom)
+			.on(bom.name == bom_item.parent)
+			.join(item)
+			.on(item.name == bom_item.item_code)
+			.select(
+				bom_item.parent,
+				bom_item.item_code,
+				bom_item.source_warehouse,
+				Sum(bom_item.stock_qty / IfNull(bom.quantity, 1)).as_("qty"),
+			)
+			.where((bom_item.parent.isin(bom_nos)) & (bom_item.docstatus < 2))
+			.groupby(bom_item.parent, bom_item.item_code, bom_item.source_warehouse)
+		)
+
+		if not self.include_non_stock_items:
+			query = query.where(item.is_stock_item == 1)
+
+		self.bom_items.update({bom_no: [] for bom_no in bom_nos})
+		for d in query.run(as_dict=True):
+			self.bom_items[d.parent].append(d)
+
+	def get_bom(self, item_code):
+		"""BOM the shortages of an item are exploded with, if it is manufactured in house"""
+		item = self.items.get(item_code)
+		if item and item.default_material_request_type == "Manufacture":
+			return item.default_bom
+
+	def explode(self, bom_no, qty, required_date, order):
+		for d in self.bom_items[bom_no]:
+			if d.item_code in self.skip_items:
+				continue
+
+			warehouse = (
+				self.for_warehouse
+				or d.source_warehouse
+				or self.items[d.item_code].default_warehouse
+				or order.warehouse
+			)
+			self.requirements[(d.item_code, warehouse)].append(
+				frappe._dict(qty=flt(d.qty) * qty, date=required_date, sales_order=order.sales_order)
+			)
+
+	def net(self, key, bin, receipts):
+		item_code, warehouse = key
+		item = self.items[item_code]
+
+		balance = 0.0
+		if not self.ignore_existing_ordered_qty:
+			balance = (
+				flt(bin.actual_qty)
+				- flt(bin.reserved_qty)
+				- flt(bin.reserved_qty_for_production)
+				- flt(bin.reserved_qty_for_sub_contract)
+				- flt(bin.reserved_qty_for_production_plan)
+			)
+
+		if self.include_safety_stock:
+			balance -= flt(item.safety_stock)
+
+		if self.ignore_existing_ordered_qty:
+			receipts = []
+
+		planned_orders = []
+		precision = frappe.get_precision("Material Request Plan Item", "quantity")
+		idx = 0
+		for requirement in sorted(self.requirements[key], key=lambda d: d.date):
+			while idx < len(receipts) and receipts[idx].date <= requirement.date:
+				balance += receipts[idx].qty
+				idx += 1
+
+			balance -= requirement.qty
+			if flt(balance, precision) >= 0:
+				continue
+
+			qty = -balance
+			if self.consider_minimum_order_qty:
+				qty = max(qty, flt(item.min_order_qty))
+
+			planned_order = self.make_planned_order(item, warehouse, qty, requirement, bin)
+			balance += planned_order.quantity * planned_order.conversion_factor
+			planned_orders.append(planned_order)
+
+			if bom_no := self.get_bom(item_code):
+				self.explode(
+					bom_no,
+					planned_order.quantity * planned_order.conversion_factor,
+					planned_order.release_date,
+					frappe._dict(warehouse=warehouse, sales_order=requirement.sales_order),
+				)
+
+		return planned_orders
+
+	def make_planned_order(self, item, warehouse, qty, requirement, bin):
+		material_request_type = item.default_material_request_type or "Purchase"
+
+		uom, conversion_factor = item.stock_uom, 1.0
+		if (
+			material_request_type == "Purchase"
+			and item.purchase_uom
+			and item.purchase_uom != item.stock_uom
+			and item.conversion_factor
+		):
+			uom, conversion_factor = item.purchase_uom, flt(item.conversion_factor)
+
+		quantity = qty / conversion_factor
+		if frappe.get_cached_value("UOM", uom, "must_be_whole_number"):
+			quantity = ceil(quantity)
+
+		return frappe._dict(
+			{
+				"item_code": item.item_code,
+				"item_name": item.item_name,
+				"description": item.description,
+				"warehouse": warehouse,
+				"material_request_type": material_request_type,
+				"quantity": quantity,
+				"uom": uom,
+				"stock_uom": item.stock_uom,
+				"conversion_factor": conversion_factor,
+				"required_bom_qty": requirement.qty,
+				"schedule_date": requirement.date,
+				"release_date": add_days(requirement.date, -cint(item.lead_time_days)),
+				"sales_order": requirement.sales_order,
+				"safety_stock": item.safety_stock,
+				"min_order_qty": item.min_order_qty,
+				"actual_qty": flt(bin.actual_qty),
+				"projected_qty": flt(bin.projected_qty),
+				"ordered_qty": flt(bin.ordered_qty),
+				"reserved_qty_for_production": flt(bin.reserved_qty_for_production),
+			}
+		)
+
+	@staticmethod
+	def get_bins(keys):
+		bin = frappe.qb.DocType("Bin")
+
+		return {
+			(d.item_code, d.warehouse): d
+			for d in (
+				frappe.qb.from_(bin)
+				.select(
+					bin.item_code,
+					bin.warehouse,
+					bin.actual_qty,
+					bin.projected_qty,
+					bin.ordered_qty,
+					bin.reserved_qty,
+					bin.reserved_qty_for_production,
+					bin.reserved_qty_for_sub_contract,
+					bin.reserved_qty_for_production_plan,
+				)
+				.where(Tuple(bin.item_code, bin.warehouse).isin(keys))
+			).run(as_dict=True)
+		}
+
+	@staticmethod
+	def get_receipts(keys):
+		"""Pending qty of open Purchase Orders, Material Requests and Work Orders by date, in stock UOM"""
+		po = frappe.qb.DocType("Purchase Order")
+		po_item = frappe.qb.DocType("Purchase Order Item")
+		mr = frappe.qb.DocType("Material Request")
+		mr_item = frappe.qb.DocType("Material Request Item")
+		wo = frappe.qb.DocType("Work Order")
+
+		purchase_orders = (
+			frappe.qb.from_(po_item)
+			.join(po)
+			.on(po.name == po_item.parent)
+			.select(
+				po_item.item_code,
+				po_item.warehouse,
+				po_item.schedule_date.as_("date"),
+				Sum((po_item.qty - po_item.received_qty) * po_item.conversion_factor).as_("qty"),
+			)
+			.where(
+				(Tuple(po_item.item_code, po_item.warehouse).isin(keys))
+				& (po_item.qty > po_item.received_qty)
+				& (po.status.notin(["Closed", "Delivered"]))
+				& (po.docstatus == 1)
+				& (IfNull(po_item.delivered_by_supplier, 0) == 0)
+			)
+			.groupby(po_item.item_code, po_item.warehouse, po_item.schedule_date)
+		)
+
+		material_requests = (
+			frappe.qb.from_(mr_item)
+			.join(mr)
+			.on(mr.name == mr_item.parent)
+			.select(
+				mr_item.item_code,
+				mr_item.warehouse,
+				mr_item.schedule_date.as_("date"),
+				Sum(
+					Case()
+					.when(
+						mr.material_request_type == "Material Issue", mr_item.ordered_qty - mr_item.stock_qty
+					)
+					.else_(mr_item.stock_qty - mr_item.ordered_qty)
+				).as_("qty"),
+			)
+			.where(
+				(Tuple(mr_item.item_code, mr_item.warehouse).isin(keys))
+				& (mr_item.stock_qty > mr_item.ordered_qty)
+				& (
+					mr.material_request_type.isin(
+						[
+							"Purchase",
+							"Manufacture",
+							"Customer Provided",
+							"Material Transfer",
+							"Material Issue",
+						]
+					)
+				)
+				& (mr.status != "Stopped")
+				& (mr.docstatus == 1)
+			)
+			.groupby(mr_item.item_code, mr_item.warehouse, mr_item.schedule_date)
+		)
+
+		work_orders = (
+			frappe.qb.from_(wo)
+			.select(
+				wo.production_item.as_("item_code"),
+				wo.fg_warehouse.as_("warehouse"),
+				wo.planned_end_date.as_("date"),
+				Sum(wo.qty - wo.produced_qty).as_("qty"),
+			)
+			.where(
+				(Tuple(wo.production_item, wo.fg_warehouse).isin(keys))
+				& (wo.qty > wo.produced_qty)
+				& (wo.status.notin(["Stopped", "Completed", "Closed"]))
+				& (wo.docstatus == 1)
+			)
+			.groupby(wo.production_item, wo.fg_warehouse, wo.planned_end_date)
+		)
+
+		receipts = defaultdict(list)
+		for query in (purchase_orders, material_requests, work_orders):
+			for d in query.run(as_dict=True):
+				d.date = getdate(d.date or nowdate())
+				receipts[(d.item_code, d.warehouse)].append(d)
+
+		for key in receipts:
+			receipts[key].sort(key=lambda d: d.date)
+
+		return receipts
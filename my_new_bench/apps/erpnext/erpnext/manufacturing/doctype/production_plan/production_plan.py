@@ -9,12 +9,14 @@ from collections import defaultdict
 import frappe
 from frappe import _, msgprint
 from frappe.model.document import Document
+from frappe.query_builder import Tuple
 from frappe.query_builder.functions import IfNull, Sum
 from frappe.utils import (
 	add_days,
 	ceil,
 	cint,
 	comma_and,
+	create_batch,
 	flt,
 	get_link_to_form,
 	getdate,
@@ -24,14 +26,23 @@ from frappe.utils import (
 from frappe.utils.csvutils import build_csv_response
 from pypika.terms import ExistsCriterion
 
-from erpnext.manufacturing.doctype.bom.bom import get_children as get_bom_children
-from erpnext.manufacturing.doctype.bom.bom import validate_bom_no
+from erpnext.manufacturing.doctype.bom.bom import get_bom_explosion, validate_bom_no
+from erpnext.manufacturing.doctype.production_plan.material_requirements_planning import (
+	MaterialRequirementsPlanner,
+)
 from erpnext.manufacturing.doctype.work_order.work_order import get_item_details
 from erpnext.setup.doctype.item_group.item_group import get_item_group_defaults
 from erpnext.stock.get_item_details import get_conversion_factor
 from erpnext.stock.utils import get_or_make_bin
 from erpnext.utilities.transaction_base import validate_uom_is_integer
 
+# plans with more assembly and sub assembly rows create their work orders in a background job
+WORK_ORDER_QUEUE_THRESHOLD = 100
+# work orders and purchase orders committed together by the background job
+WORK_ORDER_INSERT_BATCH_SIZE = 50
+# plans with more assembly and sub assembly rows plan their material requirements in a background job
+MATERIAL_PLANNING_QUEUE_THRESHOLD = 100
+
 
 class ProductionPlan(Document):
 	# begin: auto-generated types
@@ -721,15 +732,46 @@ class ProductionPlan(Document):
 
 	@frappe.whitelist()
 	def make_work_order(self):
+		if len(self.po_items) + len(self.sub_assembly_items) > WORK_ORDER_QUEUE_THRESHOLD:
+			msgprint(
+				_(
+					"The Work Orders and Purchase Orders will be created in a background job. In case there is any issue on processing in background, the system will add a comment about the error on this Production Plan"
+				)
+			)
+			self.queue_action("make_work_order", timeout=4600, commit_in_batches=True)
+		else:
+			self._make_work_order()
+
+	def _make_work_order(self, commit_in_batches=False):
+		"""Create the draft Work Orders and subcontracted Purchase Orders of the plan.
+
+		All documents are prepared first. With `commit_in_batches` they are inserted and committed
+		in batches of `WORK_ORDER_INSERT_BATCH_SIZE`, rows that already have a draft from an
+		interrupted run are skipped, and the Bins of the plan are recalculated once at the end."""
 		from erpnext.manufacturing.doctype.work_order.work_order import get_default_warehouse
 
-		wo_list, po_list = [], []
-		subcontracted_po = {}
+		work_orders, subcontracted_po = [], {}
 		default_warehouses = get_default_warehouse()
 
-		self.make_work_order_for_finished_goods(wo_list, default_warehouses)
-		self.make_work_order_for_subassembly_items(wo_list, subcontracted_po, default_warehouses)
-		self.make_subcontracted_purchase_order(subcontracted_po, po_list)
+		self.make_work_order_for_finished_goods(work_orders, default_warehouses)
+		self.make_work_order_for_subassembly_items(work_orders, subcontracted_po, default_warehouses)
+		purchase_orders = self.make_subcontracted_purchase_order(subcontracted_po)
+
+		if commit_in_batches:
+			work_orders, purchase_orders = self.skip_drafts_of_interrupted_run(work_orders, purchase_orders)
+
+		wo_list, po_list = [], []
+		for batch in create_batch(work_orders + purchase_orders, WORK_ORDER_INSERT_BATCH_SIZE):
+			for doc in batch:
+				if name := self.insert_planned_doc(doc):
+					(wo_list if doc.doctype == "Work Order" else po_list).append(name)
+
+			if commit_in_batches:
+				frappe.db.commit()
+
+		if commit_in_batches:
+			self.update_bin_qty()
+
 		self.show_list_created_message("Work Order", wo_list)
 		self.show_list_created_message("Purchase Order", po_list)
 
@@ -739,7 +781,48 @@ class ProductionPlan(Document):
 		if not po_list:
 			frappe.msgprint(_("No Purchase Orders were created"))
 
-	def make_work_order_for_finished_goods(self, wo_list, default_warehouses):
+	def skip_drafts_of_interrupted_run(self, work_orders, purchase_orders):
+		"""Leave out the rows that already have a draft Work Order or Purchase Order of this plan"""
+		draft_rows = set()
+		for d in frappe.get_all(
+			"Work Order",
+			filters={"production_plan": self.name, "docstatus": 0},
+			fields=["production_plan_item", "production_plan_sub_assembly_item"],
+		):
+			draft_rows.add(d.production_plan_sub_assembly_item or d.production_plan_item)
+
+		draft_rows.update(
+			frappe.get_all(
+				"Purchase Order Item",
+				filters={"production_plan": self.name, "docstatus": 0},
+				pluck="production_plan_sub_assembly_item",
+			)
+		)
+		draft_rows.discard(None)
+
+		work_orders = [
+			wo
+			for wo in work_orders
+			if (wo.production_plan_sub_assembly_item or wo.production_plan_item) not in draft_rows
+		]
+
+		for po in purchase_orders:
+			po.items = [d for d in po.items if d.production_plan_sub_assembly_item not in draft_rows]
+
+		return work_orders, [po for po in purchase_orders if po.items]
+
+	def insert_planned_doc(self, doc):
+		from erpnext.manufacturing.doctype.work_order.work_order import OverProductionError
+
+		try:
+			doc.flags.ignore_mandatory = True
+			doc.flags.ignore_validate = True
+			doc.insert()
+			return doc.name
+		except OverProductionError:
+			pass
+
+	def make_work_order_for_finished_goods(self, work_orders, default_warehouses):
 		items_data = self.get_production_items()
 
 		for _key, item in items_data.items():
@@ -747,11 +830,10 @@ class ProductionPlan(Document):
 				item["use_multi_level_bom"] = 0
 
 			set_default_warehouses(item, default_warehouses)
-			work_order = self.create_work_order(item)
-			if work_order:
-				wo_list.append(work_order)
+			if work_order := self.prepare_work_order(item):
+				work_orders.append(work_order)
 
-	def make_work_order_for_subassembly_items(self, wo_list, subcontracted_po, default_warehouses):
+	def make_work_order_for_subassembly_items(self, work_orders, subcontracted_po, default_warehouses):
 		for row in self.sub_assembly_items:
 			if row.type_of_manufacturing == "Subcontract":
 				subcontracted_po.setdefault(row.supplier, []).append(row)
@@ -775,9 +857,8 @@ class ProductionPlan(Document):
 			if work_order_data.get("qty") <= 0:
 				continue
 
-			work_order = self.create_work_order(work_order_data)
-			if work_order:
-				wo_list.append(work_order)
+			if work_order := self.prepare_work_order(work_order_data):
+				work_orders.append(work_order)
 
 	def prepare_data_for_sub_assembly_items(self, row, wo_data):
 		for field in [
@@ -806,10 +887,9 @@ class ProductionPlan(Document):
 			}
 		)
 
-	def make_subcontracted_purchase_order(self, subcontracted_po, purchase_orders):
-		if not subcontracted_po:
-			return
-
+	def make_subcontracted_purchase_order(self, subcontracted_po):
+		"""Return the unsaved subcontracted Purchase Orders, one per supplier"""
+		purchase_orders = []
 		for supplier, po_list in subcontracted_po.items():
 			po = frappe.new_doc("Purchase Order")
 			po.company = self.company
@@ -840,10 +920,9 @@ class ProductionPlan(Document):
 
 			po.set_service_items_for_finished_goods()
 			po.set_missing_values()
-			po.flags.ignore_mandatory = True
-			po.flags.ignore_validate = True
-			po.insert()
-			purchase_orders.append(po.name)
+			purchase_orders.append(po)
+
+		return purchase_orders
 
 	def show_list_created_message(self, doctype, doc_list=None):
 		if not doc_list:
@@ -855,8 +934,11 @@ class ProductionPlan(Document):
 			msgprint(_("{0} created").format(comma_and(doc_list)))
 
 	def create_work_order(self, item):
-		from erpnext.manufacturing.doctype.work_order.work_order import OverProductionError
+		if work_order := self.prepare_work_order(item):
+			return self.insert_planned_doc(work_order)
 
+	def prepare_work_order(self, item):
+		"""Return the unsaved Work Order for `item`"""
 		if flt(item.get("qty")) <= 0:
 			return
 
@@ -870,13 +952,66 @@ class ProductionPlan(Document):
 		wo.set_work_order_operations()
 		wo.set_required_items()
 
-		try:
-			wo.flags.ignore_mandatory = True
-			wo.flags.ignore_validate = True
-			wo.insert()
-			return wo.name
-		except OverProductionError:
-			pass
+		return wo
+
+	@frappe.whitelist()
+	def plan_material_requirements(self):
+		if len(self.po_items) + len(self.sub_assembly_items) > MATERIAL_PLANNING_QUEUE_THRESHOLD:
+			msgprint(
+				_(
+					"The material requirements will be planned in a background job. In case there is any issue on processing in background, the system will add a comment about the error on this Production Plan"
+				)
+			)
+			self.queue_action("plan_material_requirements", timeout=4600)
+		else:
+			self._plan_material_requirements()
+
+	def _plan_material_requirements(self):
+		"""Set the Material Request Plan Items to the time-phased net requirements of the plan.
+
+		The components of the assembly and in house sub assembly rows are required by their planned
+		start date, sub assemblies planned through Material Requests by their schedule date."""
+		planner = MaterialRequirementsPlanner(
+			self.company,
+			for_warehouse=self.for_warehouse,
+			include_safety_stock=self.include_safety_stock,
+			ignore_existing_ordered_qty=self.ignore_existing_ordered_qty,
+			include_non_stock_items=self.include_non_stock_items,
+			consider_minimum_order_qty=self.consider_minimum_order_qty,
+		)
+
+		for row in self.po_items:
+			planner.add_production(
+				row.item_code,
+				row.bom_no,
+				row.planned_qty,
+				row.planned_start_date,
+				row.warehouse,
+				row.sales_order,
+			)
+
+		for row in self.sub_assembly_items:
+			# sub assemblies of the plan are not planned again as components of their parents
+			planner.skip_item(row.production_item)
+			if row.type_of_manufacturing == "In House":
+				planner.add_production(
+					row.production_item,
+					row.bom_no,
+					row.qty,
+					row.schedule_date,
+					row.fg_warehouse,
+					row.sales_order,
+				)
+			elif row.type_of_manufacturing == "Material Request":
+				planner.add_demand(
+					row.production_item, row.qty, row.schedule_date, row.fg_warehouse, row.sales_order
+				)
+
+		self.set("mr_items", [])
+		for planned_order in planner.run():
+			self.append("mr_items", planned_order)
+
+		self.save()
 
 	@frappe.whitelist()
 	def make_material_request(self):
@@ -1219,17 +1354,31 @@ def get_exploded_items(item_details, company, bom_no, include_non_stock_items, p
 	).run(as_dict=True)
 
 	for d in data:
-		if not d.conversion_factor and d.purchase_uom:
-			d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
 		item_details.setdefault(d.get("item_code"), d)
 
 	return item_details
 
 
-def get_uom_conversion_factor(item_code, uom):
-	return frappe.db.get_value(
-		"UOM Conversion Detail", {"parent": item_code, "uom": uom}, "conversion_factor"
-	)
+def set_uom_conversion_factors(rows):
+	"""Set the purchase UOM conversion factor of all `rows` that miss it with one query"""
+	rows = [d for d in rows if not d.conversion_factor and d.purchase_uom]
+	if not rows:
+		return
+
+	uom_detail = frappe.qb.DocType("UOM Conversion Detail")
+	conversion_factors = {
+		(d.parent, d.uom): d.conversion_factor
+		for d in (
+			frappe.qb.from_(uom_detail)
+			.select(uom_detail.parent, uom_detail.uom, uom_detail.conversion_factor)
+			.where(
+				Tuple(uom_detail.parent, uom_detail.uom).isin([(d.item_code, d.purchase_uom) for d in rows])
+			)
+		).run(as_dict=True)
+	}
+
+	for d in rows:
+		d.conversion_factor = conversion_factors.get((d.item_code, d.purchase_uom))
 
 
 def get_subitems(
@@ -1291,9 +1440,6 @@ def get_subitems(
 			if d.item_code in item_details:
 				item_details[d.item_code].qty = item_details[d.item_code].qty + d.qty
 			else:
-				if not d.conversion_factor and d.purchase_uom:
-					d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
-
 				item_details[d.item_code] = d
 
 		if data.get("include_exploded_items") and d.default_bom:
@@ -1357,7 +1503,7 @@ def get_material_request_items(
 
 			required_qty = required_qty / row["conversion_factor"]
 
-	if frappe.db.get_value("UOM", row["purchase_uom"], "must_be_whole_number"):
+	if frappe.get_cached_value("UOM", row["purchase_uom"], "must_be_whole_number"):
 		required_qty = ceil(required_qty)
 
 	if include_safety_stock:
@@ -1475,15 +1621,20 @@ def get_bin_details(row, company, for_warehouse=None, all_warehouse=False):
 	if isinstance(row, str):
 		row = frappe._dict(json.loads(row))
 
+	warehouse = ""
+	if not all_warehouse:
+		warehouse = for_warehouse or row.get("source_warehouse") or row.get("default_warehouse")
+
+	return get_bin_details_for_items([row["item_code"]], company, warehouse).get(row["item_code"], [])
+
+
+def get_bin_details_for_items(item_codes, company, warehouse=None):
+	"""Return warehouse wise bin details of all `item_codes` in one query, grouped by item code"""
 	bin = frappe.qb.DocType("Bin")
 	wh = frappe.qb.DocType("Warehouse")
 
 	subquery = frappe.qb.from_(wh).select(wh.name).where(wh.company == company)
 
-	warehouse = ""
-	if not all_warehouse:
-		warehouse = for_warehouse or row.get("source_warehouse") or row.get("default_warehouse")
-
 	if warehouse:
 		lft, rgt = frappe.db.get_value("Warehouse", warehouse, ["lft", "rgt"])
 		subquery = subquery.where((wh.lft >= lft) & (wh.rgt <= rgt) & (wh.name == bin.warehouse))
@@ -1491,6 +1642,7 @@ def get_bin_details(row, company, for_warehouse=None, all_warehouse=False):
 	query = (
 		frappe.qb.from_(bin)
 		.select(
+			bin.item_code,
 			bin.warehouse,
 			IfNull(Sum(bin.projected_qty), 0).as_("projected_qty"),
 			IfNull(Sum(bin.actual_qty), 0).as_("actual_qty"),
@@ -1498,11 +1650,15 @@ def get_bin_details(row, company, for_warehouse=None, all_warehouse=False):
 			IfNull(Sum(bin.reserved_qty_for_production), 0).as_("reserved_qty_for_production"),
 			IfNull(Sum(bin.planned_qty), 0).as_("planned_qty"),
 		)
-		.where((bin.item_code == row["item_code"]) & (bin.warehouse.isin(subquery)))
+		.where((bin.item_code.isin(item_codes)) & (bin.warehouse.isin(subquery)))
 		.groupby(bin.item_code, bin.warehouse)
 	)
 
-	return query.run(as_dict=True)
+	bin_details = defaultdict(list)
+	for d in query.run(as_dict=True):
+		bin_details[d.pop("item_code")].append(d)
+
+	return bin_details
 
 
 @frappe.whitelist()
@@ -1641,9 +1797,8 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 		elif data.get("item_code"):
 			item_master = frappe.get_doc("Item", data["item_code"]).as_dict()
 			purchase_uom = item_master.purchase_uom or item_master.stock_uom
-			conversion_factor = (
-				get_uom_conversion_factor(item_master.name, purchase_uom) if item_master.purchase_uom else 1.0
-			)
+			# the purchase UOM conversion factors of all rows are set together below
+			conversion_factor = None if item_master.purchase_uom else 1.0
 
 			item_details[item_master.name] = frappe._dict(
 				{
@@ -1674,35 +1829,56 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 			else:
 				so_item_details[sales_order][item_code] = details
 
+	set_uom_conversion_factors(
+		[details for item_dict in so_item_details.values() for details in item_dict.values()]
+	)
+
 	mr_items = []
 	consumed_qty = defaultdict(float)
 
+	# resolve the warehouse of every row first, so that bins are fetched once per warehouse
+	rows = []
+	warehouse_wise_items = defaultdict(set)
 	for sales_order in so_item_details:
 		item_dict = so_item_details[sales_order]
 		for details in item_dict.values():
 			warehouse = warehouse or details.get("source_warehouse") or details.get("default_warehouse")
-			bin_dict = get_bin_details(details, doc.company, warehouse)
-			bin_dict = bin_dict[0] if bin_dict else {}
-
-			if details.qty > 0:
-				items = get_material_request_items(
-					doc,
-					details,
-					sales_order,
-					company,
-					ignore_existing_ordered_qty,
-					include_safety_stock,
-					warehouse,
-					bin_dict,
-					consumed_qty,
-				)
-				if items:
-					mr_items.append(items)
+			warehouse_wise_items[warehouse].add(details.item_code)
+			rows.append((sales_order, details, warehouse))
+
+	bin_details = {
+		warehouse: get_bin_details_for_items(list(item_codes), doc.company, warehouse)
+		for warehouse, item_codes in warehouse_wise_items.items()
+	}
+
+	for sales_order, details, warehouse in rows:
+		bin_dict = bin_details[warehouse].get(details.item_code)
+		bin_dict = bin_dict[0] if bin_dict else {}
+
+		if details.qty > 0:
+			items = get_material_request_items(
+				doc,
+				details,
+				sales_order,
+				company,
+				ignore_existing_ordered_qty,
+				include_safety_stock,
+				warehouse,
+				bin_dict,
+				consumed_qty,
+			)
+			if items:
+				mr_items.append(items)
 
 	if (not ignore_existing_ordered_qty or get_parent_warehouse_data) and warehouses:
 		new_mr_items = []
+		available_locations, purchase_uoms = get_available_locations_for_mr_items(
+			mr_items, warehouses, company
+		)
 		for item in mr_items:
-			get_materials_from_other_locations(item, warehouses, new_mr_items, company)
+			get_materials_from_other_locations(
+				item, warehouses, new_mr_items, company, available_locations, purchase_uoms
+			)
 
 		mr_items = new_mr_items
 
@@ -1722,19 +1898,49 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 	return mr_items
 
 
-def get_materials_from_other_locations(item, warehouses, new_mr_items, company):
-	from erpnext.stock.doctype.pick_list.pick_list import get_available_item_locations
+def get_available_locations_for_mr_items(mr_items, warehouses, company):
+	"""Return the stock locations and the purchase UOM of all items in `mr_items`, keyed by item code.
 
-	stock_uom, purchase_uom = frappe.db.get_value(
-		"Item", item.get("item_code"), ["stock_uom", "purchase_uom"]
+	The locations of an item cover the largest quantity required by any of its rows."""
+	from erpnext.stock.doctype.pick_list.pick_list import get_available_locations_for_items
+
+	required_qty_map = defaultdict(float)
+	for item in mr_items:
+		required_qty = item.get("quantity") * item.get("conversion_factor")
+		required_qty_map[item.get("item_code")] = max(required_qty_map[item.get("item_code")], required_qty)
+
+	if not required_qty_map:
+		return {}, {}
+
+	available_locations = get_available_locations_for_items(
+		required_qty_map, warehouses, company, ignore_validation=True
+	)
+	purchase_uoms = dict(
+		frappe.get_all(
+			"Item",
+			filters={"name": ("in", list(required_qty_map))},
+			fields=["name", "purchase_uom"],
+			as_list=True,
+		)
 	)
 
-	locations = get_available_item_locations(
-		item.get("item_code"),
-		warehouses,
+	return available_locations, purchase_uoms
+
+
+def get_materials_from_other_locations(
+	item, warehouses, new_mr_items, company, available_locations=None, purchase_uoms=None
+):
+	from erpnext.stock.doctype.pick_list.pick_list import get_locations_based_on_required_qty
+
+	if available_locations is None:
+		available_locations, purchase_uoms = get_available_locations_for_mr_items([item], warehouses, company)
+
+	purchase_uom = purchase_uoms.get(item.get("item_code"))
+
+	# the locations are shared by all rows of the item, allocate from a copy
+	locations = get_locations_based_on_required_qty(
+		copy.deepcopy(available_locations.get(item.get("item_code")) or []),
 		item.get("quantity") * item.get("conversion_factor"),
-		company,
-		ignore_validation=True,
 	)
 
 	required_qty = item.get("quantity")
@@ -1769,7 +1975,7 @@ def get_materials_from_other_locations(item, warehouses, new_mr_items, company):
 	if flt(required_qty, precision) > 0:
 		required_qty = required_qty
 
-		if frappe.db.get_value("UOM", purchase_uom, "must_be_whole_number"):
+		if frappe.get_cached_value("UOM", purchase_uom, "must_be_whole_number"):
 			required_qty = ceil(required_qty)
 
 		item["quantity"] = required_qty / item.get("conversion_factor")
@@ -1799,61 +2005,76 @@ def get_sub_assembly_items(
 	indent=0,
 	skip_available_sub_assembly_item=False,
 ):
-	data = get_bom_children(parent=bom_no)
-	for d in data:
-		if d.expandable:
-			parent_item_code = frappe.get_cached_value("BOM", bom_no, "item")
-			stock_qty = (d.stock_qty / d.parent_bom_qty) * flt(to_produce_qty)
-
-			if skip_available_sub_assembly_item and d.item_code not in sub_assembly_items:
-				bin_details.setdefault(d.item_code, get_bin_details(d, company, for_warehouse=warehouse))
-
-				for _bin_dict in bin_details[d.item_code]:
-					if _bin_dict.projected_qty > 0:
-						if _bin_dict.projected_qty >= stock_qty:
-							_bin_dict.projected_qty -= stock_qty
-							stock_qty = 0
-							continue
-						else:
-							stock_qty = stock_qty - _bin_dict.projected_qty
-							sub_assembly_items.append(d.item_code)
-			elif warehouse:
-				bin_details.setdefault(d.item_code, get_bin_details(d, company, for_warehouse=warehouse))
-
-			if stock_qty > 0:
-				bom_data.append(
-					frappe._dict(
-						{
-							"actual_qty": bin_details[d.item_code][0].get("actual_qty", 0)
-							if bin_details.get(d.item_code)
-							else 0,
-							"parent_item_code": parent_item_code,
-							"description": d.description,
-							"production_item": d.item_code,
-							"item_name": d.item_name,
-							"stock_uom": d.stock_uom,
-							"uom": d.stock_uom,
-							"bom_no": d.value,
-							"is_sub_contracted_item": d.is_sub_contracted_item,
-							"bom_level": indent,
-							"indent": indent,
-							"stock_qty": stock_qty,
-						}
-					)
-				)
+	explosion = [d for d in get_bom_explosion(bom_no) if d.bom_no]
+	for bom in {bom_no, *(d.parent_bom for d in explosion)}:
+		frappe.has_permission("BOM", doc=frappe.get_cached_doc("BOM", bom), throw=True)
+
+	if not explosion:
+		return
+
+	item_details = {
+		d.name: d
+		for d in frappe.get_list(
+			"Item",
+			fields=["name", "item_name", "description", "stock_uom", "is_sub_contracted_item"],
+			filters={"name": ("in", list({d.item_code for d in explosion}))},
+		)
+	}
 
-				if d.value:
-					get_sub_assembly_items(
-						sub_assembly_items,
-						bin_details,
-						d.value,
-						bom_data,
-						stock_qty,
-						company,
-						warehouse,
-						indent=indent + 1,
-						skip_available_sub_assembly_item=skip_available_sub_assembly_item,
-					)
+	# qty to produce of the sub assembly being walked at each level
+	parent_qty = {-1: flt(to_produce_qty)}
+	skip_below = None
+
+	for row in explosion:
+		if skip_below is not None:
+			if row.indent > skip_below:
+				continue
+			skip_below = None
+
+		d = frappe._dict(item_details.get(row.item_code) or {}, item_code=row.item_code, value=row.bom_no)
+		stock_qty = row.qty_factor * parent_qty[row.indent - 1]
+
+		if skip_available_sub_assembly_item and d.item_code not in sub_assembly_items:
+			bin_details.setdefault(d.item_code, get_bin_details(d, company, for_warehouse=warehouse))
+
+			for _bin_dict in bin_details[d.item_code]:
+				if _bin_dict.projected_qty > 0:
+					if _bin_dict.projected_qty >= stock_qty:
+						_bin_dict.projected_qty -= stock_qty
+						stock_qty = 0
+						continue
+					else:
+						stock_qty = stock_qty - _bin_dict.projected_qty
+						sub_assembly_items.append(d.item_code)
+		elif warehouse:
+			bin_details.setdefault(d.item_code, get_bin_details(d, company, for_warehouse=warehouse))
+
+		if stock_qty <= 0:
+			# nothing to make, so nothing to make it from either
+			skip_below = row.indent
+			continue
+
+		parent_qty[row.indent] = stock_qty
+		bom_data.append(
+			frappe._dict(
+				{
+					"actual_qty": bin_details[d.item_code][0].get("actual_qty", 0)
+					if bin_details.get(d.item_code)
+					else 0,
+					"parent_item_code": row.parent_item,
+					"description": d.description,
+					"production_item": d.item_code,
+					"item_name": d.item_name,
+					"stock_uom": d.stock_uom,
+					"uom": d.stock_uom,
+					"bom_no": d.value,
+					"is_sub_contracted_item": d.is_sub_contracted_item,
+					"bom_level": indent + row.indent,
+					"indent": indent + row.indent,
+					"stock_qty": stock_qty,
+				}
+			)
+		)
 
 
 def set_default_warehouses(row, default_warehouses):
@@ -1992,9 +2213,6 @@ def get_raw_materials_of_sub_assembly_items(
 			)
 			existing_sub_assembly_items.add(item.item_code)
 		else:
-			if not item.conversion_factor and item.purchase_uom:
-				item.conversion_factor = get_uom_conversion_factor(item.item_code, item.purchase_uom)
-
 			if details := item_details.get(item.get("item_code")):
 				details.qty += item.get("qty")
 			else:
@@ -1,11 +1,16 @@
 # Copyright (c) 2017, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
+from unittest.mock import patch
+
 import frappe
 from frappe.tests.utils import FrappeTestCase
-from frappe.utils import add_to_date, flt, getdate, now_datetime, nowdate
+from frappe.utils import add_days, add_to_date, flt, getdate, now_datetime, nowdate
 
 from erpnext.controllers.item_variant import create_variant
+from erpnext.manufacturing.doctype.production_plan import production_plan
 from erpnext.manufacturing.doctype.production_plan.production_plan import (
+	ProductionPlan,
+	get_bin_details_for_items,
 	get_items_for_material_requests,
 	get_non_completed_production_plans,
 	get_sales_orders,
@@ -2051,6 +2056,157 @@ class TestProductionPlan(FrappeTestCase):
 		for row in plan.sub_assembly_items:
 			self.assertEqual(row.ordered_qty, 10.0)
 
+	def test_bin_details_for_items(self):
+		items = ["Raw Material Item 1", "Raw Material Item 2"]
+		make_stock_entry(item_code=items[0], target="_Test Warehouse - _TC", qty=5, basic_rate=100)
+		make_stock_entry(item_code=items[1], target="_Test Warehouse 1 - _TC", qty=3, basic_rate=100)
+		qty_fields = [
+			"projected_qty",
+			"actual_qty",
+			"ordered_qty",
+			"reserved_qty_for_production",
+			"planned_qty",
+		]
+
+		def get_bins(item_code, warehouse):
+			warehouse_filters = {"company": "_Test Company"}
+			if warehouse:
+				lft, rgt = frappe.db.get_value("Warehouse", warehouse, ["lft", "rgt"])
+				warehouse_filters.update({"lft": (">=", lft), "rgt": ("<=", rgt)})
+
+			return [
+				{"warehouse": d.warehouse, **{field: flt(d[field]) for field in qty_fields}}
+				for d in frappe.get_all(
+					"Bin",
+					filters={
+						"item_code": item_code,
+						"warehouse": ("in", frappe.get_all("Warehouse", warehouse_filters, pluck="name")),
+					},
+					fields=["warehouse", *qty_fields],
+					order_by="warehouse",
+				)
+			]
+
+		for warehouse in (None, "_Test Warehouse - _TC", "All Warehouses - _TC"):
+			bin_details = get_bin_details_for_items(items, "_Test Company", warehouse)
+			for item_code in items:
+				self.assertEqual(
+					[
+						{"warehouse": d.warehouse, **{field: flt(d[field]) for field in qty_fields}}
+						for d in sorted(bin_details.get(item_code, []), key=lambda d: d.warehouse)
+					],
+					get_bins(item_code, warehouse),
+				)
+
+		bin_details = get_bin_details_for_items(items, "_Test Company", "_Test Warehouse - _TC")
+		self.assertEqual([d.warehouse for d in bin_details[items[0]]], ["_Test Warehouse - _TC"])
+		self.assertGreaterEqual(bin_details[items[0]][0].actual_qty, 5)
+
+	def test_material_requirements_planning(self):
+		from erpnext.buying.doctype.purchase_order.test_purchase_order import create_purchase_order
+
+		fg_item, sub_assembly, rm_item_1, rm_item_2 = (
+			"MRP FG Item",
+			"MRP Sub Assembly Item",
+			"MRP Raw Material 1",
+			"MRP Raw Material 2",
+		)
+		for item_code in (fg_item, sub_assembly, rm_item_1, rm_item_2):
+			create_item(item_code, valuation_rate=100)
+
+		frappe.db.set_value(
+			"Item", sub_assembly, {"default_material_request_type": "Manufacture", "lead_time_days": 2}
+		)
+		make_bom(item=sub_assembly, raw_materials=[rm_item_2], rm_qty=3)
+		make_bom(item=fg_item, raw_materials=[sub_assembly, rm_item_1], rm_qty=2)
+
+		warehouse = "_Test Warehouse - _TC"
+		start_date = add_days(nowdate(), 4)
+		make_stock_entry(item_code=rm_item_1, target=warehouse, qty=4, basic_rate=100)
+
+		# received before the sub assembly has to be started
+		create_purchase_order(item_code=rm_item_2, qty=15, warehouse=warehouse)
+		# received too late to be netted
+		late_po = create_purchase_order(item_code=rm_item_2, qty=100, warehouse=warehouse)
+		frappe.db.set_value("Purchase Order Item", late_po.items[0].name, "schedule_date", start_date)
+
+		plan = create_production_plan(
+			item_code=fg_item,
+			planned_qty=10,
+			planned_start_date=start_date,
+			skip_getting_mr_items=True,
+			do_not_submit=True,
+		)
+		plan.for_warehouse = warehouse
+		plan._plan_material_requirements()
+
+		self.assertEqual(
+			sorted(
+				(d.item_code, d.material_request_type, d.quantity, getdate(d.schedule_date))
+				for d in plan.mr_items
+			),
+			[
+				(rm_item_1, "Purchase", 16, getdate(start_date)),
+				(rm_item_2, "Purchase", 45, getdate(add_days(start_date, -2))),
+				(sub_assembly, "Manufacture", 20, getdate(start_date)),
+			],
+		)
+
+	def test_work_orders_of_large_plans_are_queued(self):
+		plan = create_production_plan(item_code="Test Production Item 1", skip_getting_mr_items=True)
+		row_count = len(plan.po_items) + len(plan.sub_assembly_items)
+
+		with (
+			patch.object(ProductionPlan, "queue_action") as queue_action,
+			patch.object(ProductionPlan, "_make_work_order") as make_work_order,
+		):
+			with patch.object(production_plan, "WORK_ORDER_QUEUE_THRESHOLD", row_count):
+				plan.make_work_order()
+
+			queue_action.assert_not_called()
+			make_work_order.assert_called_once()
+
+			make_work_order.reset_mock()
+			with patch.object(production_plan, "WORK_ORDER_QUEUE_THRESHOLD", row_count - 1):
+				plan.make_work_order()
+
+			queue_action.assert_called_once_with("make_work_order", timeout=4600, commit_in_batches=True)
+			make_work_order.assert_not_called()
+
+	def test_work_orders_committed_in_batches(self):
+		plan = create_production_plan(
+			item_code="Test Production Item 1", skip_getting_mr_items=True, do_not_submit=True
+		)
+		plan.append(
+			"po_items",
+			{
+				"use_multi_level_bom": plan.po_items[0].use_multi_level_bom,
+				"item_code": plan.po_items[0].item_code,
+				"bom_no": plan.po_items[0].bom_no,
+				"planned_qty": 2,
+				"planned_start_date": now_datetime(),
+				"stock_uom": plan.po_items[0].stock_uom,
+			},
+		)
+		plan.submit()
+
+		def get_work_orders():
+			return frappe.get_all("Work Order", {"production_plan": plan.name, "docstatus": 0}, pluck="name")
+
+		with (
+			patch.object(production_plan, "WORK_ORDER_INSERT_BATCH_SIZE", 1),
+			patch.object(frappe.db, "commit") as commit,
+			patch.object(ProductionPlan, "update_bin_qty") as update_bin_qty,
+		):
+			plan._make_work_order(commit_in_batches=True)
+			self.assertEqual(len(get_work_orders()), 2)
+			self.assertEqual(commit.call_count, 2)
+			update_bin_qty.assert_called_once()
+
+			# a rerun after an interruption does not duplicate the drafts
+			plan._make_work_order(commit_in_batches=True)
+			self.assertEqual(len(get_work_orders()), 2)
+
 
 def create_production_plan(**args):
 	"""
@@ -28,6 +28,7 @@ from erpnext.manufacturing.doctype.bom.bom import (
 	get_bom_items_as_dict,
 	validate_bom_no,
 )
+from erpnext.manufacturing.doctype.job_card.job_card import capacity_planning, get_capacity_planner
 from erpnext.manufacturing.doctype.manufacturing_settings.manufacturing_settings import (
 	get_mins_between_operations,
 )
@@ -666,12 +667,13 @@ class WorkOrder(Document):
 		enable_capacity_planning = not cint(manufacturing_settings_doc.disable_capacity_planning)
 		plan_days = cint(manufacturing_settings_doc.capacity_planning_for_days) or 30
 
-		for idx, row in enumerate(self.operations):
-			qty = self.qty
-			while qty > 0:
-				qty = split_qty_based_on_batch_size(self, row, qty)
-				if row.job_card_qty > 0:
-					self.prepare_data_for_job_card(row, idx, plan_days, enable_capacity_planning)
+		with capacity_planning():
+			for idx, row in enumerate(self.operations):
+				qty = self.qty
+				while qty > 0:
+					qty = split_qty_based_on_batch_size(self, row, qty)
+					if row.job_card_qty > 0:
+						self.prepare_data_for_job_card(row, idx, plan_days, enable_capacity_planning)
 
 		planned_end_date = self.operations and self.operations[-1].planned_end_time
 		if planned_end_date:
@@ -689,7 +691,8 @@ class WorkOrder(Document):
 			row.planned_end_time = job_card_doc.scheduled_time_logs[-1].to_time
 
 			if date_diff(row.planned_end_time, self.planned_start_date) > plan_days:
-				frappe.message_log.pop()
+				if not job_card_doc.is_new():
+					frappe.message_log.pop()
 				frappe.throw(
 					_(
 						"Unable to find the time slot in the next {0} days for the operation {1}. Please increase the 'Capacity Planning For (Days)' in the {2}."
@@ -1586,6 +1589,18 @@ def make_job_card(work_order, operations):
 				create_job_card(work_order, row, auto_create=True)
 
 
+@frappe.whitelist()
+def release_work_orders(work_orders):
+	"""Submit draft work orders in the given order, scheduling the job cards of all of them
+	against one capacity planner and inserting them together."""
+	if isinstance(work_orders, str):
+		work_orders = json.loads(work_orders)
+
+	with capacity_planning():
+		for work_order in work_orders:
+			frappe.get_doc("Work Order", work_order).submit()
+
+
 @frappe.whitelist()
 def close_work_order(work_order, status):
 	if not frappe.has_permission("Work Order", "write"):
@@ -1711,6 +1726,10 @@ def create_job_card(work_order, row, enable_capacity_planning=False, auto_create
 		if enable_capacity_planning:
 			doc.schedule_time_logs(row)
 
+		if planner := get_capacity_planner():
+			planner.add_job_card(doc)
+			return doc
+
 		doc.insert()
 		frappe.msgprint(_("Job card {0} created").format(get_link_to_form("Job Card", doc.name)), alert=True)
 
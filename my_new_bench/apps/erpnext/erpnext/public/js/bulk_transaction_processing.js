@@ -13,6 +13,13 @@ $.extend(erpnext.bulk_transaction_processing, {
 		let count_of_rows = checked_items.length;
 		frappe.confirm(__("Create {0} {1} ?", [count_of_rows, __(to_doctype)]), () => {
 			if (doc_name.length == 0) {
+				frappe.realtime.off("bulk_transaction_progress");
+				frappe.realtime.on("bulk_transaction_progress", (data) => {
+					frappe.show_progress(data.title, data.count, data.total, data.message, true);
+					if (data.count >= data.total) {
+						frappe.realtime.off("bulk_transaction_progress");
+					}
+				});
 				frappe
 					.call({
 						method: "erpnext.utilities.bulk_transaction.transaction_processing",
@@ -8,6 +8,8 @@ from frappe import _, throw
 from frappe.model.document import Document
 from frappe.utils import cint, formatdate, get_datetime_str, nowdate
 
+from erpnext.setup.utils import clear_exchange_rate_cache
+
 
 class CurrencyExchange(Document):
 	# begin: auto-generated types
@@ -53,3 +55,9 @@ class CurrencyExchange(Document):
 
 		if not cint(self.for_buying) and not cint(self.for_selling):
 			throw(_("Currency Exchange must be applicable for Buying or for Selling."))
+
+	def on_update(self):
+		clear_exchange_rate_cache()
+
+	def on_trash(self):
+		clear_exchange_rate_cache()
@@ -7,7 +7,7 @@ from unittest import mock
 import frappe
 from frappe.utils import cint, flt
 
-from erpnext.setup.utils import get_exchange_rate
+from erpnext.setup.utils import clear_exchange_rate_cache, get_exchange_rate, preload_exchange_rates
 
 test_records = frappe.get_test_records("Currency Exchange")
 
@@ -184,3 +184,58 @@ class TestCurrencyExchange(unittest.TestCase):
 		exchange_rate = get_exchange_rate("USD", "INR", "2016-01-30", "for_buying")
 		self.assertFalse(exchange_rate == 65)
 		self.assertEqual(flt(exchange_rate, 3), 62.9)
+
+	def test_preloaded_exchange_rates(self, mock_get):
+		save_new_records(test_records)
+		frappe.db.set_single_value("Accounts Settings", "allow_stale", 0)
+		frappe.db.set_single_value("Accounts Settings", "stale_days", 10)
+
+		lookups = [
+			("2016-01-01", "for_buying"),
+			("2016-01-10", "for_buying"),
+			("2016-01-15", "for_buying"),
+			("2016-01-30", "for_selling"),
+		]
+		clear_exchange_rate_cache()
+		expected = [get_exchange_rate("USD", "INR", date, args) for date, args in lookups]
+
+		clear_exchange_rate_cache()
+		preload_exchange_rates([("USD", "INR")], "2016-01-01", "2016-01-30")
+		self.assertEqual([get_exchange_rate("USD", "INR", date, args) for date, args in lookups], expected)
+
+		# a new Currency Exchange record invalidates preloaded rates
+		curr_exchange = frappe.get_doc(
+			doctype="Currency Exchange",
+			date="2016-01-12",
+			from_currency="USD",
+			to_currency="INR",
+			exchange_rate=64.5,
+			for_buying=1,
+			for_selling=1,
+		).insert()
+		self.assertEqual(get_exchange_rate("USD", "INR", "2016-01-13", "for_buying"), 64.5)
+		curr_exchange.delete()
+
+	def test_exchange_rates_cleared_on_rollback(self, mock_get):
+		save_new_records(test_records)
+		frappe.db.commit()
+
+		clear_exchange_rate_cache()
+		expected = get_exchange_rate("USD", "INR", "2016-01-13", "for_buying")
+
+		# the callback added on the first write would be reset by this commit
+		frappe.db.commit()
+		frappe.get_doc(
+			doctype="Currency Exchange",
+			date="2016-01-12",
+			from_currency="USD",
+			to_currency="INR",
+			exchange_rate=64.5,
+			for_buying=1,
+			for_selling=1,
+		).insert()
+		self.assertEqual(get_exchange_rate("USD", "INR", "2016-01-13", "for_buying"), 64.5)
+
+		frappe.db.rollback()
+		self.assertFalse(frappe.db.exists("Currency Exchange", {"date": "2016-01-12", "exchange_rate": 64.5}))
+		self.assertEqual(get_exchange_rate("USD", "INR", "2016-01-13", "for_buying"), expected)
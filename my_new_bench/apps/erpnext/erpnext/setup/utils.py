@@ -1,9 +1,11 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: GNU General Public License v3. See license.txt
 
+from bisect import bisect_right
+
 import frappe
 from frappe import _
-from frappe.utils import add_days, flt, get_datetime_str, nowdate
+from frappe.utils import add_days, cint, flt, nowdate
 from frappe.utils.data import getdate, now_datetime
 from frappe.utils.nestedset import get_root_of
 
@@ -105,30 +107,10 @@ def get_exchange_rate(from_currency, to_currency, transaction_date=None, args=No
 		transaction_date = nowdate()
 
 	currency_settings = frappe.get_cached_doc("Accounts Settings")
-	allow_stale_rates = currency_settings.get("allow_stale")
-
-	filters = [
-		["date", "<=", get_datetime_str(transaction_date)],
-		["from_currency", "=", from_currency],
-		["to_currency", "=", to_currency],
-	]
-
-	if args == "for_buying":
-		filters.append(["for_buying", "=", "1"])
-	elif args == "for_selling":
-		filters.append(["for_selling", "=", "1"])
 
-	if not allow_stale_rates:
-		stale_days = currency_settings.get("stale_days")
-		checkpoint_date = add_days(transaction_date, -stale_days)
-		filters.append(["date", ">", get_datetime_str(checkpoint_date)])
-
-	# cksgb 19/09/2016: get last entry in Currency Exchange with from_currency and to_currency.
-	entries = frappe.get_all(
-		"Currency Exchange", fields=["exchange_rate"], filters=filters, order_by="date desc", limit=1
-	)
-	if entries:
-		return flt(entries[0].exchange_rate)
+	rate = get_rate_from_currency_exchange(from_currency, to_currency, transaction_date, args)
+	if rate is not None:
+		return rate
 
 	if frappe.get_cached_value("Currency Exchange Settings", "Currency Exchange Settings", "disabled"):
 		return 0.00
@@ -188,6 +170,142 @@ def get_exchange_rate(from_currency, to_currency, transaction_date=None, args=No
 		return 0.0
 
 
+def get_exchange_rates(currency_pairs, transaction_date=None, args=None):
+	"""Return a `{(from_currency, to_currency): rate}` map, preloading Currency Exchange in one query"""
+	currency_pairs = {(d[0], d[1]) for d in currency_pairs if d[0] and d[1]}
+	if not transaction_date:
+		transaction_date = nowdate()
+
+	preload_exchange_rates(currency_pairs, transaction_date, transaction_date)
+
+	return {
+		(from_currency, to_currency): get_exchange_rate(from_currency, to_currency, transaction_date, args)
+		for from_currency, to_currency in currency_pairs
+	}
+
+
+def preload_exchange_rates(currency_pairs, from_date, to_date):
+	"""Load Currency Exchange records for the given pairs so that lookups
+	dated between `from_date` and `to_date` are answered without a query"""
+	currency_pairs = {(d[0], d[1]) for d in currency_pairs if d[0] and d[1] and d[0] != d[1]}
+	if not currency_pairs:
+		return
+
+	from_date, to_date = getdate(from_date), getdate(to_date)
+	currency_settings = frappe.get_cached_doc("Accounts Settings")
+
+	# with stale rates allowed, the latest record before `to_date` may be of any age
+	lower_bound = None
+	filters = [
+		["from_currency", "in", list({d[0] for d in currency_pairs})],
+		["to_currency", "in", list({d[1] for d in currency_pairs})],
+		["date", "<=", to_date],
+	]
+	if not currency_settings.get("allow_stale"):
+		lower_bound = add_days(from_date, -cint(currency_settings.get("stale_days")))
+		filters.append(["date", ">=", lower_bound])
+
+	rates = {pair: [] for pair in currency_pairs}
+	for d in frappe.get_all(
+		"Currency Exchange",
+		fields=["from_currency", "to_currency", "date", "exchange_rate", "for_buying", "for_selling"],
+		filters=filters,
+		order_by="date asc",
+	):
+		if (d.from_currency, d.to_currency) in rates:
+			rates[(d.from_currency, d.to_currency)].append(d)
+
+	table = get_exchange_rate_table()
+	for pair, entries in rates.items():
+		table.rates[pair] = frappe._dict(
+			lower_bound=lower_bound,
+			upper_bound=to_date,
+			dates=[getdate(d.date) for d in entries],
+			entries=entries,
+		)
+
+
+def get_rate_from_currency_exchange(from_currency, to_currency, transaction_date, args=None):
+	"""Return the latest applicable Currency Exchange rate, or None if there isn't one"""
+	currency_settings = frappe.get_cached_doc("Accounts Settings")
+	transaction_date = getdate(transaction_date)
+
+	checkpoint_date = None
+	if not currency_settings.get("allow_stale"):
+		checkpoint_date = add_days(transaction_date, -cint(currency_settings.get("stale_days")))
+
+	table = get_exchange_rate_table()
+	key = (from_currency, to_currency, transaction_date, args, checkpoint_date)
+	if key in table.lookups:
+		return table.lookups[key]
+
+	preloaded = table.rates.get((from_currency, to_currency))
+	if (
+		preloaded
+		and transaction_date <= preloaded.upper_bound
+		and (
+			preloaded.lower_bound is None
+			or (checkpoint_date is not None and checkpoint_date >= preloaded.lower_bound)
+		)
+	):
+		rate = None
+		for idx in range(bisect_right(preloaded.dates, transaction_date) - 1, -1, -1):
+			entry = preloaded.entries[idx]
+			if checkpoint_date and preloaded.dates[idx] <= checkpoint_date:
+				break
+			if (args == "for_buying" and not entry.for_buying) or (
+				args == "for_selling" and not entry.for_selling
+			):
+				continue
+			rate = flt(entry.exchange_rate)
+			break
+	else:
+		filters = [
+			["date", "<=", transaction_date],
+			["from_currency", "=", from_currency],
+			["to_currency", "=", to_currency],
+		]
+
+		if args == "for_buying":
+			filters.append(["for_buying", "=", "1"])
+		elif args == "for_selling":
+			filters.append(["for_selling", "=", "1"])
+
+		if checkpoint_date:
+			filters.append(["date", ">", checkpoint_date])
+
+		# cksgb 19/09/2016: get last entry in Currency Exchange with from_currency and to_currency.
+		entries = frappe.get_all(
+			"Currency Exchange", fields=["exchange_rate"], filters=filters, order_by="date desc", limit=1
+		)
+		rate = flt(entries[0].exchange_rate) if entries else None
+
+	table.lookups[key] = rate
+	return rate
+
+
+def get_exchange_rate_table():
+	table = getattr(frappe.local, "exchange_rate_table", None)
+	if table is None:
+		table = frappe.local.exchange_rate_table = frappe._dict(rates={}, lookups={})
+
+	return table
+
+
+def clear_exchange_rate_cache():
+	"""Clear the rates read so far, called whenever a Currency Exchange is changed.
+
+	Rates read after the change must not outlive the transaction either, if it gets
+	rolled back. `Database.commit` resets the rollback callbacks, so every change adds
+	its own."""
+	reset_exchange_rate_table()
+	frappe.db.after_rollback.add(reset_exchange_rate_table)
+
+
+def reset_exchange_rate_table():
+	frappe.local.exchange_rate_table = None
+
+
 def format_ces_api(data, param):
 	return data.format(
 		transaction_date=param.get("transaction_date"),
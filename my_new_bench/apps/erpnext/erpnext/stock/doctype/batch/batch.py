@@ -158,6 +158,9 @@ class Batch(Document):
 
 	@frappe.whitelist()
 	def recalculate_batch_qty(self):
+		from erpnext.stock.doctype.batch_bin.batch_bin import rebuild_batch_bins
+
+		rebuild_batch_bins(self.name)
 		batches = get_batch_qty(
 			batch_no=self.name,
 			item_code=self.item,
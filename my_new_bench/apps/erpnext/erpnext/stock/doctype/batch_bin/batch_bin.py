@@ -0,0 +1,233 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Sum
+from frappe.utils import flt, now
+
+
+class BatchBin(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		actual_qty: DF.Float
+		batch_no: DF.Link
+		item_code: DF.Link
+		reserved_qty: DF.Float
+		warehouse: DF.Link
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_unique("Batch Bin", ["batch_no", "warehouse"], constraint_name="unique_batch_warehouse")
+	frappe.db.add_index("Batch Bin", ["item_code", "warehouse"])
+
+
+def get_or_make_batch_bin(batch_no: str, item_code: str, warehouse: str) -> str:
+	batch_bin = frappe.db.get_value("Batch Bin", {"batch_no": batch_no, "warehouse": warehouse})
+	if batch_bin:
+		return batch_bin
+
+	savepoint = "create_batch_bin"
+	try:
+		frappe.db.savepoint(savepoint)
+		batch_bin = frappe.get_doc(
+			doctype="Batch Bin", batch_no=batch_no, item_code=item_code, warehouse=warehouse
+		)
+		batch_bin.flags.ignore_permissions = True
+		batch_bin.insert()
+	except frappe.UniqueValidationError:
+		frappe.db.rollback(save_point=savepoint)  # preserve transaction in postgres
+		batch_bin = frappe.get_last_doc("Batch Bin", {"batch_no": batch_no, "warehouse": warehouse})
+
+	return batch_bin.name
+
+
+def update_batch_bin_qty(voucher_type, voucher_no, docstatus):
+	"""Apply the batch quantities moved by the voucher to the running batch-warehouse balances."""
+	precision = frappe.get_precision("Batch Bin", "actual_qty")
+	for row in get_batch_warehouse_qty(voucher_type=voucher_type, voucher_no=voucher_no):
+		qty = flt(row.qty, precision) * (-1 if docstatus == 2 else 1)
+		if not qty:
+			continue
+
+		batch_bin = frappe.qb.DocType("Batch Bin")
+		(
+			frappe.qb.update(batch_bin)
+			.set(batch_bin.actual_qty, batch_bin.actual_qty + qty)
+			.set(batch_bin.modified, now())
+			.where(batch_bin.name == get_or_make_batch_bin(row.batch_no, row.item_code, row.warehouse))
+		).run()
+
+
+def get_batch_warehouse_qty(voucher_type=None, voucher_no=None, batch_nos=None):
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	entry = frappe.qb.DocType("Serial and Batch Entry")
+
+	if voucher_no:
+		# Bundles posted by the voucher, reverted by the caller on cancellation
+		bundles = (
+			frappe.qb.from_(sle)
+			.select(sle.serial_and_batch_bundle)
+			.distinct()
+			.where(
+				(sle.voucher_type == voucher_type)
+				& (sle.voucher_no == voucher_no)
+				& (sle.serial_and_batch_bundle.isnotnull())
+			)
+		)
+
+		bundle = frappe.qb.DocType("Serial and Batch Bundle")
+		query = (
+			frappe.qb.from_(entry)
+			.inner_join(bundle)
+			.on(entry.parent == bundle.name)
+			.select(entry.batch_no, bundle.item_code, entry.warehouse, Sum(entry.qty).as_("qty"))
+			.where(entry.parent.isin(bundles))
+			.groupby(entry.batch_no, bundle.item_code, entry.warehouse)
+		)
+	else:
+		query = (
+			frappe.qb.from_(sle)
+			.inner_join(entry)
+			.on(sle.serial_and_batch_bundle == entry.parent)
+			.select(entry.batch_no, sle.item_code, entry.warehouse, Sum(entry.qty).as_("qty"))
+			.where(sle.is_cancelled == 0)
+			.groupby(entry.batch_no, sle.item_code, entry.warehouse)
+		)
+
+	query = query.where(entry.batch_no.isnotnull())
+	if batch_nos:
+		query = query.where(entry.batch_no.isin(batch_nos))
+
+	return query.run(as_dict=True)
+
+
+def get_batch_reserved_qty(item_code=None, warehouse=None, batch_nos=None):
+	"""Returns the qty reserved by Stock Reservation Entries, by batch and warehouse."""
+	sre = frappe.qb.DocType("Stock Reservation Entry")
+	sb_entry = frappe.qb.DocType("Serial and Batch Entry")
+	query = (
+		frappe.qb.from_(sre)
+		.inner_join(sb_entry)
+		.on(sre.name == sb_entry.parent)
+		.select(
+			sb_entry.batch_no,
+			sre.item_code,
+			sre.warehouse,
+			Sum(sb_entry.qty - sb_entry.delivered_qty).as_("qty"),
+		)
+		.where(
+			(sre.docstatus == 1)
+			& (sre.delivered_qty < sre.reserved_qty)
+			& (sre.reservation_based_on == "Serial and Batch")
+			& (sb_entry.batch_no.isnotnull())
+		)
+		.groupby(sb_entry.batch_no, sre.item_code, sre.warehouse)
+	)
+
+	if item_code:
+		query = query.where(sre.item_code == item_code)
+
+	if warehouse:
+		query = query.where(sre.warehouse == warehouse)
+
+	if batch_nos:
+		query = query.where(sb_entry.batch_no.isin(batch_nos))
+
+	return query.run(as_dict=True)
+
+
+def update_reserved_qty_in_batch_bins(item_code, warehouse, batch_nos):
+	reserved_qty = {
+		row.batch_no: row.qty for row in get_batch_reserved_qty(item_code, warehouse, list(batch_nos))
+	}
+
+	for batch_no in batch_nos:
+		frappe.db.set_value(
+			"Batch Bin",
+			get_or_make_batch_bin(batch_no, item_code, warehouse),
+			"reserved_qty",
+			flt(reserved_qty.get(batch_no)),
+		)
+
+
+def get_batch_bin_reserved_qty(item_code, warehouse=None, batch_nos=None) -> dict:
+	"""Returns a dict like {("batch_no", "warehouse"): "reserved_qty", ... }, oldest first."""
+	batch_bin = frappe.qb.DocType("Batch Bin")
+	query = (
+		frappe.qb.from_(batch_bin)
+		.select(batch_bin.batch_no, batch_bin.warehouse, batch_bin.reserved_qty)
+		.where((batch_bin.item_code == item_code) & (batch_bin.reserved_qty != 0))
+		.orderby(batch_bin.creation)
+	)
+
+	for field, value in (("warehouse", warehouse), ("batch_no", batch_nos)):
+		if not value:
+			continue
+
+		if isinstance(value, list):
+			query = query.where(batch_bin[field].isin(value))
+		else:
+			query = query.where(batch_bin[field] == value)
+
+	return {(d.batch_no, d.warehouse): d.reserved_qty for d in query.run(as_dict=True)}
+
+
+def rebuild_batch_bins(batch_nos=None):
+	"""Recompute the batch-warehouse balances from the submitted Serial and Batch Bundles
+	and the Stock Reservation Entries."""
+	if isinstance(batch_nos, str):
+		batch_nos = [batch_nos]
+
+	if batch_nos:
+		frappe.db.delete("Batch Bin", {"batch_no": ("in", batch_nos)})
+	else:
+		frappe.db.delete("Batch Bin")
+
+	batch_bins = {}
+	for row in get_batch_warehouse_qty(batch_nos=batch_nos):
+		batch_bins[(row.batch_no, row.warehouse)] = [row.item_code, flt(row.qty), 0.0]
+
+	for row in get_batch_reserved_qty(batch_nos=batch_nos):
+		batch_bins.setdefault((row.batch_no, row.warehouse), [row.item_code, 0.0, 0.0])[2] = flt(row.qty)
+
+	timestamp = now()
+	values = [
+		(
+			frappe.generate_hash(),
+			batch_no,
+			item_code,
+			warehouse,
+			actual_qty,
+			reserved_qty,
+			timestamp,
+			timestamp,
+			frappe.session.user,
+			frappe.session.user,
+		)
+		for (batch_no, warehouse), (item_code, actual_qty, reserved_qty) in batch_bins.items()
+	]
+
+	fields = [
+		"name",
+		"batch_no",
+		"item_code",
+		"warehouse",
+		"actual_qty",
+		"reserved_qty",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+	]
+
+	frappe.db.bulk_insert("Batch Bin", fields=fields, values=values)
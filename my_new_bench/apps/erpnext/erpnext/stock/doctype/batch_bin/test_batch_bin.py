@@ -0,0 +1,55 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
+	get_available_batches,
+	get_available_batches_from_ledgers,
+)
+from erpnext.stock.doctype.serial_and_batch_bundle.test_serial_and_batch_bundle import (
+	get_batch_from_bundle,
+)
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+
+
+class TestBatchBin(FrappeTestCase):
+	def test_batch_bin_follows_stock_ledger(self):
+		item_code = make_item(
+			"_Test Batch Bin Item",
+			{
+				"is_stock_item": 1,
+				"has_batch_no": 1,
+				"create_new_batch": 1,
+				"batch_number_series": "TBB-.#####",
+			},
+		).name
+		warehouse = "_Test Warehouse - _TC"
+
+		receipt = make_stock_entry(item_code=item_code, target=warehouse, qty=10, basic_rate=100)
+		batch_no = get_batch_from_bundle(receipt.items[0].serial_and_batch_bundle)
+
+		def get_batch_bin_qty():
+			return frappe.db.get_value(
+				"Batch Bin", {"batch_no": batch_no, "warehouse": warehouse}, "actual_qty"
+			)
+
+		self.assertEqual(get_batch_bin_qty(), 10)
+
+		issue = make_stock_entry(item_code=item_code, source=warehouse, qty=4, batch_no=batch_no)
+		self.assertEqual(get_batch_bin_qty(), 6)
+
+		kwargs = frappe._dict(item_code=item_code, warehouse=warehouse, for_stock_levels=True)
+		self.assertEqual(
+			[(d.batch_no, d.qty) for d in get_available_batches(kwargs)],
+			[(d.batch_no, d.qty) for d in get_available_batches_from_ledgers(kwargs)],
+		)
+
+		issue.cancel()
+		self.assertEqual(get_batch_bin_qty(), 10)
+
+		frappe.db.set_value("Batch Bin", {"batch_no": batch_no}, "actual_qty", 0)
+		frappe.get_doc("Batch", batch_no).recalculate_batch_qty()
+		self.assertEqual(get_batch_bin_qty(), 10)
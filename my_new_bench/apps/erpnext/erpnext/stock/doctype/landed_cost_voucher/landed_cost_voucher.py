@@ -3,13 +3,20 @@
 
 
 import frappe
-from frappe import _
+from frappe import _, msgprint
 from frappe.model.document import Document
 from frappe.model.meta import get_field_precision
+from frappe.query_builder import Criterion
 from frappe.query_builder.custom import ConstantColumn
+from frappe.query_builder.functions import Max
 from frappe.utils import cint, flt
 
 import erpnext
+from erpnext.controllers.buying_controller import get_landed_cost_voucher_amounts
+from erpnext.controllers.stock_controller import (
+	create_repost_item_valuation_entry,
+	repost_required_for_queue,
+)
 from erpnext.controllers.taxes_and_totals import init_landed_taxes_and_totals
 from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
 
@@ -212,6 +219,28 @@ class LandedCostVoucher(Document):
 				)
 			)
 
+	def submit(self):
+		if len(self.purchase_receipts) > 100:
+			msgprint(
+				_(
+					"The task has been enqueued as a background job. In case there is any issue on processing in background, the system will add a comment about the error on this Landed Cost Voucher and revert to the Draft stage"
+				)
+			)
+			self.queue_action("submit", timeout=4600)
+		else:
+			self._submit()
+
+	def cancel(self):
+		if len(self.purchase_receipts) > 100:
+			msgprint(
+				_(
+					"The task has been enqueued as a background job. In case there is any issue on processing in background, the system will add a comment about the error on this Landed Cost Voucher and revert to the Submitted stage"
+				)
+			)
+			self.queue_action("cancel", timeout=4600)
+		else:
+			self._cancel()
+
 	def on_submit(self):
 		self.validate_applicable_charges_for_item()
 		self.update_landed_cost()
@@ -220,14 +249,18 @@ class LandedCostVoucher(Document):
 		self.update_landed_cost()
 
 	def update_landed_cost(self):
-		for d in self.get("purchase_receipts"):
-			doc = frappe.get_doc(d.receipt_document_type, d.receipt_document)
+		receipt_documents = [
+			frappe.get_doc(d.receipt_document_type, d.receipt_document) for d in self.get("purchase_receipts")
+		]
+		landed_cost_amounts = get_landed_cost_voucher_amounts([doc.name for doc in receipt_documents])
+
+		for doc in receipt_documents:
 			# check if there are {qty} assets created and linked to this receipt document
 			if self.docstatus != 2:
-				self.validate_asset_qty_and_status(d.receipt_document_type, doc)
+				self.validate_asset_qty_and_status(doc.doctype, doc)
 
 			# set landed cost voucher amount in pr item
-			doc.set_landed_cost_voucher_amount()
+			doc.set_landed_cost_voucher_amount(landed_cost_amounts)
 
 			# set valuation amount in pr item
 			doc.update_valuation_rate(reset_outgoing_rate=False)
@@ -238,11 +271,10 @@ class LandedCostVoucher(Document):
 
 			# asset rate will be updated while creating asset gl entries from PI or PY
 
-			# update latest valuation rate in serial no
-			self.update_rate_in_serial_no_for_non_asset_items(doc)
+		# update latest valuation rate in serial no
+		self.update_rate_in_serial_no_for_non_asset_items(receipt_documents)
 
-		for d in self.get("purchase_receipts"):
-			doc = frappe.get_doc(d.receipt_document_type, d.receipt_document)
+		for doc in receipt_documents:
 			# update stock & gl entries for cancelled state of PR
 			doc.docstatus = 2
 			doc.update_stock_ledger(allow_negative_stock=True, via_landed_cost_voucher=True)
@@ -252,11 +284,108 @@ class LandedCostVoucher(Document):
 			doc.docstatus = 1
 			doc.make_bundle_using_old_serial_batch_fields(via_landed_cost_voucher=True)
 			doc.update_stock_ledger(allow_negative_stock=True, via_landed_cost_voucher=True)
-			if d.receipt_document_type == "Purchase Receipt":
+			if doc.doctype == "Purchase Receipt":
 				doc.make_gl_entries(via_landed_cost_voucher=True)
 			else:
 				doc.make_gl_entries()
-			doc.repost_future_sle_and_gle(via_landed_cost_voucher=True)
+
+		if len(receipt_documents) == 1:
+			receipt_documents[0].repost_future_sle_and_gle(via_landed_cost_voucher=True)
+		else:
+			self.repost_future_sle_and_gle(receipt_documents)
+
+	def repost_future_sle_and_gle(self, receipt_documents):
+		"""Repost the future stock and accounting ledgers of all the receipt documents.
+
+		Each receipt is reposted when it would be on its own (see `StockController.repost_future_sle_and_gle`).
+		With item based reposting, the item-warehouses of those receipts are reposted once, from their
+		earliest posting, instead of once per receipt."""
+		if not cint(frappe.db.get_single_value("Stock Reposting Settings", "item_based_reposting")):
+			for doc in receipt_documents:
+				doc.repost_future_sle_and_gle(via_landed_cost_voucher=True)
+			return
+
+		sle = frappe.qb.DocType("Stock Ledger Entry")
+		receipt_sles = (
+			frappe.qb.from_(sle)
+			.select(
+				sle.voucher_no,
+				sle.item_code,
+				sle.warehouse,
+				sle.posting_date,
+				sle.posting_time,
+				sle.posting_datetime,
+			)
+			.where(
+				(sle.voucher_no.isin([doc.name for doc in receipt_documents]))
+				& (sle.voucher_type.isin(list({doc.doctype for doc in receipt_documents})))
+				& (sle.is_cancelled == 0)
+			)
+			.orderby(sle.posting_datetime)
+		).run(as_dict=True)
+
+		if not receipt_sles:
+			return
+
+		earliest_sles = {}
+		for row in receipt_sles:
+			earliest_sles.setdefault((row.item_code, row.warehouse), row)
+
+		# latest entry of every voucher on or after the earliest receipt of each item-warehouse
+		future_sles = (
+			frappe.qb.from_(sle)
+			.select(
+				sle.item_code,
+				sle.warehouse,
+				sle.voucher_no,
+				Max(sle.posting_datetime).as_("posting_datetime"),
+			)
+			.where(
+				Criterion.any(
+					(sle.item_code == row.item_code)
+					& (sle.warehouse == row.warehouse)
+					& (sle.posting_datetime >= row.posting_datetime)
+					for row in earliest_sles.values()
+				)
+				& (sle.is_cancelled == 0)
+			)
+			.groupby(sle.item_code, sle.warehouse, sle.voucher_no)
+		).run(as_dict=True)
+
+		latest_postings = {}
+		for d in future_sles:
+			latest_postings.setdefault((d.item_code, d.warehouse), []).append(d)
+
+		def future_sle_exists(row):
+			return any(
+				d.voucher_no != row.voucher_no and d.posting_datetime >= row.posting_datetime
+				for d in latest_postings.get((row.item_code, row.warehouse), [])
+			)
+
+		receipts_to_be_repost = {row.voucher_no for row in receipt_sles if future_sle_exists(row)}
+		receipts_to_be_repost.update(
+			doc.name
+			for doc in receipt_documents
+			if doc.name not in receipts_to_be_repost and repost_required_for_queue(doc)
+		)
+
+		items_to_be_repost = {}
+		for row in receipt_sles:
+			if row.voucher_no in receipts_to_be_repost:
+				items_to_be_repost.setdefault((row.item_code, row.warehouse), row)
+
+		for row in items_to_be_repost.values():
+			create_repost_item_valuation_entry(
+				{
+					"based_on": "Item and Warehouse",
+					"item_code": row.item_code,
+					"warehouse": row.warehouse,
+					"posting_date": row.posting_date,
+					"posting_time": row.posting_time,
+					"company": self.company,
+					"via_landed_cost_voucher": True,
+				}
+			)
 
 	def validate_asset_qty_and_status(self, receipt_document_type, receipt_document):
 		for item in self.get("items"):
@@ -296,18 +425,24 @@ class LandedCostVoucher(Document):
 								).format(item.receipt_document_type, item.receipt_document, item.item_code)
 							)
 
-	def update_rate_in_serial_no_for_non_asset_items(self, receipt_document):
-		for item in receipt_document.get("items"):
-			if not item.is_fixed_asset and item.serial_no:
-				serial_nos = get_serial_nos(item.serial_no)
-				if serial_nos:
-					frappe.db.sql(
-						"update `tabSerial No` set purchase_rate=%s where name in ({})".format(
-							", ".join(["%s"] * len(serial_nos))
-						),
-						tuple([item.valuation_rate, *serial_nos]),
+	def update_rate_in_serial_no_for_non_asset_items(self, receipt_documents):
+		serial_nos_by_rate = {}
+		for receipt_document in receipt_documents:
+			for item in receipt_document.get("items"):
+				if not item.is_fixed_asset and item.serial_no:
+					serial_nos_by_rate.setdefault(item.valuation_rate, []).extend(
+						get_serial_nos(item.serial_no)
 					)
 
+		serial_no = frappe.qb.DocType("Serial No")
+		for valuation_rate, serial_nos in serial_nos_by_rate.items():
+			if serial_nos:
+				(
+					frappe.qb.update(serial_no)
+					.set(serial_no.purchase_rate, valuation_rate)
+					.where(serial_no.name.isin(serial_nos))
+				).run()
+
 
 def get_pr_items(purchase_receipt):
 	item = frappe.qb.DocType("Item")
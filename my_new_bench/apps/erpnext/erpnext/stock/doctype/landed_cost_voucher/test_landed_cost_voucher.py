@@ -3,7 +3,7 @@
 
 
 import frappe
-from frappe.tests.utils import FrappeTestCase
+from frappe.tests.utils import FrappeTestCase, change_settings
 from frappe.utils import add_days, add_to_date, flt, now, nowtime, today
 
 from erpnext.accounts.doctype.account.test_account import create_account, get_inventory_account
@@ -174,6 +174,136 @@ class TestLandedCostVoucher(FrappeTestCase):
 		self.assertEqual(last_sle.qty_after_transaction, last_sle_after_landed_cost.qty_after_transaction)
 		self.assertEqual(last_sle_after_landed_cost.stock_value - last_sle.stock_value, 50.0)
 
+	def test_landed_cost_voucher_for_multiple_receipts(self):
+		"Test impact of LCV against several receipts on future stock balances."
+		from erpnext.stock.doctype.item.test_item import make_item
+
+		item = make_item("LCV Multi Receipt Item", {"is_stock_item": 1})
+		warehouse = "Stores - _TC"
+
+		receipts = [
+			make_purchase_receipt(
+				item_code=item.name,
+				warehouse=warehouse,
+				qty=100,
+				rate=80,
+				posting_date=add_days(frappe.utils.nowdate(), days),
+			)
+			for days in (-3, -2, 0)
+		]
+
+		def get_stock_value():
+			return frappe.db.get_value(
+				"Stock Ledger Entry",
+				{"voucher_no": receipts[-1].name, "is_cancelled": 0},
+				"stock_value",
+			)
+
+		stock_value = get_stock_value()
+
+		lcv = frappe.new_doc("Landed Cost Voucher")
+		lcv.company = receipts[0].company
+		lcv.distribute_charges_based_on = "Amount"
+		for pr in receipts[:2]:
+			lcv.append(
+				"purchase_receipts",
+				{
+					"receipt_document_type": pr.doctype,
+					"receipt_document": pr.name,
+					"supplier": pr.supplier,
+					"posting_date": pr.posting_date,
+					"grand_total": pr.base_grand_total,
+				},
+			)
+
+		lcv.append(
+			"taxes",
+			{
+				"description": "Insurance Charges",
+				"expense_account": "Expenses Included In Valuation - TCP1",
+				"amount": 100,
+			},
+		)
+		lcv.insert()
+		lcv.submit()
+
+		for pr in receipts[:2]:
+			self.assertEqual(
+				frappe.db.get_value(
+					"Purchase Receipt Item", {"parent": pr.name}, "landed_cost_voucher_amount"
+				),
+				50.0,
+			)
+
+		self.assertEqual(get_stock_value() - stock_value, 100.0)
+
+		lcv.cancel()
+		self.assertEqual(get_stock_value(), stock_value)
+
+	@change_settings("Stock Reposting Settings", {"item_based_reposting": 0})
+	def test_landed_cost_voucher_for_multiple_receipts_transaction_based_reposting(self):
+		"Test that LCV against several receipts reposts each of them the way it would be on its own."
+		from erpnext.stock.doctype.item.test_item import make_item
+
+		item = make_item("LCV Multi Receipt Transaction Repost Item", {"is_stock_item": 1})
+		receipts = [
+			make_purchase_receipt(
+				item_code=item.name,
+				warehouse="Stores - _TC",
+				qty=100,
+				rate=80,
+				posting_date=add_days(frappe.utils.nowdate(), days),
+			)
+			for days in (-3, -2, 0)
+		]
+
+		lcv = frappe.new_doc("Landed Cost Voucher")
+		lcv.company = receipts[0].company
+		lcv.distribute_charges_based_on = "Amount"
+		for pr in receipts[:2]:
+			lcv.append(
+				"purchase_receipts",
+				{
+					"receipt_document_type": pr.doctype,
+					"receipt_document": pr.name,
+					"supplier": pr.supplier,
+					"posting_date": pr.posting_date,
+					"grand_total": pr.base_grand_total,
+				},
+			)
+
+		lcv.append(
+			"taxes",
+			{
+				"description": "Insurance Charges",
+				"expense_account": "Expenses Included In Valuation - TCP1",
+				"amount": 100,
+			},
+		)
+		lcv.insert()
+		lcv.submit()
+
+		for pr in receipts[:2]:
+			self.assertTrue(
+				frappe.db.exists(
+					"Repost Item Valuation",
+					{
+						"based_on": "Transaction",
+						"voucher_type": pr.doctype,
+						"voucher_no": pr.name,
+						"via_landed_cost_voucher": 1,
+						"docstatus": 1,
+					},
+				)
+			)
+
+		self.assertFalse(
+			frappe.db.exists(
+				"Repost Item Valuation",
+				{"based_on": "Item and Warehouse", "item_code": item.name, "via_landed_cost_voucher": 1},
+			)
+		)
+
 	def test_landed_cost_voucher_for_zero_purchase_rate(self):
 		"Test impact of LCV on future stock balances."
 		from erpnext.stock.doctype.item.test_item import make_item
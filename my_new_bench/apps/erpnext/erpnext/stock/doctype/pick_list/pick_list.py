@@ -22,11 +22,7 @@ from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle impor
 	get_picked_serial_nos,
 )
 from erpnext.stock.get_item_details import get_company_total_stock, get_conversion_factor
-from erpnext.stock.serial_batch_bundle import (
-	SerialBatchCreation,
-	get_batches_from_bundle,
-	get_serial_nos_from_bundle,
-)
+from erpnext.stock.serial_batch_bundle import SerialBatchCreation
 from erpnext.utilities.transaction_base import TransactionBase
 
 # TODO: Prioritize SO or WO group warehouse
@@ -467,7 +463,6 @@ class PickList(TransactionBase):
 		self.validate_for_qty()
 		items = self.aggregate_item_qty()
 		picked_items_details = self.get_picked_items_details(items)
-		self.item_location_map = frappe._dict()
 
 		from_warehouses = [self.parent_warehouse] if self.parent_warehouse else []
 		if self.parent_warehouse:
@@ -485,23 +480,17 @@ class PickList(TransactionBase):
 		for row in reset_rows:
 			self.remove(row)
 
+		self.item_location_map = get_available_locations_for_items(
+			self.item_count_map,
+			from_warehouses,
+			self.company,
+			picked_items_details=picked_items_details,
+			consider_rejected_warehouses=self.consider_rejected_warehouses,
+		)
+
 		updated_locations = frappe._dict()
 		len_idx = len(self.get("locations")) or 0
 		for item_doc in items:
-			item_code = item_doc.item_code
-
-			self.item_location_map.setdefault(
-				item_code,
-				get_available_item_locations(
-					item_code,
-					from_warehouses,
-					self.item_count_map.get(item_code),
-					self.company,
-					picked_item_details=picked_items_details.get(item_code),
-					consider_rejected_warehouses=self.consider_rejected_warehouses,
-				),
-			)
-
 			locations = get_items_with_location_and_quantity(item_doc, self.item_location_map, self.docstatus)
 
 			item_doc.idx = None
@@ -560,6 +549,17 @@ class PickList(TransactionBase):
 		self.item_count_map = {}
 		# aggregate qty for same item
 		item_map = OrderedDict()
+		product_bundles = set(
+			frappe.get_all(
+				"Product Bundle",
+				filters={
+					"new_item_code": ("in", [d.item_code for d in locations if d.item_code]),
+					"disabled": 0,
+				},
+				pluck="new_item_code",
+			)
+		)
+
 		for item in locations:
 			if item.picked_qty:
 				continue
@@ -569,9 +569,7 @@ class PickList(TransactionBase):
 
 			# Check if item is stock item or product bundle
 			is_stock_item = cint(frappe.get_cached_value("Item", item.item_code, "is_stock_item"))
-			is_product_bundle = frappe.db.exists(
-				"Product Bundle", {"new_item_code": item.item_code, "disabled": 0}
-			)
+			is_product_bundle = item.item_code in product_bundles
 
 			# Include non-stock items for delivery purposes, but skip them for warehouse assignment
 			if not is_stock_item and not is_product_bundle:
@@ -652,17 +650,19 @@ class PickList(TransactionBase):
 			return picked_items
 
 		items_data = self._get_pick_list_items(items)
+		bundle_entries = get_bundle_entries([d.serial_and_batch_bundle for d in items_data])
 
 		for item_data in items_data:
 			key = (item_data.warehouse, item_data.batch_no) if item_data.batch_no else item_data.warehouse
 			serial_no = [x for x in item_data.serial_no.split("\n") if x] if item_data.serial_no else None
 
 			if item_data.serial_and_batch_bundle:
+				entries = bundle_entries.get(item_data.serial_and_batch_bundle, [])
 				if not serial_no:
-					serial_no = get_serial_nos_from_bundle(item_data.serial_and_batch_bundle)
+					serial_no = [d.serial_no for d in entries if d.serial_no]
 
 				if not item_data.batch_no and not serial_no:
-					bundle_batches = get_batches_from_bundle(item_data.serial_and_batch_bundle)
+					bundle_batches = frappe._dict((d.batch_no, d.qty) for d in entries if d.batch_no)
 					for batch_no, batch_qty in bundle_batches.items():
 						batch_qty = abs(batch_qty)
 
@@ -925,50 +925,94 @@ def get_available_item_locations(
 	picked_item_details=None,
 	consider_rejected_warehouses=False,
 ):
-	locations = []
+	return get_available_locations_for_items(
+		{item_code: required_qty},
+		from_warehouses,
+		company,
+		ignore_validation=ignore_validation,
+		picked_items_details={item_code: picked_item_details} if picked_item_details else None,
+		consider_rejected_warehouses=consider_rejected_warehouses,
+	)[item_code]
 
-	has_serial_no = frappe.get_cached_value("Item", item_code, "has_serial_no")
-	has_batch_no = frappe.get_cached_value("Item", item_code, "has_batch_no")
 
-	if has_batch_no and has_serial_no:
-		locations = get_available_item_locations_for_serial_and_batched_item(
-			item_code,
-			from_warehouses,
-			required_qty,
-			company,
-			consider_rejected_warehouses=consider_rejected_warehouses,
+def get_available_locations_for_items(
+	required_qty_map,
+	from_warehouses,
+	company,
+	ignore_validation=False,
+	picked_items_details=None,
+	consider_rejected_warehouses=False,
+):
+	"""Returns the locations to pick each item from, keyed by item code.
+
+	Bins and serial nos of all the items are loaded together, batches are read from
+	the batch-warehouse balances, and the quantities are then allocated in memory."""
+	item_codes = list(required_qty_map)
+	picked_items_details = picked_items_details or {}
+
+	items = {
+		d.name: d
+		for d in frappe.get_all(
+			"Item",
+			filters={"name": ("in", item_codes)},
+			fields=["name", "has_serial_no", "has_batch_no"],
 		)
-	elif has_serial_no:
-		locations = get_available_item_locations_for_serialized_item(
-			item_code,
-			from_warehouses,
-			company,
-			consider_rejected_warehouses=consider_rejected_warehouses,
+	}
+
+	other_items, serialized_items, batched_items, serial_and_batched_items = [], [], [], []
+	for item_code in item_codes:
+		item = items.get(item_code) or frappe._dict()
+		if item.has_batch_no and item.has_serial_no:
+			serial_and_batched_items.append(item_code)
+		elif item.has_serial_no:
+			serialized_items.append(item_code)
+		elif item.has_batch_no:
+			batched_items.append(item_code)
+		else:
+			other_items.append(item_code)
+
+	locations_map = frappe._dict()
+	if other_items:
+		locations_map.update(
+			get_available_locations_for_other_items(
+				other_items, from_warehouses, company, consider_rejected_warehouses
+			)
 		)
-	elif has_batch_no:
-		locations = get_available_item_locations_for_batched_item(
-			item_code,
-			from_warehouses,
-			consider_rejected_warehouses=consider_rejected_warehouses,
+
+	if serialized_items:
+		locations_map.update(
+			get_available_locations_for_serialized_items(
+				serialized_items, from_warehouses, company, consider_rejected_warehouses
+			)
 		)
-	else:
-		locations = get_available_item_locations_for_other_item(
+
+	for item_code in batched_items + serial_and_batched_items:
+		locations_map[item_code] = get_available_item_locations_for_batched_item(
 			item_code,
 			from_warehouses,
-			company,
 			consider_rejected_warehouses=consider_rejected_warehouses,
 		)
 
-	if picked_item_details:
-		locations = filter_locations_by_picked_materials(locations, picked_item_details)
+	if serial_and_batched_items:
+		set_serial_nos_in_batch_locations(locations_map, serial_and_batched_items, company)
 
-	if locations:
-		locations = get_locations_based_on_required_qty(locations, required_qty)
+	for item_code in item_codes:
+		required_qty = required_qty_map[item_code]
+		picked_item_details = picked_items_details.get(item_code)
 
-	if not ignore_validation:
-		validate_picked_materials(item_code, required_qty, locations, picked_item_details)
+		locations = locations_map.get(item_code) or []
+		if picked_item_details:
+			locations = filter_locations_by_picked_materials(locations, picked_item_details)
 
-	return locations
+		if locations:
+			locations = get_locations_based_on_required_qty(locations, required_qty)
+
+		if not ignore_validation:
+			validate_picked_materials(item_code, required_qty, locations, picked_item_details)
+
+		locations_map[item_code] = locations
+
+	return locations_map
 
 
 def get_locations_based_on_required_qty(locations, required_qty):
@@ -1047,35 +1091,46 @@ def get_available_item_locations_for_serial_and_batched_item(
 	consider_rejected_warehouses=False,
 ):
 	# Get batch nos by FIFO
-	locations = get_available_item_locations_for_batched_item(
-		item_code,
-		from_warehouses,
-		consider_rejected_warehouses=consider_rejected_warehouses,
-	)
+	locations_map = {
+		item_code: get_available_item_locations_for_batched_item(
+			item_code,
+			from_warehouses,
+			consider_rejected_warehouses=consider_rejected_warehouses,
+		)
+	}
 
-	if locations:
-		sn = frappe.qb.DocType("Serial No")
-		conditions = (sn.item_code == item_code) & (sn.company == company)
+	set_serial_nos_in_batch_locations(locations_map, [item_code], company)
+	return locations_map[item_code]
 
-		for location in locations:
-			location.qty = (
-				required_qty if location.qty > required_qty else location.qty
-			)  # if extra qty in batch
 
-			serial_nos = (
-				frappe.qb.from_(sn)
-				.select(sn.name)
-				.where(
-					(conditions) & (sn.batch_no == location.batch_no) & (sn.warehouse == location.warehouse)
-				)
-				.orderby(sn.creation)
-			).run(as_dict=True)
+def set_serial_nos_in_batch_locations(locations_map, item_codes, company):
+	batch_nos = {location.batch_no for item_code in item_codes for location in locations_map[item_code]}
+	if not batch_nos:
+		return
+
+	sn = frappe.qb.DocType("Serial No")
+	serial_nos = (
+		frappe.qb.from_(sn)
+		.select(sn.name, sn.item_code, sn.batch_no, sn.warehouse)
+		.where(
+			(sn.item_code.isin(item_codes))
+			& (sn.company == company)
+			& (sn.batch_no.isin(list(batch_nos)))
+			& (sn.warehouse.isnotnull())
+		)
+		.orderby(sn.creation)
+	).run(as_dict=True)
 
-			serial_nos = [sn.name for sn in serial_nos]
-			location.serial_nos = serial_nos
-			location.qty = len(serial_nos)
+	batch_serial_nos_map = defaultdict(list)
+	for row in serial_nos:
+		batch_serial_nos_map[(row.item_code, row.batch_no, row.warehouse)].append(row.name)
 
-	return locations
+	for item_code in item_codes:
+		for location in locations_map[item_code]:
+			location.serial_nos = batch_serial_nos_map.get(
+				(item_code, location.batch_no, location.warehouse), []
+			)
+			location.qty = len(location.serial_nos)
 
 
 def get_available_item_locations_for_serialized_item(
@@ -1083,12 +1138,23 @@ def get_available_item_locations_for_serialized_item(
 	from_warehouses,
 	company,
 	consider_rejected_warehouses=False,
+):
+	return get_available_locations_for_serialized_items(
+		[item_code], from_warehouses, company, consider_rejected_warehouses
+	).get(item_code, [])
+
+
+def get_available_locations_for_serialized_items(
+	item_codes,
+	from_warehouses,
+	company,
+	consider_rejected_warehouses=False,
 ):
 	sn = frappe.qb.DocType("Serial No")
 	query = (
 		frappe.qb.from_(sn)
-		.select(sn.name, sn.warehouse)
-		.where(sn.item_code == item_code)
+		.select(sn.name, sn.item_code, sn.warehouse)
+		.where(sn.item_code.isin(item_codes))
 		.orderby(sn.creation)
 	)
 
@@ -1105,15 +1171,14 @@ def get_available_item_locations_for_serialized_item(
 	serial_nos = query.run(as_list=True)
 
 	warehouse_serial_nos_map = frappe._dict()
-	for serial_no, warehouse in serial_nos:
-		warehouse_serial_nos_map.setdefault(warehouse, []).append(serial_no)
-
-	locations = []
+	for serial_no, item_code, warehouse in serial_nos:
+		warehouse_serial_nos_map.setdefault((item_code, warehouse), []).append(serial_no)
 
-	for warehouse, serial_nos in warehouse_serial_nos_map.items():
+	locations_map = frappe._dict()
+	for (item_code, warehouse), serial_nos in warehouse_serial_nos_map.items():
 		qty = len(serial_nos)
 
-		locations.append(
+		locations_map.setdefault(item_code, []).append(
 			frappe._dict(
 				{
 					"qty": qty,
@@ -1124,7 +1189,7 @@ def get_available_item_locations_for_serialized_item(
 			)
 		)
 
-	return locations
+	return locations_map
 
 
 def get_available_item_locations_for_batched_item(
@@ -1176,12 +1241,23 @@ def get_available_item_locations_for_other_item(
 	from_warehouses,
 	company,
 	consider_rejected_warehouses=False,
+):
+	return get_available_locations_for_other_items(
+		[item_code], from_warehouses, company, consider_rejected_warehouses
+	).get(item_code, [])
+
+
+def get_available_locations_for_other_items(
+	item_codes,
+	from_warehouses,
+	company,
+	consider_rejected_warehouses=False,
 ):
 	bin = frappe.qb.DocType("Bin")
 	query = (
 		frappe.qb.from_(bin)
-		.select(bin.warehouse, bin.actual_qty.as_("qty"))
-		.where((bin.item_code == item_code) & (bin.actual_qty > 0))
+		.select(bin.item_code, bin.warehouse, bin.actual_qty.as_("qty"))
+		.where((bin.item_code.isin(item_codes)) & (bin.actual_qty > 0))
 		.orderby(bin.creation)
 	)
 
@@ -1195,9 +1271,28 @@ def get_available_item_locations_for_other_item(
 		if rejected_warehouses := get_rejected_warehouses():
 			query = query.where(bin.warehouse.notin(rejected_warehouses))
 
-	item_locations = query.run(as_dict=True)
+	locations_map = frappe._dict()
+	for row in query.run(as_dict=True):
+		locations_map.setdefault(row.pop("item_code"), []).append(row)
+
+	return locations_map
+
+
+def get_bundle_entries(bundles) -> dict[str, list]:
+	bundle_entries = defaultdict(list)
+	bundles = list({bundle for bundle in bundles if bundle})
+	if not bundles:
+		return bundle_entries
+
+	for row in frappe.get_all(
+		"Serial and Batch Entry",
+		fields=["parent", "serial_no", "batch_no", "qty"],
+		filters={"parent": ("in", bundles)},
+		order_by="parent, idx",
+	):
+		bundle_entries[row.parent].append(row)
 
-	return item_locations
+	return bundle_entries
 
 
 @frappe.whitelist()
@@ -1525,3 +1525,47 @@ class TestPickList(FrappeTestCase):
 		pick_list.cancel()
 		sales_order.cancel()
 		stock_entry.cancel()
+
+	def test_pick_list_allocates_locations_for_mixed_items(self):
+		warehouse = "_Test Warehouse - _TC"
+		item = make_item().name
+		serial_item = make_item(
+			properties={"is_stock_item": 1, "has_serial_no": 1, "serial_no_series": "SNPL-MIX-.####"}
+		).name
+		batch_item = make_item(
+			properties={
+				"is_stock_item": 1,
+				"has_batch_no": 1,
+				"create_new_batch": 1,
+				"batch_number_series": "BPL-MIX-.####",
+			}
+		).name
+
+		for item_code in (item, serial_item, batch_item):
+			make_stock_entry(item=item_code, to_warehouse=warehouse, qty=5, basic_rate=100)
+
+		pick_list = frappe.get_doc(
+			{
+				"doctype": "Pick List",
+				"company": "_Test Company",
+				"purpose": "Material Transfer",
+				"locations": [
+					{"item_code": item_code, "qty": qty, "stock_qty": qty, "conversion_factor": 1}
+					for item_code, qty in ((item, 2), (serial_item, 3), (batch_item, 4), (item, 3))
+				],
+			}
+		)
+		pick_list.set_item_locations()
+
+		picked_qty = {}
+		for row in pick_list.locations:
+			self.assertEqual(row.warehouse, warehouse)
+			picked_qty[row.item_code] = picked_qty.get(row.item_code, 0) + row.stock_qty
+
+		self.assertEqual(picked_qty, {item: 5, serial_item: 3, batch_item: 4})
+
+		serial_row = next(row for row in pick_list.locations if row.item_code == serial_item)
+		self.assertEqual(len(serial_row.serial_no.split("\n")), 3)
+
+		batch_row = next(row for row in pick_list.locations if row.item_code == batch_item)
+		self.assertTrue(batch_row.batch_no)
@@ -2193,7 +2193,7 @@ def get_available_serial_nos(kwargs):
 	if kwargs.get("ignore_serial_nos"):
 		ignore_serial_nos.extend(kwargs.get("ignore_serial_nos"))
 
-	if kwargs.get("posting_date"):
+	if kwargs.get("posting_date") and not can_use_availability_index(kwargs):
 		if kwargs.get("posting_time") is None:
 			kwargs.posting_time = nowtime()
 
@@ -2203,6 +2203,20 @@ def get_available_serial_nos(kwargs):
 			return []
 
 		filters["name"] = ("in", time_based_serial_nos)
+	elif kwargs.get("posting_date"):
+		# Nothing is posted after the posting date, so the warehouse set on the Serial No is its availability
+		filters["warehouse"] = kwargs.warehouse or ("is", "set")
+		if isinstance(kwargs.warehouse, list):
+			filters["warehouse"] = ("in", kwargs.warehouse)
+
+		if kwargs.get("check_serial_nos") and kwargs.get("serial_nos"):
+			serial_nos = [sn for sn in kwargs.get("serial_nos") if sn not in ignore_serial_nos]
+			if not serial_nos:
+				return []
+
+			filters["name"] = ("in", serial_nos)
+		elif ignore_serial_nos:
+			filters["name"] = ("not in", ignore_serial_nos)
 	elif ignore_serial_nos:
 		filters["name"] = ("not in", ignore_serial_nos)
 	elif kwargs.get("serial_nos"):
@@ -2513,6 +2527,15 @@ def get_reserved_batches_for_pos(kwargs) -> dict:
 def get_reserved_batches_for_sre(kwargs) -> dict:
 	"""Returns a dict of `Batch No` followed by the `Qty` reserved in Stock Reservation Entry."""
 
+	from erpnext.stock.doctype.batch_bin.batch_bin import get_batch_bin_reserved_qty
+	from erpnext.stock.doctype.stock_reservation_entry.stock_reservation_entry import has_submitted_sre
+
+	if kwargs.item_code and not has_submitted_sre(kwargs.ignore_voucher_nos):
+		reserved_qty = get_batch_bin_reserved_qty(kwargs.item_code, kwargs.warehouse, kwargs.batch_no)
+		return frappe._dict(
+			{key: frappe._dict({"warehouse": key[1], "qty": -1 * qty}) for key, qty in reserved_qty.items()}
+		)
+
 	sre = frappe.qb.DocType("Stock Reservation Entry")
 	sb_entry = frappe.qb.DocType("Serial and Batch Entry")
 	query = (
@@ -2670,7 +2693,104 @@ def update_available_batches(available_batches, *reserved_batches) -> None:
 					available_batches.append(data)
 
 
+def can_use_availability_index(kwargs) -> bool:
+	"""The current balances in Serial No and Batch Bin hold as on the posting date
+	only if no stock ledger entry of the item was posted after it."""
+	from erpnext.stock.utils import get_combine_datetime
+
+	if kwargs.get("creation") or kwargs.get("ignore_voucher_nos") or kwargs.get("serial_no"):
+		return False
+
+	if not kwargs.get("posting_date"):
+		return True
+
+	item_code = kwargs.get("item_code")
+	if not item_code and kwargs.get("batch_no") and not isinstance(kwargs.batch_no, list):
+		item_code = frappe.get_cached_value("Batch", kwargs.batch_no, "item")
+
+	if not item_code:
+		return False
+
+	if kwargs.get("posting_time") is None:
+		kwargs.posting_time = nowtime()
+
+	stock_ledger_entry = frappe.qb.DocType("Stock Ledger Entry")
+	condition = stock_ledger_entry.posting_datetime > get_combine_datetime(
+		kwargs.posting_date, kwargs.posting_time
+	)
+
+	# Entries of the voucher being posted are left out of the ledger based availability
+	if kwargs.get("ignore_voucher_detail_no"):
+		condition |= stock_ledger_entry.voucher_detail_no == kwargs.ignore_voucher_detail_no
+	elif kwargs.get("voucher_no"):
+		condition |= stock_ledger_entry.voucher_no == kwargs.voucher_no
+
+	query = (
+		frappe.qb.from_(stock_ledger_entry)
+		.select(stock_ledger_entry.name)
+		.where((stock_ledger_entry.is_cancelled == 0) & condition)
+		.limit(1)
+	)
+
+	for field, value in (("item_code", item_code), ("warehouse", kwargs.get("warehouse"))):
+		if not value:
+			continue
+
+		if isinstance(value, list):
+			query = query.where(stock_ledger_entry[field].isin(value))
+		else:
+			query = query.where(stock_ledger_entry[field] == value)
+
+	return not query.run()
+
+
 def get_available_batches(kwargs):
+	if can_use_availability_index(kwargs):
+		return get_available_batches_from_batch_bin(kwargs)
+
+	return get_available_batches_from_ledgers(kwargs)
+
+
+def get_available_batches_from_batch_bin(kwargs):
+	batch_bin = frappe.qb.DocType("Batch Bin")
+	batch_table = frappe.qb.DocType("Batch")
+
+	query = (
+		frappe.qb.from_(batch_bin)
+		.inner_join(batch_table)
+		.on(batch_bin.batch_no == batch_table.name)
+		.select(
+			batch_bin.batch_no,
+			batch_bin.warehouse,
+			batch_bin.actual_qty.as_("qty"),
+			batch_table.expiry_date,
+		)
+		.where(batch_table.disabled == 0)
+	)
+
+	if not kwargs.get("for_stock_levels"):
+		query = query.where((batch_table.expiry_date >= today()) | (batch_table.expiry_date.isnull()))
+
+	for field in ["warehouse", "item_code", "batch_no"]:
+		if not kwargs.get(field):
+			continue
+
+		if isinstance(kwargs.get(field), list):
+			query = query.where(batch_bin[field].isin(kwargs.get(field)))
+		else:
+			query = query.where(batch_bin[field] == kwargs.get(field))
+
+	if kwargs.based_on == "LIFO":
+		query = query.orderby(batch_table.creation, order=frappe.qb.desc)
+	elif kwargs.based_on == "Expiry":
+		query = query.orderby(batch_table.expiry_date)
+	else:
+		query = query.orderby(batch_table.creation)
+
+	return query.run(as_dict=True)
+
+
+def get_available_batches_from_ledgers(kwargs):
 	from erpnext.stock.utils import get_combine_datetime
 
 	stock_ledger_entry = frappe.qb.DocType("Stock Ledger Entry")
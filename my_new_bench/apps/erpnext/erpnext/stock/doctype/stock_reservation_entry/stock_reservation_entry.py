@@ -380,12 +380,23 @@ class StockReservationEntry(Document):
 			)
 
 	def update_reserved_stock_in_bin(self) -> None:
-		"""Updates `Reserved Stock` in Bin."""
+		"""Updates `Reserved Stock` in Bin and `Reserved Qty` in Batch Bin."""
+
+		from erpnext.stock.doctype.batch_bin.batch_bin import update_reserved_qty_in_batch_bins
 
 		bin_name = get_or_make_bin(self.item_code, self.warehouse)
 		bin_doc = frappe.get_cached_doc("Bin", bin_name)
 		bin_doc.update_reserved_stock()
 
+		if self.has_batch_no:
+			batch_nos = {d.batch_no for d in self.sb_entries if d.batch_no}
+			if doc_before_save := self.get_doc_before_save():
+				# batches removed from the reservation
+				batch_nos.update(d.batch_no for d in doc_before_save.sb_entries if d.batch_no)
+
+			if batch_nos:
+				update_reserved_qty_in_batch_bins(self.item_code, self.warehouse, batch_nos)
+
 	def update_status(self, status: str | None = None, update_modified: bool = True) -> None:
 		"""Updates status based on Voucher Qty, Reserved Qty and Delivered Qty."""
 
@@ -526,6 +537,13 @@ def get_available_qty_to_reserve(
 
 	available_qty = get_stock_balance(item_code, warehouse)
 
+	if available_qty and not has_submitted_sre([ignore_sre]):
+		reserved_qty = frappe.db.get_value(
+			"Bin", {"item_code": item_code, "warehouse": warehouse}, "reserved_stock", for_update=True
+		)
+
+		return available_qty - flt(reserved_qty)
+
 	if available_qty:
 		sre = frappe.qb.DocType("Stock Reservation Entry")
 		query = (
@@ -638,28 +656,19 @@ def get_sre_reserved_qty_for_items_and_warehouses(
 	if not item_code_list:
 		return {}
 
-	sre = frappe.qb.DocType("Stock Reservation Entry")
+	bin = frappe.qb.DocType("Bin")
 	query = (
-		frappe.qb.from_(sre)
-		.select(
-			sre.item_code,
-			sre.warehouse,
-			Sum(sre.reserved_qty - sre.delivered_qty).as_("reserved_qty"),
-		)
-		.where(
-			(sre.docstatus == 1)
-			& sre.item_code.isin(item_code_list)
-			& (sre.status.notin(["Delivered", "Cancelled"]))
-		)
-		.groupby(sre.item_code, sre.warehouse)
+		frappe.qb.from_(bin)
+		.select(bin.item_code, bin.warehouse, bin.reserved_stock)
+		.where(bin.item_code.isin(item_code_list) & (bin.reserved_stock != 0))
 	)
 
 	if warehouse_list:
-		query = query.where(sre.warehouse.isin(warehouse_list))
+		query = query.where(bin.warehouse.isin(warehouse_list))
 
 	data = query.run(as_dict=True)
 
-	return {(d["item_code"], d["warehouse"]): d["reserved_qty"] for d in data} if data else {}
+	return {(d["item_code"], d["warehouse"]): d["reserved_stock"] for d in data} if data else {}
 
 
 def get_sre_reserved_qty_details_for_voucher(voucher_type: str, voucher_no: str) -> dict:
@@ -775,6 +784,18 @@ def get_sre_reserved_batch_nos_details(
 ) -> dict:
 	"""Returns a dict of `Batch Qty` reserved in Stock Reservation Entry. The dict is like {batch_no: qty, ...}"""
 
+	from erpnext.stock.doctype.batch_bin.batch_bin import get_batch_bin_reserved_qty
+
+	if not has_submitted_sre(ignore_voucher_nos):
+		return frappe._dict(
+			{
+				batch_no: qty
+				for (batch_no, _warehouse), qty in get_batch_bin_reserved_qty(
+					item_code, warehouse, batch_nos
+				).items()
+			}
+		)
+
 	sre = frappe.qb.DocType("Stock Reservation Entry")
 	sb_entry = frappe.qb.DocType("Serial and Batch Entry")
 	query = (
@@ -806,6 +827,19 @@ def get_sre_reserved_batch_nos_details(
 	return frappe._dict(query.run())
 
 
+def has_submitted_sre(sre_names: list | None) -> bool:
+	"""Returns True if any of the names is a submitted `Stock Reservation Entry`.
+
+	Such entries are counted in the reserved qty of Bin and Batch Bin, so the reserved qty
+	is aggregated from the entries when they are to be ignored."""
+
+	sre_names = [name for name in sre_names or [] if name]
+	if not sre_names:
+		return False
+
+	return bool(frappe.db.exists("Stock Reservation Entry", {"name": ("in", sre_names), "docstatus": 1}))
+
+
 def get_sre_details_for_voucher(voucher_type: str, voucher_no: str) -> list[dict]:
 	"""Returns a list of SREs for the provided voucher."""
 
@@ -708,6 +708,49 @@ class TestStockReservationEntry(FrappeTestCase):
 		# validation for reserved stock should be thrown
 		self.assertRaises(frappe.ValidationError, se.submit)
 
+	@change_settings(
+		"Stock Settings",
+		{"enable_stock_reservation": 1, "auto_reserve_serial_and_batch": 1, "allow_negative_stock": 0},
+	)
+	def test_reserved_qty_counters(self) -> None:
+		from erpnext.stock.stock_balance import repost_reserved_stock
+
+		item_properties = {
+			"is_stock_item": 1,
+			"valuation_rate": 100,
+			"has_batch_no": 1,
+			"create_new_batch": 1,
+			"batch_number_series": "SRCB-.#####.",
+		}
+		sr_item = make_item(item_code="Test Reserve Counter Item", properties=item_properties)
+		create_material_receipt(items={sr_item.name: sr_item}, warehouse=self.warehouse, qty=100)
+
+		so = make_sales_order(item_code=sr_item.name, warehouse=self.warehouse, qty=80)
+		so.create_stock_reservation_entries()
+
+		def get_reserved_qty():
+			bin_qty = frappe.db.get_value(
+				"Bin", {"item_code": sr_item.name, "warehouse": self.warehouse}, "reserved_stock"
+			)
+			batch_qty = sum(
+				frappe.get_all(
+					"Batch Bin",
+					filters={"item_code": sr_item.name, "warehouse": self.warehouse},
+					pluck="reserved_qty",
+				)
+			)
+			return bin_qty, batch_qty
+
+		self.assertEqual(get_reserved_qty(), (80, 80))
+
+		frappe.db.set_value("Batch Bin", {"item_code": sr_item.name}, "reserved_qty", 0)
+		frappe.db.set_value("Bin", {"item_code": sr_item.name}, "reserved_stock", 0)
+		repost_reserved_stock()
+		self.assertEqual(get_reserved_qty(), (80, 80))
+
+		cancel_stock_reservation_entries("Sales Order", so.name)
+		self.assertEqual(get_reserved_qty(), (0, 0))
+
 	def tearDown(self) -> None:
 		cancel_all_stock_reservation_entries()
 		return super().tearDown()
@@ -8,7 +8,7 @@ from frappe.utils import flt, today
 from frappe.utils.nestedset import get_descendants_of
 from pypika.terms import ExistsCriterion
 
-from erpnext.accounts.doctype.pos_invoice.pos_invoice import get_pos_reserved_qty
+from erpnext.accounts.doctype.pos_invoice.pos_invoice import get_pos_reserved_qty_details
 from erpnext.stock.utils import (
 	is_reposting_item_valuation_in_progress,
 	update_included_uom_in_report,
@@ -27,7 +27,8 @@ def execute(filters=None):
 		item_groups.append(filters.item_group)
 		item_groups.extend(get_descendants_of("Item Group", filters.item_group))
 
-	warehouse_company = {}
+	pos_reserved_qty = get_pos_reserved_qty_details(filters.get("item_code"))
+
 	data = []
 	conversion_factors = []
 	for bin in bin_list:
@@ -37,20 +38,12 @@ def execute(filters=None):
 			# likely an item that has reached its end of life
 			continue
 
-		# item = item_map.setdefault(bin.item_code, get_item(bin.item_code))
-		company = warehouse_company.setdefault(
-			bin.warehouse, frappe.db.get_value("Warehouse", bin.warehouse, "company")
-		)
-
 		if filters.brand and filters.brand != item.brand:
 			continue
 
 		elif item_groups and item.item_group not in item_groups:
 			continue
 
-		elif filters.company and filters.company != company:
-			continue
-
 		re_order_level = re_order_qty = 0
 
 		for d in item.get("reorder_levels"):
@@ -62,7 +55,7 @@ def execute(filters=None):
 		if (re_order_level or re_order_qty) and re_order_level > bin.projected_qty:
 			shortage_qty = re_order_level - flt(bin.projected_qty)
 
-		reserved_qty_for_pos = get_pos_reserved_qty(bin.item_code, bin.warehouse)
+		reserved_qty_for_pos = pos_reserved_qty.get((bin.item_code, bin.warehouse), 0)
 		if reserved_qty_for_pos:
 			bin.projected_qty -= reserved_qty_for_pos
 
@@ -254,6 +247,16 @@ def get_bin_list(filters):
 	if filters.item_code:
 		query = query.where(bin.item_code == filters.item_code)
 
+	if filters.company:
+		wh = frappe.qb.DocType("Warehouse")
+		query = query.where(
+			ExistsCriterion(
+				frappe.qb.from_(wh)
+				.select(wh.name)
+				.where((wh.company == filters.company) & (bin.warehouse == wh.name))
+			)
+		)
+
 	if filters.warehouse:
 		warehouse_details = frappe.db.get_value("Warehouse", filters.warehouse, ["lft", "rgt"], as_dict=1)
 
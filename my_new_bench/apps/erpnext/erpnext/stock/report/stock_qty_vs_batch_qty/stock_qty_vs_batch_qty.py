@@ -7,6 +7,7 @@ import frappe
 from frappe import _
 
 from erpnext.stock.doctype.batch.batch import get_batch_qty
+from erpnext.stock.doctype.batch_bin.batch_bin import rebuild_batch_bins
 
 
 def execute(filters=None):
@@ -105,6 +106,7 @@ def update_batch_qty(selected_batches=None):
 		return
 
 	selected_batches = json.loads(selected_batches)
+	rebuild_batch_bins([row.get("batch") for row in selected_batches])
 	for row in selected_batches:
 		batch_name = row.get("batch")
 
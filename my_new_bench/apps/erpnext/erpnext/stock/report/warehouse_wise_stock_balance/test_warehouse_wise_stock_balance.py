@@ -0,0 +1,41 @@
+# Copyright (c) 2022, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from erpnext.stock.report.warehouse_wise_stock_balance.warehouse_wise_stock_balance import (
+	set_balance_in_parent,
+	update_indent,
+)
+
+
+class TestWarehouseWiseStockBalance(FrappeTestCase):
+	def test_balance_rollup(self):
+		# ordered by lft, like `get_warehouses`
+		warehouses = [
+			frappe._dict(name="All Warehouses", parent_warehouse=None, is_group=1, stock_balance=0.0),
+			frappe._dict(name="Stores", parent_warehouse="All Warehouses", is_group=1, stock_balance=0.0),
+			frappe._dict(name="Stores A", parent_warehouse="Stores", is_group=0, stock_balance=100.0),
+			frappe._dict(name="Stores B", parent_warehouse="Stores", is_group=0, stock_balance=50.0),
+			frappe._dict(
+				name="Finished Goods", parent_warehouse="All Warehouses", is_group=0, stock_balance=25.0
+			),
+			# parent is disabled and left out of the report
+			frappe._dict(name="Scrap", parent_warehouse="Disabled Group", is_group=0, stock_balance=5.0),
+		]
+
+		update_indent(warehouses)
+		set_balance_in_parent(warehouses)
+
+		self.assertEqual(
+			{warehouse.name: (warehouse.indent, warehouse.stock_balance) for warehouse in warehouses},
+			{
+				"All Warehouses": (0, 175.0),
+				"Stores": (1, 150.0),
+				"Stores A": (2, 100.0),
+				"Stores B": (2, 50.0),
+				"Finished Goods": (1, 25.0),
+				"Scrap": (None, 5.0),
+			},
+		)
@@ -26,17 +26,20 @@ def execute(filters=None):
 
 
 def get_warehouse_wise_balance(filters: StockBalanceFilter) -> list[SLEntry]:
-	sle = frappe.qb.DocType("Stock Ledger Entry")
+	# Bin holds the running stock value of each item and warehouse
+	bin = frappe.qb.DocType("Bin")
+	warehouse = frappe.qb.DocType("Warehouse")
 
 	query = (
-		frappe.qb.from_(sle)
-		.select(sle.warehouse, Sum(sle.stock_value_difference).as_("stock_balance"))
-		.where((sle.docstatus < 2) & (sle.is_cancelled == 0))
-		.groupby(sle.warehouse)
+		frappe.qb.from_(bin)
+		.inner_join(warehouse)
+		.on(bin.warehouse == warehouse.name)
+		.select(bin.warehouse, Sum(bin.stock_value).as_("stock_balance"))
+		.groupby(bin.warehouse)
 	)
 
 	if filters.get("company"):
-		query = query.where(sle.company == filters.get("company"))
+		query = query.where(warehouse.company == filters.get("company"))
 
 	data = query.run(as_list=True)
 	return frappe._dict(data) if data else frappe._dict()
@@ -69,30 +72,24 @@ def get_data(filters: StockBalanceFilter):
 
 
 def update_indent(warehouses):
-	for warehouse in warehouses:
-
-		def add_indent(warehouse, indent):
-			warehouse.indent = indent
-			for child in warehouses:
-				if child.parent_warehouse == warehouse.name:
-					add_indent(child, indent + 1)
+	# warehouses are ordered by lft, so a parent is always indented before its children
+	warehouse_map = {warehouse.name: warehouse for warehouse in warehouses}
 
-		if warehouse.is_group:
-			add_indent(warehouse, warehouse.indent or 0)
+	for warehouse in warehouses:
+		parent = warehouse_map.get(warehouse.parent_warehouse)
+		if parent and parent.is_group:
+			warehouse.indent = (parent.indent or 0) + 1
+		elif warehouse.is_group:
+			warehouse.indent = 0
 
 
 def set_balance_in_parent(warehouses):
-	# sort warehouses by indent in descending order
-	warehouses = sorted(warehouses, key=lambda x: x.get("indent", 0), reverse=1)
-
-	for warehouse in warehouses:
-
-		def update_balance(warehouse, balance):
-			for parent in warehouses:
-				if warehouse.parent_warehouse == parent.name:
-					parent.stock_balance += balance
+	# children come after their parent in lft order, roll the balances up from the bottom
+	warehouse_map = {warehouse.name: warehouse for warehouse in warehouses}
 
-		update_balance(warehouse, warehouse.stock_balance)
+	for warehouse in reversed(warehouses):
+		if parent := warehouse_map.get(warehouse.parent_warehouse):
+			parent.stock_balance += warehouse.stock_balance
 
 
 def get_columns(filters: StockBalanceFilter) -> list[dict]:
@@ -1459,9 +1459,9 @@ def get_serial_nos_batch(serial_nos):
 
 
 def update_batch_qty(voucher_type, voucher_no, docstatus, via_landed_cost_voucher=False):
-	batches = get_batchwise_qty(voucher_type, voucher_no)
-	if not batches:
-		return
+	from erpnext.stock.doctype.batch_bin.batch_bin import update_batch_bin_qty
+
+	batches = get_batchwise_qty(voucher_type, voucher_no) or {}
 
 	precision = frappe.get_precision("Batch", "batch_qty")
 	for batch, qty in batches.items():
@@ -1473,6 +1473,8 @@ def update_batch_qty(voucher_type, voucher_no, docstatus, via_landed_cost_vouche
 
 		frappe.db.set_value("Batch", batch, "batch_qty", current_qty)
 
+	update_batch_bin_qty(voucher_type, voucher_no, docstatus)
+
 
 def get_batch_current_qty(batch):
 	doctype = frappe.qb.DocType("Batch")
@@ -275,6 +275,37 @@ def update_bin_qty(item_code, warehouse, qty_dict=None):
 		bin.clear_cache()
 
 
+def repost_reserved_stock():
+	"""
+	Rebuild `Reserved Stock` in Bin and `Reserved Qty` in Batch Bin from the Stock Reservation Entries
+	"""
+	from erpnext.stock.doctype.batch_bin.batch_bin import get_batch_reserved_qty, get_or_make_batch_bin
+	from erpnext.stock.utils import get_or_make_bin
+
+	sre = frappe.qb.DocType("Stock Reservation Entry")
+	data = (
+		frappe.qb.from_(sre)
+		.select(sre.item_code, sre.warehouse, Sum(sre.reserved_qty - sre.delivered_qty))
+		.where((sre.docstatus == 1) & (sre.status.notin(["Delivered", "Cancelled"])))
+		.groupby(sre.item_code, sre.warehouse)
+	).run()
+
+	frappe.db.set_value("Bin", {"reserved_stock": ("!=", 0)}, "reserved_stock", 0, update_modified=False)
+	for item_code, warehouse, reserved_stock in data:
+		frappe.db.set_value(
+			"Bin", get_or_make_bin(item_code, warehouse), "reserved_stock", flt(reserved_stock)
+		)
+
+	frappe.db.set_value("Batch Bin", {"reserved_qty": ("!=", 0)}, "reserved_qty", 0, update_modified=False)
+	for row in get_batch_reserved_qty():
+		frappe.db.set_value(
+			"Batch Bin",
+			get_or_make_batch_bin(row.batch_no, row.item_code, row.warehouse),
+			"reserved_qty",
+			flt(row.qty),
+		)
+
+
 def set_stock_balance_as_per_serial_no(
 	item_code=None, posting_date=None, posting_time=None, fiscal_year=None
 ):
@@ -3,7 +3,24 @@ from datetime import date, datetime
 
 import frappe
 from frappe import _
-from frappe.utils import get_link_to_form, today
+from frappe.query_builder.functions import Count
+from frappe.utils import cint, get_link_to_form, today
+
+# number of documents converted per background job, can be overridden
+# with `bulk_transaction_chunk_size` in site config
+BULK_TRANSACTION_CHUNK_SIZE = 200
+
+# masters shared by most documents of a chunk, loaded into the document cache once per chunk
+PREFETCHED_MASTER_FIELDS = (
+	"company",
+	"currency",
+	"customer",
+	"supplier",
+	"selling_price_list",
+	"buying_price_list",
+	"taxes_and_charges",
+	"payment_terms_template",
+)
 
 
 @frappe.whitelist()
@@ -40,12 +57,23 @@ def transaction_processing(data, from_doctype, to_doctype):
 	frappe.msgprint(
 		_("Started a background job to create {1} {0}. {2}").format(to_doctype, length_of_data, skipped_msg)
 	)
-	frappe.enqueue(
-		job,
-		deserialized_data=deserialized_data,
-		from_doctype=from_doctype,
-		to_doctype=to_doctype,
-	)
+
+	chunk_size = cint(frappe.conf.bulk_transaction_chunk_size) or BULK_TRANSACTION_CHUNK_SIZE
+	batch_id = frappe.generate_hash(length=10)
+
+	for idx in range(0, length_of_data, chunk_size):
+		frappe.enqueue(
+			job,
+			queue="long",
+			job_id=f"bulk_transaction::{batch_id}::{idx}",
+			deduplicate=True,
+			enqueue_after_commit=True,
+			deserialized_data=deserialized_data[idx : idx + chunk_size],
+			from_doctype=from_doctype,
+			to_doctype=to_doctype,
+			batch_id=batch_id,
+			total=length_of_data,
+		)
 
 
 @frappe.whitelist()
@@ -75,6 +103,12 @@ def retry(date: str | None = None):
 
 def retry_failed_transactions(failed_docs: list | None):
 	if failed_docs:
+		for from_doctype in {log.from_doctype for log in failed_docs}:
+			prefetch_masters(
+				from_doctype,
+				[log.transaction_name for log in failed_docs if log.from_doctype == from_doctype],
+			)
+
 		for log in failed_docs:
 			try:
 				frappe.db.savepoint("before_creation_state")
@@ -93,11 +127,20 @@ def update_log(log_name, status, retried, err=None):
 		frappe.db.set_value("Bulk Transaction Log Detail", log_name, "error_description", err)
 
 
-def job(deserialized_data, from_doctype, to_doctype):
+def job(deserialized_data, from_doctype, to_doctype, batch_id=None, total=None):
+	"""Convert a chunk of documents.
+
+	Every document is logged in the same transaction as its conversion. A chunk that is
+	run again (e.g. after the worker died) skips the documents already logged for the
+	batch, so chunks can safely be re-enqueued. Failed documents are retried from the log."""
+	doc_names = [d.get("name") for d in deserialized_data]
+	handled = get_handled_documents(batch_id, doc_names)
+	doc_names = [doc_name for doc_name in doc_names if doc_name not in handled]
+	prefetch_masters(from_doctype, doc_names)
+
 	fail_count = 0
-	for d in deserialized_data:
+	for doc_name in doc_names:
 		try:
-			doc_name = d.get("name")
 			frappe.db.savepoint("before_creation_state")
 			task(doc_name, from_doctype, to_doctype)
 		except Exception:
@@ -110,11 +153,92 @@ def job(deserialized_data, from_doctype, to_doctype):
 				to_doctype,
 				status="Failed",
 				log_date=str(date.today()),
+				batch_id=batch_id,
 			)
 		else:
-			create_log(doc_name, None, from_doctype, to_doctype, status="Success", log_date=str(date.today()))
+			create_log(
+				doc_name,
+				None,
+				from_doctype,
+				to_doctype,
+				status="Success",
+				log_date=str(date.today()),
+				batch_id=batch_id,
+			)
+
+	if not batch_id:
+		show_job_status(fail_count, len(deserialized_data), to_doctype)
+		return
+
+	frappe.db.commit()
+	progress = get_progress(batch_id)
+	publish_progress(progress, total, to_doctype)
+
+	if progress.count >= total:
+		show_job_status(progress.failed, total, to_doctype)
 
-	show_job_status(fail_count, len(deserialized_data), to_doctype)
+
+def prefetch_masters(from_doctype, doc_names):
+	"""Load masters shared by the documents (customer, price list, taxes...) into the document cache."""
+	link_fields = [
+		df
+		for df in frappe.get_meta(from_doctype).get_link_fields()
+		if df.fieldname in PREFETCHED_MASTER_FIELDS
+	]
+	if not link_fields or not doc_names:
+		return
+
+	documents = frappe.get_all(
+		from_doctype,
+		filters={"name": ["in", doc_names]},
+		fields=[df.fieldname for df in link_fields],
+	)
+
+	for df in link_fields:
+		for value in {d.get(df.fieldname) for d in documents if d.get(df.fieldname)}:
+			frappe.get_cached_value(df.options, value, "name")
+
+
+def get_handled_documents(batch_id, doc_names) -> set:
+	"""Documents of the batch that were already converted or failed, from their log entries."""
+	if not batch_id or not doc_names:
+		return set()
+
+	return set(
+		frappe.get_all(
+			"Bulk Transaction Log Detail",
+			filters={"batch_id": batch_id, "transaction_name": ["in", doc_names]},
+			pluck="transaction_name",
+		)
+	)
+
+
+def get_progress(batch_id):
+	"""Counts of the documents handled by all the chunks of the batch, from their log entries."""
+	log_detail = frappe.qb.DocType("Bulk Transaction Log Detail")
+	counts = dict(
+		frappe.qb.from_(log_detail)
+		.select(log_detail.transaction_status, Count(log_detail.name))
+		.where(log_detail.batch_id == batch_id)
+		.groupby(log_detail.transaction_status)
+		.run()
+	)
+
+	return frappe._dict(count=sum(counts.values()), failed=counts.get("Failed", 0))
+
+
+def publish_progress(progress, total, to_doctype):
+	frappe.publish_realtime(
+		"bulk_transaction_progress",
+		dict(
+			title=_("Bulk {0} Creation In Progress").format(_(to_doctype)),
+			message=_("Processed {0} out of {1} {2}").format(progress.count, total, _(to_doctype)),
+			count=progress.count,
+			failed=progress.failed,
+			total=total,
+		),
+		user=frappe.session.user,
+	)
 
 
 def task(doc_name, from_doctype, to_doctype):
@@ -178,8 +302,9 @@ def task(doc_name, from_doctype, to_doctype):
 	del frappe.flags.bulk_transaction
 
 
-def create_log(doc_name, e, from_doctype, to_doctype, status, log_date=None, restarted=0):
+def create_log(doc_name, e, from_doctype, to_doctype, status, log_date=None, restarted=0, batch_id=None):
 	transaction_log = frappe.new_doc("Bulk Transaction Log Detail")
+	transaction_log.batch_id = batch_id
 	transaction_log.transaction_name = doc_name
 	transaction_log.date = today()
 	now = datetime.now()
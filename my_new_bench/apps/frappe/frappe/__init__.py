@@ -1308,6 +1308,28 @@ def get_doc(*args, **kwargs):
 	return frappe.model.document.get_doc(*args, **kwargs)
 
 
+def get_lazy_doc(
+	doctype: str, name: str | None = None, *, fields: list[str] | None = None, for_update: bool | None = None
+) -> "Document":
+	"""Return a `frappe.model.document.Document` object of the given type and name, which loads
+	its child tables from the database on first access.
+
+	:param doctype: DocType of the document.
+	:param name: Name of the document, not required for Single DocTypes.
+	:param fields: [optional] Only load these fields of the parent, the others are loaded on access.
+	:param for_update: [optional] select document for update.
+
+	Example:
+
+	        # doesn't load the invoice items
+	        invoice = frappe.get_lazy_doc("Sales Invoice", "SINV-0001", fields=["status"])
+	        invoice.db_set("status", "Paid")
+	"""
+	import frappe.model.document
+
+	return frappe.model.document.get_lazy_doc(doctype, name, fields=fields, for_update=for_update)
+
+
 def get_single_value(setting: str, fieldname: str, /, *, as_dict: bool = False):
 	"""Return the cached value associated with the given fieldname from single DocType.
 
@@ -1381,6 +1403,32 @@ def delete_doc(
 	)
 
 
+def insert_many(
+	documents: list["Document | dict"],
+	ignore_permissions: bool | None = None,
+	ignore_links: bool | None = None,
+	ignore_mandatory: bool | None = None,
+) -> list["Document"]:
+	"""Insert new documents of the same DocType together. Calls `frappe.model.document.insert_many`.
+
+	Names are reserved in one block per naming series, links are validated with one query per
+	linked DocType and rows are written with multi-row INSERTs. Only the controller methods listed
+	in `batch_safe_methods` of the DocType's controller are run.
+
+	:param documents: Documents or dicts of the same DocType to insert.
+	:param ignore_permissions: Do not check permissions if True.
+	:param ignore_links: Do not check validity of links if True.
+	:param ignore_mandatory: Do not check missing mandatory fields if True."""
+	import frappe.model.document
+
+	return frappe.model.document.insert_many(
+		documents,
+		ignore_permissions=ignore_permissions,
+		ignore_links=ignore_links,
+		ignore_mandatory=ignore_mandatory,
+	)
+
+
 def delete_doc_if_exists(doctype, name, force=0):
 	"""Delete document if exists."""
 	delete_doc(doctype, name, force=force, ignore_missing=True)
@@ -2538,5 +2586,3 @@ if _tune_gc:
 
 # Remove references to pattern that are pre-compiled and loaded to global scopes.
 re.purge()
-
-get_lazy_doc = get_doc
@@ -29,6 +29,7 @@ from frappe.utils import CallbackManager, cint, get_site_name
 from frappe.utils.data import escape_html
 from frappe.utils.deprecations import deprecation_warning
 from frappe.utils.error import log_error_snapshot
+from frappe.utils.redis_wrapper import enable_process_cache
 from frappe.website.serve import get_response
 
 _site = None
@@ -73,6 +74,9 @@ if frappe._tune_gc:
 # and some of them can exceed werkzeug's default limit of 500kb
 Request.max_form_memory_size = None
 
+# web workers are long-lived, keep hot cache keys in memory
+enable_process_cache()
+
 
 def after_response_wrapper(app):
 	"""Wrap a WSGI application to call after_response hooks after we have responded.
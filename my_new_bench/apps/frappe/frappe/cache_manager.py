@@ -67,6 +67,7 @@ user_cache_keys = (
 
 doctype_cache_keys = (
 	"doctype_meta",
+	"compiled_doctype_meta",
 	"doctype_form_meta",
 	"table_columns",
 	"last_modified",
@@ -77,6 +77,10 @@ class UserPermission(Document):
 			frappe.throw(_("{0} has already assigned default value for {1}.").format(ref_link, self.allow))
 
 
+def on_doctype_update():
+	frappe.db.add_index("User Permission", ["user", "allow"])
+
+
 def send_user_permissions(bootinfo):
 	bootinfo.user["user_permissions"] = get_user_permissions()
 
@@ -19,6 +19,7 @@ from frappe.core.doctype.scheduled_job_type.scheduled_job_type import sync_jobs
 from frappe.database.schema import add_column
 from frappe.deferred_insert import save_to_db as flush_deferred_inserts
 from frappe.desk.notifications import clear_notifications
+from frappe.model.meta import build_compiled_meta
 from frappe.modules.patch_handler import PatchType
 from frappe.modules.utils import sync_customizations
 from frappe.search.website_search import build_index_for_all_routes
@@ -138,6 +139,7 @@ class SiteMigration:
 		* Sync Portal Menu Items
 		* Sync Installed Applications Version History
 		* Execute `after_migrate` hooks
+		* Compile DocType meta for the workers
 		"""
 		sync_jobs()
 		sync_fixtures()
@@ -156,6 +158,9 @@ class SiteMigration:
 			for fn in frappe.get_hooks("after_migrate", app_name=app):
 				frappe.get_attr(fn)()
 
+		print("Compiling DocType meta...")
+		build_compiled_meta()
+
 	def required_services_running(self) -> bool:
 		"""Returns True if all required services are running. Returns False and prints
 		instructions to stdout when required services are not available.
@@ -314,6 +314,9 @@ class BaseDocument:
 				_d.idx = i + 1
 
 	def _init_child(self, value, key):
+		if isinstance(value, CompactRow):
+			value = value.as_document()
+
 		if not isinstance(value, BaseDocument):
 			if not (doctype := self.get_table_field_doctype(key)):
 				raise AttributeError(key)
@@ -622,9 +625,16 @@ class BaseDocument:
 			ignore_virtual=True,
 		)
 
+		self.db_update_values(d)
+
+	def db_update_values(self, values: dict):
+		"""Update the row with the given column values, as returned by `get_valid_dict`"""
+		d = dict(values)
+
 		# don't update name, as case might've been changed
-		name = cstr(d["name"])
-		del d["name"]
+		name = cstr(d.pop("name", self.name))
+		if not d:
+			return
 
 		columns = list(d)
 
@@ -642,6 +652,23 @@ class BaseDocument:
 			else:
 				raise
 
+	def get_changed_values(self, previous: "BaseDocument") -> dict:
+		"""Returns the column values that differ from the ones of `previous`, the same row
+		before it was changed, in the form written by `db_update`"""
+		kwargs = {
+			"convert_dates_to_str": True,
+			"ignore_nulls": self.doctype in DOCTYPES_FOR_DOCTYPE,
+			"ignore_virtual": True,
+		}
+		values = self.get_valid_dict(**kwargs)
+		previous_values = previous.get_valid_dict(**kwargs)
+
+		return {
+			column: value
+			for column, value in values.items()
+			if column not in previous_values or value != previous_values[column]
+		}
+
 	def db_update_all(self):
 		"""Raw update parent + children
 		DOES NOT VALIDATE AND CALL TRIGGERS"""
@@ -783,6 +810,51 @@ class BaseDocument:
 
 	def get_invalid_links(self, is_submittable=False):
 		"""Returns list of invalid links and also updates fetch values if not set"""
+		invalid_links = []
+		cancelled_links = []
+
+		for df, doctype, docname, fields_to_fetch in self.get_links_to_validate():
+			values = get_link_values(doctype, docname, fields_to_fetch)
+			self.set_link_values(
+				df, doctype, docname, fields_to_fetch, values, is_submittable, invalid_links, cancelled_links
+			)
+
+		return invalid_links, cancelled_links
+
+	def get_links_to_validate(self):
+		"""Yields `(df, doctype, docname, fields_to_fetch)` for every set Link and Dynamic Link field"""
+		for df in self.meta.get_link_fields() + self.meta.get("fields", {"fieldtype": ("=", "Dynamic Link")}):
+			docname = self.get(df.fieldname)
+			if not docname:
+				continue
+
+			if df.fieldtype == "Link":
+				doctype = df.options
+				if not doctype:
+					frappe.throw(_("Options not set for link field {0}").format(df.fieldname))
+			else:
+				doctype = self.get(df.options)
+				if not doctype:
+					frappe.throw(_("{0} must be set first").format(self.meta.get_label(df.options)))
+				invalidate_distinct_link_doctypes(df.parent, df.options, doctype)
+
+			# get a map of values ot fetch along with this link query
+			# that are mapped as link_fieldname.source_fieldname in Options of
+			# Readonly or Data or Text type fields
+			fields_to_fetch = [
+				_df
+				for _df in self.meta.get_fields_to_fetch(df.fieldname)
+				if not _df.get("fetch_if_empty")
+				or (_df.get("fetch_if_empty") and not self.get(_df.fieldname))
+			]
+
+			yield df, doctype, docname, fields_to_fetch
+
+	def set_link_values(
+		self, df, doctype, docname, fields_to_fetch, values, is_submittable, invalid_links, cancelled_links
+	):
+		"""Sets the linked name and fetched values from `values`, and collects the link
+		in `invalid_links` or `cancelled_links` if applicable"""
 
 		def get_msg(df, docname):
 			# check if parentfield exists (only applicable for child table doctype)
@@ -791,77 +863,35 @@ class BaseDocument:
 
 			return f"{_(df.label, context=df.parent)}: {docname}"
 
-		invalid_links = []
-		cancelled_links = []
-
-		for df in self.meta.get_link_fields() + self.meta.get("fields", {"fieldtype": ("=", "Dynamic Link")}):
-			docname = self.get(df.fieldname)
-
-			if docname:
-				if df.fieldtype == "Link":
-					doctype = df.options
-					if not doctype:
-						frappe.throw(_("Options not set for link field {0}").format(df.fieldname))
-				else:
-					doctype = self.get(df.options)
-					if not doctype:
-						frappe.throw(_("{0} must be set first").format(self.meta.get_label(df.options)))
-					invalidate_distinct_link_doctypes(df.parent, df.options, doctype)
-
-				# MySQL is case insensitive. Preserve case of the original docname in the Link Field.
-
-				# get a map of values ot fetch along with this link query
-				# that are mapped as link_fieldname.source_fieldname in Options of
-				# Readonly or Data or Text type fields
-
-				meta = frappe.get_meta(doctype)
-				fields_to_fetch = [
-					_df
-					for _df in self.meta.get_fields_to_fetch(df.fieldname)
-					if not _df.get("fetch_if_empty")
-					or (_df.get("fetch_if_empty") and not self.get(_df.fieldname))
-				]
-				if not meta.get("is_virtual"):
-					if not fields_to_fetch:
-						# cache a single value type
-						values = _dict(name=frappe.db.get_value(doctype, docname, "name", cache=True))
-					else:
-						values_to_fetch = ["name"] + [
-							_df.fetch_from.split(".")[-1] for _df in fields_to_fetch
-						]
-
-						# don't cache if fetching other values too
-						values = frappe.db.get_value(doctype, docname, values_to_fetch, as_dict=True)
-
-				if getattr(meta, "issingle", 0):
-					values.name = doctype
-
-				if meta.get("is_virtual"):
-					values = frappe.get_doc(doctype, docname).as_dict()
-
-				if values:
-					if not df.get("is_virtual"):
-						setattr(self, df.fieldname, values.name)
-
-					for _df in fields_to_fetch:
-						if self.is_new() or not self.docstatus.is_submitted() or _df.allow_on_submit:
-							self.set_fetch_from_value(doctype, _df, values)
-
-					if not meta.istable:
-						notify_link_count(doctype, docname)
-
-					if not values.name:
-						invalid_links.append((df.fieldname, docname, get_msg(df, docname)))
-
-					elif (
-						df.fieldname != "amended_from"
-						and (is_submittable or self.meta.is_submittable)
-						and frappe.get_meta(doctype).is_submittable
-						and DocStatus(frappe.db.get_value(doctype, docname, "docstatus") or 0).is_cancelled()
-					):
-						cancelled_links.append((df.fieldname, docname, get_msg(df, docname)))
+		if not values:
+			return
 
-		return invalid_links, cancelled_links
+		# MySQL is case insensitive. Preserve case of the original docname in the Link Field.
+		if not df.get("is_virtual"):
+			setattr(self, df.fieldname, values.name)
+
+		for _df in fields_to_fetch:
+			if self.is_new() or not self.docstatus.is_submitted() or _df.allow_on_submit:
+				self.set_fetch_from_value(doctype, _df, values)
+
+		meta = frappe.get_meta(doctype)
+		if not meta.istable:
+			notify_link_count(doctype, docname)
+
+		if not values.name:
+			invalid_links.append((df.fieldname, docname, get_msg(df, docname)))
+
+		elif (
+			df.fieldname != "amended_from"
+			and (is_submittable or self.meta.is_submittable)
+			and meta.is_submittable
+			and DocStatus(
+				values.docstatus
+				if "docstatus" in values
+				else frappe.db.get_value(doctype, docname, "docstatus") or 0
+			).is_cancelled()
+		):
+			cancelled_links.append((df.fieldname, docname, get_msg(df, docname)))
 
 	def set_fetch_from_value(self, doctype, df, values):
 		fetch_from_fieldname = df.fetch_from.split(".")[-1]
@@ -1304,6 +1334,241 @@ class BaseDocument:
 				extract_images_from_doc(self, df.fieldname)
 
 
+def get_link_values(doctype, docname, fields_to_fetch):
+	"""Returns the name and the values to fetch of the linked document, with a `None` name if
+	it does not exist"""
+	meta = frappe.get_meta(doctype)
+
+	if meta.get("is_virtual"):
+		return frappe.get_doc(doctype, docname).as_dict()
+
+	if not fields_to_fetch:
+		# cache a single value type
+		values = _dict(name=frappe.db.get_value(doctype, docname, "name", cache=True))
+	else:
+		values_to_fetch = ["name"] + [_df.fetch_from.split(".")[-1] for _df in fields_to_fetch]
+
+		# don't cache if fetching other values too
+		values = frappe.db.get_value(doctype, docname, values_to_fetch, as_dict=True)
+
+	if getattr(meta, "issingle", 0):
+		values.name = doctype
+
+	return values
+
+
+def get_invalid_links_in_bulk(docs, is_submittable=False):
+	"""Returns invalid and cancelled links of all the given documents, like `get_invalid_links`,
+	but with one query per linked doctype instead of one per link"""
+	links = []
+	names_by_doctype = {}
+	columns_by_doctype = {}
+
+	for doc in docs:
+		for link in doc.get_links_to_validate():
+			df, doctype, docname, fields_to_fetch = link
+			links.append((doc, *link))
+
+			meta = frappe.get_meta(doctype)
+			if meta.get("is_virtual") or meta.issingle:
+				continue
+
+			if _is_cached_link(meta, docname, fields_to_fetch):
+				continue
+
+			names_by_doctype.setdefault(doctype, set()).add(docname)
+			columns = columns_by_doctype.setdefault(doctype, {"name"})
+			columns.update(_df.fetch_from.split(".")[-1] for _df in fields_to_fetch)
+			if meta.is_submittable:
+				columns.add("docstatus")
+
+	values_by_doctype = {}
+	for doctype, names in names_by_doctype.items():
+		values_by_doctype[doctype] = values = {}
+		table = frappe.qb.DocType(doctype)
+		for row in (
+			frappe.qb.from_(table)
+			.select(*columns_by_doctype[doctype])
+			.where(table.name.isin(list(names)))
+			.run(as_dict=True)
+		):
+			values[row.name] = row
+			# MySQL is case insensitive, match the linked name the same way
+			values.setdefault(cstr(row.name).casefold(), row)
+
+	invalid_links = []
+	cancelled_links = []
+	for doc, df, doctype, docname, fields_to_fetch in links:
+		if doctype in values_by_doctype:
+			values = values_by_doctype[doctype]
+			values = values.get(docname) or values.get(cstr(docname).casefold())
+			if values is None:
+				# not found in bulk, e.g. trailing spaces matched by the database
+				values = get_link_values(doctype, docname, fields_to_fetch)
+			else:
+				values = _dict(values)
+				_cache_link(frappe.get_meta(doctype), docname, fields_to_fetch, values.name)
+		else:
+			values = get_link_values(doctype, docname, fields_to_fetch)
+
+		doc.set_link_values(
+			df, doctype, docname, fields_to_fetch, values, is_submittable, invalid_links, cancelled_links
+		)
+
+	return invalid_links, cancelled_links
+
+
+def _is_cached_link(meta, docname, fields_to_fetch):
+	"""Returns True if the existence of the link is in the value cache of `get_link_values`"""
+	if fields_to_fetch or meta.is_submittable:
+		return False
+
+	return (meta.name, docname, "name") in frappe.db.value_cache
+
+
+def _cache_link(meta, docname, fields_to_fetch, name):
+	"""Adds a link found in bulk to the value cache, as `get_link_values` would"""
+	if not (fields_to_fetch or meta.is_submittable):
+		frappe.db.value_cache[(meta.name, docname, "name")] = [(name,)]
+
+
+class CompactRow:
+	"""Memory efficient representation of a child table row loaded from the database.
+
+	Values of the valid columns are kept in `__slots__` of a class generated per DocType by
+	`get_compact_row_class`, instead of a per row `__dict__` and `flags`. The read only APIs
+	listed in `_document_attributes` are served by a full child document built with
+	`as_document`; other controller methods are not available, since changes they make
+	would be lost. Documents replace compact rows with full child documents before they are
+	written, see `Document.expand_compact_rows`.
+
+	Used for the rows of child DocTypes whose controller sets `compact_rows = True`.
+	"""
+
+	# extra attributes set on a row go to a `__dict__` created on first use
+	__slots__ = ("__dict__", "_parent_doc")
+
+	doctype: str
+	_columns: frozenset = frozenset()
+	_document_attributes = frozenset(
+		(
+			"as_json",
+			"get_db_value",
+			"get_formatted",
+			"get_label_from_fieldname",
+			"get_table_field_doctype",
+			"get_value",
+			"in_format_data",
+			"is_print_hide",
+			"precision",
+		)
+	)
+
+	def __init__(self, d, parent_doc=None):
+		# weak reference, like the `parent_doc` of child documents
+		self._parent_doc = weakref.ref(parent_doc) if parent_doc is not None else None
+
+		for key, value in d.items():
+			setattr(self, key, value)
+
+		self.docstatus = DocStatus(self.docstatus or 0)
+
+	def __getattr__(self, key):
+		# only called for attributes not set yet
+		if key in self._columns:
+			return None
+
+		if key in self._document_attributes:
+			return getattr(self.as_document(), key)
+
+		raise AttributeError(
+			f"{key!r} is not available on compact rows of {self.doctype}, "
+			"use `Document.expand_compact_rows` to load them as child documents"
+		)
+
+	def __reduce__(self):
+		# the class is created at runtime and can't be pickled by reference
+		return _make_compact_row, (self.doctype, self.get_values())
+
+	def __repr__(self):
+		return f"<{self.__class__.__name__}: {self.doctype} {self.name}>"
+
+	@property
+	def meta(self):
+		return frappe.get_meta(self.doctype)
+
+	@property
+	def parent_doc(self):
+		if self._parent_doc is not None:
+			return self._parent_doc()
+
+	def get(self, key, filters=None, limit=None, default=None):
+		if filters and not isinstance(filters, dict):
+			default = filters
+
+		return getattr(self, key, default)
+
+	def set(self, key, value, as_value=False):
+		setattr(self, key, value)
+
+	def update(self, d):
+		for key, value in d.items():
+			setattr(self, key, value)
+
+		return self
+
+	def is_new(self):
+		return False
+
+	def get_values(self) -> dict:
+		"""Returns the column values and other attributes set on the row"""
+		values = {"doctype": self.doctype}
+		for column in self._columns:
+			values[column] = getattr(self, column)
+
+		values.update(self.__dict__)
+
+		return values
+
+	def as_document(self) -> "Document":
+		"""Returns the row as a full child document"""
+		doc = get_controller(self.doctype)(self.get_values())
+		doc.parent_doc = self._parent_doc
+		return doc
+
+	def as_dict(self, **kwargs) -> dict:
+		return self.as_document().as_dict(**kwargs)
+
+	def get_valid_dict(self, *args, **kwargs) -> _dict:
+		return self.as_document().get_valid_dict(*args, **kwargs)
+
+
+_compact_row_classes = {}
+
+
+def get_compact_row_class(doctype: str) -> type[CompactRow]:
+	"""Returns a `CompactRow` class with slots for the valid columns of the child DocType"""
+	columns = tuple(
+		column
+		for column in frappe.get_meta(doctype).get_valid_columns()
+		if column.isidentifier() and not hasattr(CompactRow, column) and column != "doctype"
+	)
+
+	key = (doctype, columns)
+	if (row_class := _compact_row_classes.get(key)) is None:
+		row_class = _compact_row_classes[key] = type(
+			get_controller(doctype).__name__,
+			(CompactRow,),
+			{"__slots__": columns, "doctype": doctype, "_columns": frozenset(columns)},
+		)
+
+	return row_class
+
+
+def _make_compact_row(doctype, values):
+	return get_compact_row_class(doctype)(values)
+
+
 def _filter(data, filters, limit=None):
 	"""pass filters as:
 	{"key": "val", "key": ["!=", "val"],
@@ -66,6 +66,44 @@ STRICT_FIELD_PATTERN = re.compile(r".*/\*.*")
 STRICT_UNION_PATTERN = re.compile(r".*\s(union).*\s")
 ORDER_GROUP_PATTERN = re.compile(r".*[^a-z0-9-_ ,`'\"\.\(\)].*")
 SPECIAL_FIELD_CHARS = frozenset(("(", "`", ".", "'", '"', "*"))
+# user permitted values beyond this are semi-joined from `tabUser Permission` instead of inlined
+USER_PERMISSION_SUBQUERY_THRESHOLD = 500
+BLACKLISTED_KEYWORDS = ("select", "create", "insert", "delete", "drop", "update", "case", "show")
+BLACKLISTED_FUNCTIONS = frozenset(
+	(
+		"concat",
+		"concat_ws",
+		"if",
+		"coalesce",
+		"connection_id",
+		"current_user",
+		"database",
+		"last_insert_id",
+		"session_user",
+		"system_user",
+		"user",
+		"version",
+		"global",
+		"sleep",
+	)
+)
+BLACKLISTED_ORDER_GROUP_FUNCTIONS = frozenset(
+	(
+		"sleep",
+		"benchmark",
+		"extractvalue",
+		"database",
+		"user",
+		"current_user",
+		"version",
+		"substr",
+		"substring",
+		"updatexml",
+		"load_file",
+		"session_user",
+		"system_user",
+	)
+)
 
 
 class DatabaseQuery:
@@ -403,101 +441,8 @@ from {tables}
 		As field contains `,` and mysql function `version()`, with the help of regex
 		the system will filter out this field.
 		"""
-		blacklisted_keywords = ["select", "create", "insert", "delete", "drop", "update", "case", "show"]
-		blacklisted_functions = [
-			"concat",
-			"concat_ws",
-			"if",
-			"coalesce",
-			"connection_id",
-			"current_user",
-			"database",
-			"last_insert_id",
-			"session_user",
-			"system_user",
-			"user",
-			"version",
-			"global",
-			"sleep",
-		]
-
-		def _find_subqueries(parsed: Statement) -> list:
-			"""
-			Recursively find all subqueries in a parsed SQL statement.
-			"""
-			subqueries = []
-
-			for token in parsed.tokens:
-				if isinstance(token, Parenthesis):
-					# Check for DML token for subquery check
-					is_subquery = False
-					for sub_token in token.tokens:
-						if sub_token.ttype is tokens.DML:
-							is_subquery = True
-							break
-					if is_subquery:
-						subqueries.append(token)
-					# Recursively check for nested subqueries
-					subqueries.extend(_find_subqueries(token))
-				elif token.is_group:
-					subqueries.extend(_find_subqueries(token))
-
-			return subqueries
-
-		def _check_sql_token(statement: Statement) -> None:
-			"""
-			Checks the output of `sqlparse.parse()` to detect blocked functions and subqueries.
-			"""
-			if _find_subqueries(statement):
-				_raise_exception()
-
-			for token in statement.tokens:
-				if isinstance(token, Function):
-					if (name := (token.get_name())) and name.lower() in blacklisted_functions:
-						_raise_exception()
-
-				if token.ttype in (tokens.Keyword, tokens.Name):
-					if any(re.search(rf"\b{kw}\b", token.value.lower()) for kw in blacklisted_keywords):
-						_raise_exception()
-
-				if token.is_group:
-					_check_sql_token(token)
-
-		def _raise_exception():
-			frappe.throw(_("Use of sub-query or function is restricted"), frappe.DataError)
-
-		def _is_query(field):
-			if IS_QUERY_PATTERN.match(field):
-				_raise_exception()
-
-			elif IS_QUERY_PREDICATE_PATTERN.match(field):
-				_raise_exception()
-
 		for field in self.fields:
-			lower_field = field.lower().strip()
-
-			if SUB_QUERY_PATTERN.match(field):
-				# Check all tokens for subquery detection
-				_check_sql_token(_parse_sql(field))
-
-				if "@" in lower_field:
-					# prevent access to global variables
-					_raise_exception()
-
-			if FIELD_QUOTE_PATTERN.match(field):
-				_raise_exception()
-
-			if FIELD_COMMA_PATTERN.match(field):
-				_raise_exception()
-
-			_is_query(field)
-
-			if self.strict:
-				if STRICT_FIELD_PATTERN.match(field):
-					frappe.throw(_("Illegal SQL Query"))
-
-				if STRICT_UNION_PATTERN.match(lower_field):
-					frappe.throw(_("Illegal SQL Query"))
+			_validate_field(field, self.strict)
 
 	def extract_tables(self):
 		"""extract tables from fields"""
@@ -1102,7 +1047,15 @@ from {tables}
 						docs.append(permission.get("doc"))
 
 				if docs:
-					values = ", ".join(frappe.db.escape(doc, percent=False) for doc in docs)
+					if len(docs) > USER_PERMISSION_SUBQUERY_THRESHOLD:
+						applicable_for = (
+							self.reference_doctype
+							if df.get("fieldname") == "name" and self.reference_doctype
+							else self.doctype
+						)
+						values = self.get_user_permission_subquery(df.get("options"), applicable_for)
+					else:
+						values = ", ".join(frappe.db.escape(doc, percent=False) for doc in docs)
 					condition += cast_name(f"`tab{self.doctype}`.`{df.get('fieldname')}`") + f" in ({values})"
 					match_conditions.append(f"({condition})")
 					match_filters[df.get("options")] = docs
@@ -1115,6 +1068,27 @@ from {tables}
 			self._fetch_shared_documents = True
 			self.match_filters.append(match_filters)
 
+	def get_user_permission_subquery(self, doctype: str, applicable_for: str) -> str:
+		"""Select the values of `doctype` the user is permitted, to semi-join against instead of
+		listing all of them in the query. Same values as `get_user_permissions`."""
+		condition = (
+			f"`tabUser Permission`.`user` = {frappe.db.escape(self.user, percent=False)}"
+			f" and `tabUser Permission`.`allow` = {frappe.db.escape(doctype, percent=False)}"
+			" and (ifnull(`tabUser Permission`.`applicable_for`, '') = ''"
+			f" or `tabUser Permission`.`applicable_for` = {frappe.db.escape(applicable_for, percent=False)})"
+		)
+		query = f"select `tabUser Permission`.`for_value` from `tabUser Permission` where {condition}"
+
+		if frappe.get_meta(doctype).is_nested_set():
+			query += f"""
+				union select descendant.`name` from `tab{doctype}` descendant
+				inner join `tab{doctype}` ancestor
+					on descendant.`lft` > ancestor.`lft` and descendant.`rgt` < ancestor.`rgt`
+				inner join `tabUser Permission` on `tabUser Permission`.`for_value` = ancestor.`name`
+				where {condition} and `tabUser Permission`.`hide_descendants` = 0"""
+
+		return query
+
 	def get_permission_query_conditions(self) -> str:
 		conditions = []
 		hooks = frappe.get_hooks("permission_query_conditions", {})
@@ -1175,40 +1149,7 @@ from {tables}
 		if not parameters:
 			return
 
-		_lower = parameters.lower()
-
-		if ORDER_GROUP_PATTERN.match(_lower):
-			frappe.throw(_("Illegal SQL Query"))
-
-		subquery_indicators = {
-			r"union",
-			r"intersect",
-			r"select\b.*\bfrom",
-		}
-
-		# Replace doctype names with a hardcoded string "doc"
-		# This is to avoid false positives based on doctype name
-		sanitized = re.sub(r"`tab[^`]*`", " doc ", _lower)
-
-		# Run the subquery checks against the sanitized string
-		if any(re.search(r"\b" + pattern + r"\b", sanitized) for pattern in subquery_indicators):
-			frappe.throw(_("Cannot use sub-query here."))
-
-		blacklisted_sql_functions = {
-			"sleep",
-			"benchmark",
-			"extractvalue",
-			"database",
-			"user",
-			"current_user",
-			"version",
-			"substr",
-			"substring",
-			"updatexml",
-			"load_file",
-			"session_user",
-			"system_user",
-		}
+		_validate_order_by_and_group_by(parameters)
 
 		for field in parameters.split(","):
 			field = field.strip()
@@ -1221,11 +1162,6 @@ from {tables}
 						tbl = tbl[4:-1]
 					frappe.throw(_("Please select atleast 1 column from {0} to sort/group").format(tbl))
 
-			# Check for SQL function using regex with word boundaries and optional whitespace before parenthesis
-			for func in blacklisted_sql_functions:
-				if re.search(r"\b" + re.escape(func) + r"\W*\(", field.lower()):
-					frappe.throw(_("Cannot use {0} in order/group by").format(field))
-
 	def add_limit(self):
 		if self.limit_page_length:
 			return f"limit {self.limit_page_length} offset {self.limit_start}"
@@ -1258,6 +1194,120 @@ from {tables}
 		update_user_settings(self.doctype, user_settings)
 
 
+@lru_cache(maxsize=1024)
+def _validate_field(field: str, strict: bool) -> None:
+	"""Raise if a field of `DatabaseQuery` has a sub-query, a blocked function or some other
+	malicious pattern. Only fields that pass are cached, so the checks run once per field."""
+	lower_field = field.lower().strip()
+
+	if SUB_QUERY_PATTERN.match(field):
+		# Check all tokens for subquery detection
+		_check_sql_token(_parse_sql(field))
+
+		if "@" in lower_field:
+			# prevent access to global variables
+			_raise_exception()
+
+	if FIELD_QUOTE_PATTERN.match(field):
+		_raise_exception()
+
+	if FIELD_COMMA_PATTERN.match(field):
+		_raise_exception()
+
+	if IS_QUERY_PATTERN.match(field):
+		_raise_exception()
+
+	elif IS_QUERY_PREDICATE_PATTERN.match(field):
+		_raise_exception()
+
+	if strict:
+		if STRICT_FIELD_PATTERN.match(field):
+			frappe.throw(_("Illegal SQL Query"))
+
+		if STRICT_UNION_PATTERN.match(lower_field):
+			frappe.throw(_("Illegal SQL Query"))
+
+
+def _find_subqueries(parsed: Statement) -> list:
+	"""
+	Recursively find all subqueries in a parsed SQL statement.
+	"""
+	subqueries = []
+
+	for token in parsed.tokens:
+		if isinstance(token, Parenthesis):
+			# Check for DML token for subquery check
+			is_subquery = False
+			for sub_token in token.tokens:
+				if sub_token.ttype is tokens.DML:
+					is_subquery = True
+					break
+			if is_subquery:
+				subqueries.append(token)
+			# Recursively check for nested subqueries
+			subqueries.extend(_find_subqueries(token))
+		elif token.is_group:
+			subqueries.extend(_find_subqueries(token))
+
+	return subqueries
+
+
+def _check_sql_token(statement: Statement) -> None:
+	"""
+	Checks the output of `sqlparse.parse()` to detect blocked functions and subqueries.
+	"""
+	if _find_subqueries(statement):
+		_raise_exception()
+
+	for token in statement.tokens:
+		if isinstance(token, Function):
+			if (name := (token.get_name())) and name.lower() in BLACKLISTED_FUNCTIONS:
+				_raise_exception()
+
+		if token.ttype in (tokens.Keyword, tokens.Name):
+			if any(re.search(rf"\b{kw}\b", token.value.lower()) for kw in BLACKLISTED_KEYWORDS):
+				_raise_exception()
+
+		if token.is_group:
+			_check_sql_token(token)
+
+
+def _raise_exception():
+	frappe.throw(_("Use of sub-query or function is restricted"), frappe.DataError)
+
+
+@lru_cache(maxsize=1024)
+def _validate_order_by_and_group_by(parameters: str) -> None:
+	"""Raise if order by / group by has a sub-query or a blocked function.
+	Only clauses that pass are cached."""
+	_lower = parameters.lower()
+
+	if ORDER_GROUP_PATTERN.match(_lower):
+		frappe.throw(_("Illegal SQL Query"))
+
+	subquery_indicators = {
+		r"union",
+		r"intersect",
+		r"select\b.*\bfrom",
+	}
+
+	# Replace doctype names with a hardcoded string "doc"
+	# This is to avoid false positives based on doctype name
+	sanitized = re.sub(r"`tab[^`]*`", " doc ", _lower)
+
+	# Run the subquery checks against the sanitized string
+	if any(re.search(r"\b" + pattern + r"\b", sanitized) for pattern in subquery_indicators):
+		frappe.throw(_("Cannot use sub-query here."))
+
+	for field in parameters.split(","):
+		field = field.strip()
+
+		# Check for SQL function using regex with word boundaries and optional whitespace before parenthesis
+		for func in BLACKLISTED_ORDER_GROUP_FUNCTIONS:
+			if re.search(r"\b" + re.escape(func) + r"\W*\(", field.lower()):
+				frappe.throw(_("Cannot use {0} in order/group by").format(field))
+
+
 def cast_name(column: str) -> str:
 	"""Casts name field to varchar for postgres
 
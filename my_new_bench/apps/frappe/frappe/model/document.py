@@ -1,5 +1,6 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
+import copyreg
 import hashlib
 import json
 import time
@@ -15,9 +16,16 @@ from frappe.core.doctype.server_script.server_script_utils import run_server_scr
 from frappe.desk.form.document_follow import follow_document
 from frappe.integrations.doctype.webhook import run_webhooks
 from frappe.model import optional_fields, table_fields
-from frappe.model.base_document import BaseDocument, get_controller
+from frappe.model.base_document import (
+	DOCTYPES_FOR_DOCTYPE,
+	BaseDocument,
+	CompactRow,
+	get_compact_row_class,
+	get_controller,
+	get_invalid_links_in_bulk,
+)
 from frappe.model.docstatus import DocStatus
-from frappe.model.naming import set_new_name, validate_name
+from frappe.model.naming import series_block, set_new_name, validate_name
 from frappe.model.utils import is_virtual_doctype
 from frappe.model.workflow import set_workflow_state_on_action, validate_workflow
 from frappe.types import DF
@@ -87,6 +95,39 @@ def get_doc(*args, **kwargs):
 	raise ImportError(doctype)
 
 
+def get_lazy_doc(doctype: str, name: str | None = None, *, fields=None, for_update=None) -> "Document":
+	"""Returns a `frappe.model.document.Document` object that loads its child tables from the
+	database when they are first accessed.
+
+	:param doctype: DocType of the document.
+	:param name: Name of the document. Single DocTypes are loaded with `get_doc`.
+	:param fields: [optional] Only load these fields of the parent, the other fields are loaded
+	        together when any of them is accessed.
+	:param for_update: [optional] select document for update.
+
+	        # only the parent row is queried, `items` is loaded on access
+	        invoice = get_lazy_doc("Sales Invoice", "SINV-0001", fields=["status", "grand_total"])
+	"""
+	if not name or is_virtual_doctype(doctype) or frappe.get_meta(doctype).issingle:
+		return get_doc(doctype, name or doctype, for_update=for_update)
+
+	return get_lazy_controller(doctype)(doctype, name, fields=fields, for_update=for_update)
+
+
+_lazy_controllers = {}
+
+
+def get_lazy_controller(doctype: str) -> type["Document"]:
+	"""Returns the controller of the DocType with `LazyDocument` mixed in"""
+	controller = get_controller(doctype)
+	if (lazy_controller := _lazy_controllers.get(controller)) is None:
+		lazy_controller = _lazy_controllers[controller] = type(
+			controller.__name__, (LazyDocument, controller), {}
+		)
+
+	return lazy_controller
+
+
 class Document(BaseDocument):
 	"""All controllers inherit from `Document`."""
 
@@ -99,6 +140,12 @@ class Document(BaseDocument):
 	modified_by: DF.Link
 	idx: DF.Int
 
+	# controller methods that can be run on documents inserted together with `insert_many`
+	batch_safe_methods: tuple[str, ...] = ()
+
+	# load rows of this child DocType as `CompactRow` objects, see `get_compact_row_class`
+	compact_rows: bool = False
+
 	def __init__(self, *args, **kwargs):
 		"""Constructor.
 
@@ -172,7 +219,10 @@ class Document(BaseDocument):
 				get_value_kwargs["order_by"] = None
 
 			d = frappe.db.get_value(
-				doctype=self.doctype, filters=self.name, fieldname="*", **get_value_kwargs
+				doctype=self.doctype,
+				filters=self.name,
+				fieldname=self._get_fields_to_load(),
+				**get_value_kwargs,
 			)
 
 			if not d:
@@ -184,27 +234,7 @@ class Document(BaseDocument):
 			super().__init__(d)
 		self.flags.pop("ignore_children", None)
 
-		for df in self._get_table_fields():
-			# Make sure not to query the DB for a child table, if it is a virtual one.
-			# During frappe is installed, the property "is_virtual" is not available in tabDocType, so
-			# we need to filter those cases for the access to frappe.db.get_value() as it would crash otherwise.
-			if hasattr(self, "doctype") and not hasattr(self, "module") and is_virtual_doctype(df.options):
-				self.set(df.fieldname, [])
-				continue
-
-			children = (
-				frappe.db.get_values(
-					df.options,
-					{"parent": str(self.name), "parenttype": self.doctype, "parentfield": df.fieldname},
-					"*",
-					as_dict=True,
-					order_by="idx asc",
-					for_update=self.flags.for_update,
-				)
-				or []
-			)
-
-			self.set(df.fieldname, children)
+		self.load_children_from_db()
 
 		# sometimes __setup__ can depend on child values, hence calling again at the end
 		if hasattr(self, "__setup__"):
@@ -212,6 +242,48 @@ class Document(BaseDocument):
 
 		return self
 
+	def _get_fields_to_load(self):
+		return "*"
+
+	def load_children_from_db(self):
+		"""Load all child tables from the database"""
+		for df in self._get_table_fields():
+			self.load_child_table_from_db(df)
+
+	def load_child_table_from_db(self, df):
+		# Make sure not to query the DB for a child table, if it is a virtual one.
+		# During frappe is installed, the property "is_virtual" is not available in tabDocType, so
+		# we need to filter those cases for the access to frappe.db.get_value() as it would crash otherwise.
+		if hasattr(self, "doctype") and not hasattr(self, "module") and is_virtual_doctype(df.options):
+			self.set(df.fieldname, [])
+			return
+
+		children = (
+			frappe.db.get_values(
+				df.options,
+				{"parent": str(self.name), "parenttype": self.doctype, "parentfield": df.fieldname},
+				"*",
+				as_dict=True,
+				order_by="idx asc",
+				for_update=self.flags.for_update,
+			)
+			or []
+		)
+
+		if children and getattr(get_controller(df.options), "compact_rows", False):
+			row_class = get_compact_row_class(df.options)
+			self.__dict__[df.fieldname] = [row_class(d, self) for d in children]
+			return
+
+		self.set(df.fieldname, children)
+
+	def expand_compact_rows(self):
+		"""Replace the compact rows of child tables with full child documents, before writing"""
+		for df in self._get_table_fields():
+			rows = self.get(df.fieldname)
+			if rows and any(isinstance(d, CompactRow) for d in rows):
+				self.set(df.fieldname, rows)
+
 	def reload(self):
 		"""Reload document from database"""
 		return self.load_from_db()
@@ -294,6 +366,7 @@ class Document(BaseDocument):
 
 		self.set("__islocal", True)
 
+		self.expand_compact_rows()
 		self._set_defaults()
 		self.set_user_and_timestamp()
 		self.set_docstatus()
@@ -400,6 +473,7 @@ class Document(BaseDocument):
 			return self.insert()
 
 		self.check_if_locked()
+		self.expand_compact_rows()
 		self._set_defaults()
 		self.check_permission("write", "save")
 
@@ -424,6 +498,9 @@ class Document(BaseDocument):
 		# parent
 		if self.meta.issingle:
 			self.update_single(self.get_valid_dict())
+		elif self._doc_before_save and not self.meta.get("is_virtual"):
+			# only write the columns changed since the document was loaded
+			self.db_update_values(self.get_changed_values(self._doc_before_save))
 		else:
 			self.db_update()
 
@@ -496,9 +573,34 @@ class Document(BaseDocument):
 			qry.run()
 
 		# update / insert
+		previous = self.get_doc_before_save()
+		if not previous or frappe.get_meta(df.options).is_virtual:
+			for d in all_rows:
+				d: Document
+				d.db_update()
+			return
+
+		# only write the rows changed since the document was loaded, in batches
+		previous_rows = {row.name: row for row in previous.get(df.fieldname) or ()}
+		changed_rows = {}
 		for d in all_rows:
-			d: Document
-			d.db_update()
+			if d.is_new() or (previous_row := previous_rows.get(d.name)) is None:
+				d.db_update()
+				continue
+
+			changed_values = d.get_changed_values(previous_row)
+
+			# `modified` is set on every row when saving, write it along with other changes only
+			if changed_values.keys() - {"modified", "modified_by"}:
+				changed_rows[d.name] = changed_values
+
+		try:
+			frappe.db.bulk_update(df.options, changed_rows, update_modified=False)
+		except Exception as e:
+			if frappe.db.is_unique_key_violation(e):
+				all_rows[0].show_unique_validation_message(e)
+			else:
+				raise
 
 	def get_doc_before_save(self) -> "Document":
 		return getattr(self, "_doc_before_save", None)
@@ -967,12 +1069,10 @@ class Document(BaseDocument):
 		if self.flags.ignore_links or self._action == "cancel":
 			return
 
-		invalid_links, cancelled_links = self.get_invalid_links()
-
-		for d in self.get_all_children():
-			result = d.get_invalid_links(is_submittable=self.meta.is_submittable)
-			invalid_links.extend(result[0])
-			cancelled_links.extend(result[1])
+		# one query per linked doctype for the whole document tree
+		invalid_links, cancelled_links = get_invalid_links_in_bulk(
+			[self, *self.get_all_children()], is_submittable=self.meta.is_submittable
+		)
 
 		if invalid_links:
 			msg = ", ".join(each[2] for each in invalid_links)
@@ -1016,6 +1116,12 @@ class Document(BaseDocument):
 
 		return out
 
+	def run_batch_safe_method(self, *methods):
+		"""Run the given methods that are declared in `batch_safe_methods`, skip the others"""
+		for method in methods:
+			if method in self.batch_safe_methods:
+				self.run_method(method)
+
 	def run_trigger(self, method, *args, **kwargs):
 		return self.run_method(method, *args, **kwargs)
 
@@ -1710,6 +1816,86 @@ class Document(BaseDocument):
 		return f"{doctype}({name})"
 
 
+class LazyDocument:
+	"""Mixin for documents loaded with `get_lazy_doc`.
+
+	Child tables are loaded from the database when they are first accessed, with `doc.items`,
+	`doc.get("items")` or `doc.append("items", ...)`. If only some `fields` of the parent were
+	loaded, the other fields are loaded together when any of them is accessed, and always
+	before the document is written.
+	"""
+
+	def __init__(self, *args, fields=None, **kwargs):
+		self._lazy_fields = set(fields) | {"name", "docstatus", "modified"} if fields else None
+		super().__init__(*args, **kwargs)
+
+	def _get_fields_to_load(self):
+		return list(self._lazy_fields) if self._lazy_fields else "*"
+
+	def load_children_from_db(self):
+		# loaded on first access, drop the ones loaded before a reload
+		for fieldname in self._table_fieldnames:
+			self.__dict__.pop(fieldname, None)
+
+	def reload(self):
+		self._lazy_fields = None
+		return super().reload()
+
+	def __getattr__(self, key):
+		# only called for attributes not set yet
+		if self._load_lazy_value(key):
+			return self.__dict__[key]
+
+		raise AttributeError(key)
+
+	def __reduce_ex__(self, protocol):
+		# the lazy controller is created at runtime and can't be pickled by reference,
+		# pickle as the regular controller with everything loaded instead
+		self._load_lazy_value(None, load_all=True)
+		return copyreg.__newobj__, (get_controller(self.doctype),), self.__getstate__()
+
+	def get(self, key, filters=None, limit=None, default=None):
+		if isinstance(key, str) and key not in self.__dict__:
+			self._load_lazy_value(key)
+		elif isinstance(key, dict):
+			self._load_lazy_value(None, load_all=True)
+
+		return super().get(key, filters=filters, limit=limit, default=default)
+
+	def append(self, key, value=None, position=-1):
+		if key not in self.__dict__:
+			self._load_lazy_value(key)
+
+		return super().append(key, value, position=position)
+
+	def get_valid_dict(self, *args, **kwargs):
+		if self.__dict__.get("_lazy_fields"):
+			self._load_lazy_value(None, load_all=True)
+
+		return super().get_valid_dict(*args, **kwargs)
+
+	def _load_lazy_value(self, key, load_all=False) -> bool:
+		"""Loads the child table or the parent fields not loaded yet, returns True if `key` was loaded"""
+		d = self.__dict__
+		if "_table_fieldnames" not in d:
+			# not initialised yet
+			return False
+
+		if load_all or key in d["_table_fieldnames"]:
+			for df in self._get_table_fields():
+				if (load_all or df.fieldname == key) and df.fieldname not in d:
+					self.load_child_table_from_db(df)
+
+		if d.get("_lazy_fields") and (load_all or key in self.meta.get_valid_columns()):
+			self._lazy_fields = None
+			if fields := [f for f in self.meta.get_valid_columns() if f not in d]:
+				values = frappe.db.get_value(self.doctype, self.name, fields, as_dict=True, order_by=None)
+				for fieldname, value in (values or {}).items():
+					self.set(fieldname, value, as_value=True)
+
+		return key in d
+
+
 def execute_action(__doctype, __name, __action, **kwargs):
 	"""Execute an action on a document (called by background worker)"""
 	doc = frappe.get_doc(__doctype, __name)
@@ -1743,14 +1929,174 @@ def bulk_insert(
 	        - Documents can be any iterable / generator containing Document objects
 	"""
 
-	doctype_meta = frappe.get_meta(doctype)
-	documents = list(documents)
+	_bulk_insert_documents(
+		frappe.get_meta(doctype),
+		list(documents),
+		ignore_duplicates=ignore_duplicates,
+		chunk_size=chunk_size,
+	)
+
+
+def insert_many(
+	documents: Iterable["Document | dict"],
+	ignore_permissions=None,
+	ignore_links=None,
+	ignore_mandatory=None,
+	chunk_size=10_000,
+) -> list["Document"]:
+	"""Insert new documents of the same DocType together.
+
+	Documents go through the same steps as `Document.insert`, except that:
+	        - names are taken from one reserved block of every naming series used
+	        - links of all the documents are validated with one query per linked DocType
+	        - parent and child rows are written with multi-row INSERTs
+	        - only the controller methods listed in `batch_safe_methods` (and their hooks) are run
+
+	Single and virtual DocTypes are inserted one at a time with `Document.insert`.
+
+	:param documents: Documents or dicts of the same DocType to insert.
+	:param ignore_permissions: Do not check permissions if True.
+	:param ignore_links: Do not check validity of links if True.
+	:param ignore_mandatory: Do not check missing mandatory fields if True.
+	"""
+	documents = [get_doc(d) if isinstance(d, dict) else d for d in documents]
+	if not documents:
+		return documents
+
+	doctype = documents[0].doctype
+	if any(doc.doctype != doctype for doc in documents):
+		frappe.throw(_("All documents must be of the same DocType"))
+
+	meta = frappe.get_meta(doctype)
+	if meta.issingle or meta.get("is_virtual") or doctype in DOCTYPES_FOR_DOCTYPE:
+		return [
+			doc.insert(
+				ignore_permissions=ignore_permissions,
+				ignore_links=ignore_links,
+				ignore_mandatory=ignore_mandatory,
+			)
+			for doc in documents
+		]
+
+	for doc in documents:
+		doc.flags.notifications_executed = []
+
+		if ignore_permissions is not None:
+			doc.flags.ignore_permissions = ignore_permissions
+
+		if ignore_links is not None:
+			doc.flags.ignore_links = ignore_links
+
+		if ignore_mandatory is not None:
+			doc.flags.ignore_mandatory = ignore_mandatory
+
+		doc.set("__islocal", True)
+
+		doc.expand_compact_rows()
+		doc._set_defaults()
+		doc.set_user_and_timestamp()
+		doc.set_docstatus()
+		doc.check_permission("create")
+		doc.check_if_latest()
+
+	to_validate = [doc for doc in documents if not doc.flags.ignore_links]
+	if to_validate:
+		invalid_links, cancelled_links = get_invalid_links_in_bulk(
+			[d for doc in to_validate for d in (doc, *doc.get_all_children())],
+			is_submittable=meta.is_submittable,
+		)
+
+		if invalid_links:
+			msg = ", ".join(each[2] for each in invalid_links)
+			frappe.throw(_("Could not find {0}").format(msg), frappe.LinkValidationError)
 
+		if cancelled_links:
+			msg = ", ".join(each[2] for each in cancelled_links)
+			frappe.throw(_("Cannot link cancelled document: {0}").format(msg), frappe.CancelledLinkError)
+
+	with series_block(len(documents)):
+		for doc in documents:
+			doc.run_batch_safe_method("before_insert")
+			doc.set_new_name()
+			doc.set_parent_in_children()
+			doc.validate_higher_perm_levels()
+
+	for doc in documents:
+		doc.flags.in_insert = True
+		doc.run_batch_safe_method("before_validate")
+
+		if not doc.flags.ignore_validate:
+			if doc._action == "submit":
+				doc.run_batch_safe_method("validate", "before_submit")
+			else:
+				doc.run_batch_safe_method("validate", "before_save")
+			doc.set_title_field()
+
+		doc._validate()
+		doc.set_docstatus()
+		doc.flags.in_insert = False
+
+	_bulk_insert_documents(meta, documents, set_user_and_timestamp=False, chunk_size=chunk_size)
+
+	follow_created_documents = not (
+		frappe.flags.in_migrate or frappe.local.flags.in_install or frappe.flags.in_setup_wizard
+	) and frappe.get_cached_value("User", frappe.session.user, "follow_created_documents")
+
+	for doc in documents:
+		doc.run_batch_safe_method("after_insert")
+		doc.flags.in_insert = True
+
+		if doc.get("amended_from"):
+			doc.validate_amended_from()
+			doc.copy_attachments_from_amended_from()
+
+		relink_mismatched_files(doc)
+
+		doc.run_batch_safe_method("on_update")
+		if doc._action == "submit":
+			doc.run_batch_safe_method("on_submit")
+
+		if doc.flags.get("notify_update", True):
+			doc.notify_update()
+
+		update_global_search(doc)
+		doc.save_version()
+		doc.run_batch_safe_method("on_change")
+
+		if (doc.doctype, doc.name) in frappe.flags.currently_saving:
+			frappe.flags.currently_saving.remove((doc.doctype, doc.name))
+
+		doc.flags.in_insert = False
+
+		# delete __islocal
+		if hasattr(doc, "__islocal"):
+			delattr(doc, "__islocal")
+
+		# clear unsaved flag
+		if hasattr(doc, "__unsaved"):
+			delattr(doc, "__unsaved")
+
+		if follow_created_documents:
+			follow_document(doc.doctype, doc.name, frappe.session.user)
+
+	return documents
+
+
+def _bulk_insert_documents(
+	doctype_meta,
+	documents: list["Document"],
+	*,
+	set_user_and_timestamp=True,
+	ignore_duplicates=False,
+	chunk_size=10_000,
+):
 	valid_column_map = {
-		doctype: doctype_meta.get_valid_columns(),
+		doctype_meta.name: doctype_meta.get_valid_columns(),
 	}
 	values_map = {
-		doctype: _document_values_generator(documents, valid_column_map[doctype]),
+		doctype_meta.name: _document_values_generator(
+			documents, valid_column_map[doctype_meta.name], set_user_and_timestamp
+		),
 	}
 
 	for child_table in doctype_meta.get_table_fields():
@@ -1763,6 +2109,7 @@ def bulk_insert(
 				)
 			],
 			valid_column_map[child_table.options],
+			set_user_and_timestamp,
 		)
 
 	for dt, docs in values_map.items():
@@ -1774,10 +2121,12 @@ def bulk_insert(
 def _document_values_generator(
 	documents: Iterable["Document"],
 	columns: list[str],
+	set_user_and_timestamp: bool = True,
 ) -> Generator[tuple[Any], None, None]:
 	for doc in documents:
-		doc.creation = doc.modified = now()
-		doc.owner = doc.modified_by = frappe.session.user
+		if set_user_and_timestamp:
+			doc.creation = doc.modified = now()
+			doc.owner = doc.modified_by = frappe.session.user
 		doc_values = doc.get_valid_dict(
 			convert_dates_to_str=True,
 			ignore_nulls=True,
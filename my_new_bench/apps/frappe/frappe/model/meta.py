@@ -16,6 +16,7 @@ Example:
 """
 
 import json
+import marshal
 import os
 from datetime import datetime
 
@@ -35,7 +36,9 @@ from frappe.model.base_document import (
 	DOCTYPE_TABLE_FIELDS,
 	TABLE_DOCTYPES_FOR_DOCTYPE,
 	BaseDocument,
+	get_controller,
 )
+from frappe.model.docstatus import DocStatus
 from frappe.model.document import Document
 from frappe.model.workflow import get_workflow_name
 from frappe.modules import load_doctype_module
@@ -62,13 +65,19 @@ DEFAULT_FIELD_LABELS = {
 LARGE_TABLE_SIZE_THRESHOLD = 100_000
 LARGE_TABLE_RECENCY_THRESHOLD = 30  # days
 
+# Compiled meta is built on migrate, see `build_compiled_meta`
+COMPILED_META_KEY = "compiled_doctype_meta"
+COMPILED_META_FORMAT = 1
+
 
 def get_meta(doctype, cached=True) -> "Meta":
 	cached = cached and isinstance(doctype, str)
 	if cached and (meta := frappe.cache.hget("doctype_meta", doctype)):
 		return meta
 
-	meta = Meta(doctype)
+	if not (cached and (meta := load_compiled_meta(doctype))):
+		meta = Meta(doctype)
+
 	frappe.cache.hset("doctype_meta", meta.name, meta)
 	return meta
 
@@ -77,6 +86,105 @@ def load_meta(doctype):
 	return Meta(doctype)
 
 
+def build_compiled_meta(doctypes=None):
+	"""Compile meta of all DocTypes so that cold workers don't have to rebuild it from the database."""
+	if doctypes is None:
+		doctypes = frappe.get_all("DocType", pluck="name")
+
+	for doctype in doctypes:
+		frappe.cache.hset(COMPILED_META_KEY, doctype, compile_meta(Meta(doctype)))
+
+
+def compile_meta(meta: "Meta") -> bytes:
+	"""Returns the processed meta as plain values serialized with `marshal`.
+
+	Restoring it only creates the objects, like unpickling would, without running
+	the queries and processing of `Meta.process`.
+	"""
+	return marshal.dumps(
+		{
+			"format": COMPILED_META_FORMAT,
+			"modified": cstr(meta.modified),
+			"state": _get_compiled_state(meta),
+			"tables": {
+				fieldname: [_get_compiled_state(d) for d in meta.get(fieldname) or ()]
+				for fieldname in TABLE_DOCTYPES_FOR_DOCTYPE
+			},
+		}
+	)
+
+
+def load_compiled_meta(doctype) -> "Meta | None":
+	"""Returns the compiled meta of `doctype` if it was built for its current version."""
+	if not (data := frappe.cache.hget(COMPILED_META_KEY, doctype)):
+		return
+
+	try:
+		compiled = marshal.loads(data)
+	except (EOFError, ValueError, TypeError):
+		compiled = None
+
+	if (
+		not isinstance(compiled, dict)
+		or compiled.get("format") != COMPILED_META_FORMAT
+		or compiled["modified"] != cstr(frappe.db.get_value("DocType", doctype, "modified"))
+	):
+		frappe.cache.hdel(COMPILED_META_KEY, doctype)
+		return
+
+	meta = _restore_compiled_state(Meta, compiled["state"])
+	for fieldname, rows in compiled["tables"].items():
+		meta.__dict__[fieldname] = [
+			_restore_compiled_state(get_controller(state["doctype"]), (state, datetimes))
+			for state, datetimes in rows
+		]
+
+	meta.init_field_caches()
+	return meta
+
+
+def _get_compiled_state(doc: BaseDocument) -> tuple[dict, list[str]]:
+	"""Returns the pickled state of `doc` with the values `marshal` supports,
+	along with the keys of datetime values which are stored as strings."""
+	state, datetimes = {}, []
+	for key, value in doc.__getstate__().items():
+		if key in TABLE_DOCTYPES_FOR_DOCTYPE and doc.doctype == "DocType":
+			continue
+
+		if isinstance(value, datetime):
+			datetimes.append(key)
+			value = str(value)
+		elif isinstance(value, DocStatus):
+			value = int(value)
+		elif isinstance(value, frappe._dict):
+			value = dict(value)
+
+		try:
+			marshal.dumps(value)
+		except ValueError:
+			# documents and other objects, rebuilt on load
+			continue
+
+		state[key] = value
+
+	return state, datetimes
+
+
+def _restore_compiled_state(cls, compiled_state: tuple[dict, list[str]]):
+	state, datetimes = compiled_state
+	for key in datetimes:
+		state[key] = get_datetime(state[key])
+
+	if "docstatus" in state:
+		state["docstatus"] = DocStatus(state["docstatus"] or 0)
+
+	state["flags"] = frappe._dict(state.get("flags") or {})
+
+	doc = cls.__new__(cls)
+	doc.__dict__.update(state)
+	return doc
+
+
 def get_table_columns(doctype):
 	return frappe.db.get_table_columns(doctype)
 
@@ -3,9 +3,12 @@
 
 import base64
 import datetime
+import os
 import re
+import threading
 import time
 from collections.abc import Callable
+from contextlib import contextmanager
 from typing import TYPE_CHECKING, Optional
 
 import frappe
@@ -23,6 +26,10 @@ if TYPE_CHECKING:
 NAMING_SERIES_PATTERN = re.compile(r"^[\w\- \/.#{}]+$", re.UNICODE)
 BRACED_PARAMS_PATTERN = re.compile(r"(\{[\w | #]+\})")
 
+# numbers reserved by this worker process, see `get_series_block_size`
+_worker_series_blocks: dict[tuple[int, str, str], "frappe._dict"] = {}
+_worker_series_lock = threading.Lock()
+
 
 # Types that can be using in naming series fields
 NAMING_SERIES_PART_TYPES = (
@@ -390,21 +397,128 @@ def determine_consecutive_week_number(datetime):
 
 
 def getseries(key, digits):
+	series_blocks = getattr(frappe.local, "series_blocks", None)
+	if (block_size := get_series_block_size(key)) > 1:
+		current = _get_from_worker_block(key, block_size)
+	elif series_blocks is None:
+		current = _increment_series(key, 1)
+	else:
+		# use the numbers reserved by `series_block`, reserve the next block when exhausted
+		block = series_blocks.get(key)
+		if not block or block.current >= block.end:
+			size = frappe.local.series_block_size
+			end = _increment_series(key, size)
+			block = series_blocks[key] = frappe._dict(current=end - size, end=end)
+
+		block.current += 1
+		current = block.current
+
+	return ("%0" + str(digits) + "d") % current
+
+
+def _increment_series(key, count):
+	"""Increments the series by `count` and returns the new current value"""
 	# series created ?
 	# Using frappe.qb as frappe.get_values does not allow order_by=None
 	series = DocType("Series")
 	current = (frappe.qb.from_(series).where(series.name == key).for_update().select("current")).run()
 
 	if current and current[0][0] is not None:
-		current = current[0][0]
 		# yes, update it
-		frappe.db.sql("UPDATE `tabSeries` SET `current` = `current` + 1 WHERE `name`=%s", (key,))
-		current = cint(current) + 1
-	else:
-		# no, create it
-		frappe.db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, 1)", (key,))
-		current = 1
-	return ("%0" + str(digits) + "d") % current
+		frappe.db.sql("UPDATE `tabSeries` SET `current` = `current` + %s WHERE `name`=%s", (count, key))
+		return cint(current[0][0]) + count
+
+	# no, create it
+	frappe.db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, %s)", (key, count))
+	return count
+
+
+def get_series_block_size(key: str) -> int:
+	"""Returns how many numbers of the series each worker reserves at once.
+
+	Set with `naming_series_block_size` in site config, either for all series or per
+	series prefix, e.g. `{"ACC-SINV-": 50}`. Numbers reserved by a worker are not
+	used by any other, so names aren't sequential across workers and numbers left
+	unused when a worker stops are skipped.
+	"""
+	config = frappe.conf.get("naming_series_block_size")
+	if not isinstance(config, dict):
+		return cint(config)
+
+	if prefixes := [prefix for prefix in config if key.startswith(prefix)]:
+		return cint(config[max(prefixes, key=len)])
+
+	return 0
+
+
+def _get_from_worker_block(key, size):
+	block_key = (os.getpid(), frappe.local.site, key)
+	with _worker_series_lock:
+		block = _worker_series_blocks.get(block_key)
+		if not block or block.current >= block.end:
+			end = _reserve_worker_block(key, size)
+			block = _worker_series_blocks[block_key] = frappe._dict(current=end - size, end=end)
+
+		block.current += 1
+		return block.current
+
+
+def _reserve_worker_block(key, size):
+	"""Reserves the next `size` numbers of the series in a separate transaction,
+	so that the series isn't locked until the current transaction ends."""
+	from frappe.database import get_db
+
+	db = frappe.local.db
+	frappe.local.db = get_db(
+		socket=frappe.conf.db_socket,
+		host=frappe.conf.db_host,
+		port=frappe.conf.db_port,
+		user=frappe.conf.db_name,
+		password=frappe.conf.db_password,
+		cur_db_name=frappe.conf.db_name,
+	)
+	try:
+		end = _increment_series(key, size)
+		frappe.db.commit()
+	finally:
+		frappe.db.close()
+		frappe.local.db = db
+
+	return end
+
+
+@contextmanager
+def series_block(size: int):
+	"""Reserve naming series numbers `size` at a time for the documents named within this block.
+
+	Every series used is updated once per `size` names instead of once per name. Numbers
+	left unused are given back on exit, if no other transaction has taken numbers after them.
+
+	Usage:
+	        with series_block(len(docs)):
+	                for doc in docs:
+	                        set_new_name(doc)
+	"""
+	if getattr(frappe.local, "series_blocks", None) is not None or cint(size) <= 1:
+		yield
+		return
+
+	frappe.local.series_blocks = series_blocks = {}
+	frappe.local.series_block_size = cint(size)
+	try:
+		yield
+	finally:
+		frappe.local.series_blocks = None
+		frappe.local.series_block_size = None
+
+	series = DocType("Series")
+	for key, block in series_blocks.items():
+		if block.current < block.end:
+			(
+				frappe.qb.update(series)
+				.set(series.current, block.current)
+				.where((series.name == key) & (series.current == block.end))
+			).run()
 
 
 def revert_series_if_last(key, name, doc=None):
@@ -417,6 +531,9 @@ def revert_series_if_last(key, name, doc=None):
 	2. Use prefix to get the current index of that naming series from Series table
 	3. Then revert the current index.
 
+	For series reserved in blocks by workers (see `get_series_block_size`), the number is
+	given back to this worker's block if it is the last one the worker handed out.
+
 	*For custom naming series:*
 	1. hash can exist anywhere, if it exist in hashes then it take normal flow.
 	2. If hash doesn't exit in hashes, we get the hash from prefix, then update name and prefix accordingly.
@@ -448,6 +565,14 @@ def revert_series_if_last(key, name, doc=None):
 		prefix = parse_naming_series(prefix.split("."), doc=doc)
 
 	count = cint(name.replace(prefix, ""))
+	if get_series_block_size(prefix) > 1:
+		# only the last number handed out by this worker can be given back
+		with _worker_series_lock:
+			block = _worker_series_blocks.get((os.getpid(), frappe.local.site, prefix))
+			if block and block.current == count:
+				block.current -= 1
+		return
+
 	series = DocType("Series")
 	current = (frappe.qb.from_(series).where(series.name == prefix).for_update().select("current")).run()
 
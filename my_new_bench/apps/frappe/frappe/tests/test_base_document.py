@@ -1,4 +1,9 @@
-from frappe.model.base_document import BaseDocument
+import pickle
+import sys
+from unittest.mock import patch
+
+import frappe
+from frappe.model.base_document import BaseDocument, CompactRow, get_controller
 from frappe.tests.utils import FrappeTestCase
 
 
@@ -15,3 +20,31 @@ class TestBaseDocument(FrappeTestCase):
 		doc.docstatus = 2
 		self.assertTrue(doc.docstatus.is_cancelled())
 		self.assertEqual(doc.docstatus, 2)
+
+	def test_compact_rows(self):
+		user = frappe.get_doc("User", "Administrator")
+
+		with patch.object(get_controller("Has Role"), "compact_rows", True):
+			compact_user = frappe.get_doc("User", "Administrator")
+
+		row, compact_row = user.roles[0], compact_user.roles[0]
+		self.assertIsInstance(compact_row, CompactRow)
+		self.assertEqual(compact_row.role, row.role)
+		self.assertEqual(compact_row.get("role"), row.role)
+		self.assertTrue(compact_row.docstatus.is_draft())
+		self.assertEqual(compact_user.as_dict(), user.as_dict())
+		self.assertLess(sys.getsizeof(compact_row), sys.getsizeof(row) + sys.getsizeof(row.__dict__))
+		self.assertIs(compact_row.parent_doc, compact_user)
+		self.assertIs(compact_row.as_document().parent_doc, compact_user)
+		self.assertEqual(compact_row.get_formatted("role"), row.get_formatted("role"))
+
+		# methods that change the row would act on a throwaway document
+		self.assertRaises(AttributeError, getattr, compact_row, "db_set")
+
+		unpickled = pickle.loads(pickle.dumps(compact_user))
+		self.assertEqual(unpickled.roles[0].role, row.role)
+
+		# rows are saved as full child documents
+		compact_user.save()
+		self.assertFalse(any(isinstance(d, CompactRow) for d in compact_user.roles))
+		self.assertEqual(len(frappe.get_doc("User", "Administrator").roles), len(user.roles))
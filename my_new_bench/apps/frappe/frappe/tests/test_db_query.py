@@ -600,6 +600,28 @@ class TestDBQuery(FrappeTestCase):
 		update("Nested DocType", "All", 0, "if_owner", 1)
 		frappe.set_user("Administrator")
 
+	def test_nested_permission_subquery(self):
+		frappe.set_user("Administrator")
+		create_nested_doctype()
+		create_nested_doctype_records()
+		clear_user_permissions_for_doctype("Nested DocType")
+		add_user_permission("Nested DocType", "Level 1 A", "test2@example.com")
+		update("Nested DocType", "All", 0, "if_owner", 0)
+		self.addCleanup(update, "Nested DocType", "All", 0, "if_owner", 1)
+
+		frappe.set_user("test2@example.com")
+		inlined = DatabaseQuery("Nested DocType").execute(order_by="name")
+		with patch("frappe.model.db_query.USER_PERMISSION_SUBQUERY_THRESHOLD", 0):
+			query = DatabaseQuery("Nested DocType").execute(order_by="name", run=0)
+			semi_joined = DatabaseQuery("Nested DocType").execute(order_by="name")
+
+		frappe.set_user("Administrator")
+		self.assertIn("`tabUser Permission`", query)
+		self.assertNotIn("'Level 2 A'", query)
+		self.assertEqual(semi_joined, inlined)
+		self.assertIn({"name": "Level 2 A"}, semi_joined)
+		self.assertNotIn({"name": "Level 1 B"}, semi_joined)
+
 	def test_filter_sanitizer(self):
 		self.assertRaises(
 			frappe.DataError,
@@ -8,9 +8,10 @@ import frappe
 from frappe.app import make_form_dict
 from frappe.core.doctype.doctype.test_doctype import new_doctype
 from frappe.desk.doctype.note.note import Note
+from frappe.model.base_document import get_invalid_links_in_bulk
 from frappe.model.naming import make_autoname, parse_naming_series, revert_series_if_last
 from frappe.tests.utils import FrappeTestCase, timeout
-from frappe.utils import cint, now_datetime, set_request
+from frappe.utils import cint, get_datetime, now_datetime, set_request
 from frappe.website.serve import get_response
 
 from . import update_system_settings
@@ -178,6 +179,87 @@ class TestDocument(FrappeTestCase):
 
 		self.assertEqual(frappe.db.get_value("User", d.name), d.name)
 
+	def test_link_validation_query_count(self):
+		doc = frappe.new_doc("Role Profile")
+		doc.role_profile = frappe.generate_hash()
+		for role in frappe.get_all("Role", pluck="name", limit=20):
+			doc.append("roles", {"role": role})
+		doc.check_if_latest()
+
+		frappe.db.value_cache.clear()
+		# all child rows link to Role, checked with one query
+		with self.assertQueryCount(1):
+			doc._validate_links()
+
+		# links found in bulk are cached like the ones looked up one by one
+		with self.assertQueryCount(0):
+			doc._validate_links()
+
+		doc.append("roles", {"role": "_missing_role"})
+		self.assertRaises(frappe.LinkValidationError, doc._validate_links)
+
+	def test_lazy_doc(self):
+		doc = frappe.get_doc("User", "Administrator")
+		table_fields = [df.fieldname for df in doc.meta.get_table_fields()]
+
+		with self.assertQueryCount(1):
+			lazy_doc = frappe.get_lazy_doc("User", "Administrator")
+			self.assertEqual(lazy_doc.email, doc.email)
+
+		# each table is loaded on first access
+		with self.assertQueryCount(1):
+			self.assertEqual(len(lazy_doc.roles), len(doc.roles))
+			self.assertEqual(len(lazy_doc.get("roles")), len(doc.roles))
+
+		self.assertEqual(lazy_doc.as_dict(), doc.as_dict())
+		self.assertTrue(all(fieldname in lazy_doc.__dict__ for fieldname in table_fields))
+
+		# appending keeps the rows in the database
+		lazy_doc = frappe.get_lazy_doc("User", "Administrator")
+		lazy_doc.append("roles", {"role": "Blogger"})
+		self.assertEqual(len(lazy_doc.roles), len(doc.roles) + 1)
+
+	def test_lazy_doc_with_fields(self):
+		doc = frappe.get_doc("User", "Administrator")
+
+		lazy_doc = frappe.get_lazy_doc("User", "Administrator", fields=["first_name"])
+		self.assertNotIn("email", lazy_doc.__dict__)
+		self.assertEqual(lazy_doc.first_name, doc.first_name)
+
+		# other fields are loaded together when one of them is accessed
+		with self.assertQueryCount(1):
+			self.assertEqual(lazy_doc.email, doc.email)
+			self.assertEqual(lazy_doc.get("last_name"), doc.last_name)
+
+		lazy_doc = frappe.get_lazy_doc("User", "Administrator", fields=["first_name"])
+		self.assertEqual(lazy_doc.get_valid_dict(), doc.get_valid_dict())
+
+	def test_save_updates_changed_rows_only(self):
+		roles = frappe.get_all("Role", pluck="name", limit=3, order_by="name")
+		doc = frappe.new_doc("Role Profile")
+		doc.role_profile = frappe.generate_hash()
+		doc.append("roles", {"role": roles[0]})
+		doc.append("roles", {"role": roles[1]})
+		doc.insert()
+
+		def get_row(name):
+			return frappe.db.get_value("Has Role", name, ["role", "modified"], as_dict=True)
+
+		changed_row, unchanged_row = doc.roles
+		unchanged_row_modified = get_row(unchanged_row.name).modified
+
+		changed_row.role = roles[2]
+		doc.save()
+
+		self.assertEqual(get_row(changed_row.name).role, roles[2])
+		self.assertEqual(get_row(changed_row.name).modified, get_datetime(doc.modified))
+		self.assertEqual(get_row(unchanged_row.name).modified, unchanged_row_modified)
+
+		# removed rows are still deleted
+		doc.remove(unchanged_row)
+		doc.save()
+		self.assertFalse(frappe.db.exists("Has Role", unchanged_row.name))
+
 	def test_validate(self):
 		d = self.test_insert()
 		d.starts_on = "2014-01-01"
@@ -572,3 +654,48 @@ class TestDocumentWebView(FrappeTestCase):
 		)
 		self.assertEqual(sent_docs - all_docs, set(), "All docs should be inserted")
 		self.assertEqual(sent_child_docs - all_child_docs, set(), "All child docs should be inserted")
+
+	def test_insert_many(self):
+		docs = frappe.insert_many(
+			[
+				{"doctype": "ToDo", "description": f"insert_many {i}", "allocated_to": "Administrator"}
+				for i in range(5)
+			]
+		)
+
+		self.assertEqual(len({doc.name for doc in docs}), 5)
+		for doc in docs:
+			self.assertFalse(doc.is_new())
+			self.assertEqual(frappe.db.get_value("ToDo", doc.name, "description"), doc.description)
+			self.assertEqual(doc.owner, frappe.session.user)
+
+		# links of all the documents are validated with one query per linked doctype
+		linked_doctypes = {link[1] for doc in docs for link in doc.get_links_to_validate()}
+		with self.assertQueryCount(len(linked_doctypes)):
+			get_invalid_links_in_bulk(docs)
+
+		with self.assertRaises(frappe.LinkValidationError):
+			frappe.insert_many(
+				[
+					{"doctype": "ToDo", "description": "valid link", "allocated_to": "Administrator"},
+					{"doctype": "ToDo", "description": "invalid link", "allocated_to": "_missing_user"},
+				]
+			)
+
+		with self.assertRaises(frappe.ValidationError):
+			frappe.insert_many(
+				[{"doctype": "ToDo", "description": "todo"}, {"doctype": "Note", "title": "note"}]
+			)
+
+	def test_insert_many_runs_batch_safe_methods(self):
+		with (
+			patch.object(Note, "batch_safe_methods", ("validate",), create=True),
+			patch.object(Note, "before_insert", create=True) as before_insert,
+		):
+			docs = frappe.insert_many(
+				[frappe.get_doc(doctype="Note", title=frappe.generate_hash()) for _ in range(3)]
+			)
+
+		# declared methods run for every document, others do not
+		self.assertTrue(all(doc.content == "<span></span>" for doc in docs))
+		before_insert.assert_not_called()
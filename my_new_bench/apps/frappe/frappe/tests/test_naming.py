@@ -3,6 +3,7 @@
 
 import time
 import unittest
+from unittest.mock import patch
 
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_full_jitter
 
@@ -17,6 +18,7 @@ from frappe.model.naming import (
 	make_autoname,
 	parse_naming_series,
 	revert_series_if_last,
+	series_block,
 )
 from frappe.query_builder.utils import db_type_is
 from frappe.tests.test_query_builder import run_only_if
@@ -215,6 +217,47 @@ class TestNaming(FrappeTestCase):
 
 		frappe.db.delete("Series", {"name": series})
 
+	def test_series_block(self):
+		series = "TEST-BLOCK-"
+		frappe.db.delete("Series", {"name": series})
+
+		def get_current():
+			return frappe.db.get_value("Series", series, "current", order_by=None)
+
+		with series_block(10):
+			names = [make_autoname("TEST-BLOCK-.#####") for _ in range(3)]
+			# whole block is reserved with the first name
+			self.assertEqual(get_current(), 10)
+
+		self.assertEqual(names, ["TEST-BLOCK-00001", "TEST-BLOCK-00002", "TEST-BLOCK-00003"])
+		# unused numbers are released on exit
+		self.assertEqual(get_current(), 3)
+
+		with series_block(2):
+			names = [make_autoname("TEST-BLOCK-.#####") for _ in range(3)]
+
+		self.assertEqual(names, ["TEST-BLOCK-00004", "TEST-BLOCK-00005", "TEST-BLOCK-00006"])
+		self.assertEqual(get_current(), 6)
+		frappe.db.delete("Series", {"name": series})
+
+	def test_worker_series_block(self):
+		series = f"TEST-WORKER-{frappe.generate_hash(length=5)}-"
+		key = series + ".#####"
+
+		with patch.dict(frappe.conf, {"naming_series_block_size": {"TEST-WORKER-": 5}}):
+			names = [make_autoname(key) for _ in range(6)]
+			# last number handed out by the worker is reused
+			revert_series_if_last(key, names[-1])
+			self.assertEqual(make_autoname(key), names[-1])
+
+		self.assertEqual(names, [f"{series}{i:05d}" for i in range(1, 7)])
+
+		# blocks are reserved in their own transactions
+		frappe.db.rollback()
+		self.assertEqual(frappe.db.get_value("Series", series, "current", order_by=None), 10)
+		frappe.db.delete("Series", {"name": series})
+		frappe.db.commit()
+
 	def test_naming_for_cancelled_and_amended_doc(self):
 		submittable_doctype = frappe.get_doc(
 			{
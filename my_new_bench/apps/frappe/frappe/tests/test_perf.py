@@ -59,6 +59,35 @@ class TestPerformance(FrappeTestCase):
 		with self.assertQueryCount(0):
 			frappe.get_meta("User")
 
+	def test_compiled_meta(self):
+		from frappe.model.meta import COMPILED_META_KEY, Meta, build_compiled_meta
+
+		build_compiled_meta(["User"])
+		frappe.cache.hdel("doctype_meta", "User")
+		frappe.local.cache.clear()
+
+		# only the version check
+		with self.assertQueryCount(1):
+			meta = frappe.get_meta("User")
+
+		expected = Meta("User")
+		self.assertEqual(meta.as_dict(), expected.as_dict())
+		self.assertEqual(meta.get_valid_columns(), expected.get_valid_columns())
+		self.assertEqual(meta.get_field("email").fieldname, "email")
+		self.assertEqual(
+			[df.fieldname for df in meta.get_table_fields()],
+			[df.fieldname for df in expected.get_table_fields()],
+		)
+
+		# outdated compiled meta is discarded
+		frappe.db.set_value("DocType", "User", "modified", frappe.utils.now(), update_modified=False)
+		frappe.cache.hdel("doctype_meta", "User")
+		frappe.local.cache.clear()
+		frappe.get_meta("User")
+		self.assertFalse(frappe.cache.hexists(COMPILED_META_KEY, "User"))
+		frappe.db.rollback()
+		frappe.clear_cache(doctype="User")
+
 	def test_permitted_fieldnames(self):
 		frappe.clear_cache()
 
@@ -175,6 +204,58 @@ class TestPerformance(FrappeTestCase):
 		with self.assertQueryCount(1):
 			frappe.get_list("User")
 
+	def build_todo_list_query(self):
+		return frappe.get_list(
+			"ToDo",
+			fields=["name", "status", "count(name) as total", "`tabToDo`.`description`"],
+			filters={"status": "Open"},
+			group_by="status",
+			order_by="`tabToDo`.`modified` desc",
+			run=0,
+		)
+
+	def test_get_list_build_validation_cache(self):
+		"""Building a repeated get_list query should not validate the same fields again."""
+		from frappe.model.db_query import _validate_field, _validate_order_by_and_group_by
+
+		_validate_field.cache_clear()
+		_validate_order_by_and_group_by.cache_clear()
+
+		self.build_todo_list_query()
+		field_cache, order_by_cache = (
+			_validate_field.cache_info(),
+			_validate_order_by_and_group_by.cache_info(),
+		)
+		self.assertGreater(field_cache.misses, 0)
+		self.assertGreater(order_by_cache.misses, 0)
+
+		self.build_todo_list_query()
+		self.assertEqual(_validate_field.cache_info().misses, field_cache.misses)
+		self.assertEqual(_validate_order_by_and_group_by.cache_info().misses, order_by_cache.misses)
+		self.assertGreater(_validate_field.cache_info().hits, field_cache.hits)
+		self.assertGreater(_validate_order_by_and_group_by.cache_info().hits, order_by_cache.hits)
+
+	def test_get_list_build_throughput(self):
+		"""Benchmark of the get_list query build with cold and warm validation caches.
+
+		The rates are only reported, timings are too noisy on shared runners to assert on."""
+		from frappe.model.db_query import _validate_field, _validate_order_by_and_group_by
+
+		def build_queries(count, cold):
+			start = time.perf_counter()
+			for _ in range(count):
+				if cold:
+					_validate_field.cache_clear()
+					_validate_order_by_and_group_by.cache_clear()
+				self.build_todo_list_query()
+			return count / (time.perf_counter() - start)
+
+		self.build_todo_list_query()  # warm up
+		cold_qps = build_queries(500, cold=True)
+		warm_qps = build_queries(500, cold=False)
+
+		print(f"get_list query build: {cold_qps:.0f}/s uncached, {warm_qps:.0f}/s cached")
+
 	def test_no_ifnull_checks(self):
 		query = frappe.get_all("DocType", {"autoname": ("is", "set")}, run=0).lower()
 		self.assertNotIn("coalesce", query)
@@ -1,4 +1,6 @@
 import functools
+import pickle
+import time
 from unittest.mock import patch
 
 import redis
@@ -8,6 +10,7 @@ from frappe.tests.utils import FrappeTestCase
 from frappe.utils import get_bench_id
 from frappe.utils.background_jobs import get_redis_conn
 from frappe.utils.redis_queue import RedisQueue
+from frappe.utils.redis_wrapper import ProcessCache
 
 
 def version_tuple(version):
@@ -75,3 +78,81 @@ class TestRedisAuth(FrappeTestCase):
 
 		frappe.conf.update({"bench_id": bench_id})
 		conn.acl_deluser(username)
+
+
+def wait_until(condition, timeout=5):
+	deadline = time.monotonic() + timeout
+	while not condition():
+		if time.monotonic() > deadline:
+			raise TimeoutError
+		time.sleep(0.05)
+
+
+class TestProcessCache(FrappeTestCase):
+	def setUp(self):
+		patcher = patch("frappe.utils.redis_wrapper._process_cache_enabled", True)
+		patcher.start()
+		self.addCleanup(patcher.stop)
+
+	def test_process_cache_invalidation(self):
+		process_cache = frappe.cache.process_cache
+		wait_until(lambda: process_cache.subscribed)
+
+		name, field = "doctype_meta", "_Test Process Cache"
+		redis_key = (frappe.cache.make_key(name), field)
+		self.addCleanup(frappe.cache.hdel, name, field)
+
+		frappe.cache.hset(name, field, "original")
+		frappe.local.cache = {}
+		self.assertEqual(frappe.cache.hget(name, field), "original")
+		self.assertEqual(process_cache.get(redis_key), "original")
+
+		# written by some other client, without invalidation
+		redis.Redis.hset(frappe.cache, redis_key[0], field, pickle.dumps("changed"))
+		frappe.local.cache = {}
+		self.assertEqual(frappe.cache.hget(name, field), "original")
+
+		# invalidation published by another process
+		frappe.cache.publish(ProcessCache.channel, pickle.dumps([redis_key]))
+		wait_until(lambda: process_cache.get(redis_key) is None)
+		frappe.local.cache = {}
+		self.assertEqual(frappe.cache.hget(name, field), "changed")
+
+	def test_process_cache_hash_invalidation(self):
+		process_cache = frappe.cache.process_cache
+		wait_until(lambda: process_cache.subscribed)
+
+		frappe.cache.hset("defaults", "_Test Process Cache", {"value": 1})
+		frappe.local.cache = {}
+		frappe.cache.hget("defaults", "_Test Process Cache")
+		self.assertTrue(process_cache.get((frappe.cache.make_key("defaults"), "_Test Process Cache")))
+
+		frappe.cache.hdel("defaults", "_Test Process Cache")
+		frappe.local.cache = {}
+		self.assertIsNone(frappe.cache.hget("defaults", "_Test Process Cache"))
+
+	def test_cached_documents_are_not_shared(self):
+		process_cache = frappe.cache.process_cache
+		wait_until(lambda: process_cache.subscribed)
+
+		frappe.clear_document_cache("User", "Administrator")
+		frappe.get_cached_doc("User", "Administrator")
+		self.assertFalse(any("document_cache::" in str(key) for key in process_cache.data))
+
+	def test_disabled_process_cache_publishes_invalidations(self):
+		process_cache = frappe.cache.process_cache
+		wait_until(lambda: process_cache.subscribed)
+
+		frappe.cache.hset("defaults", "_Test Process Cache", {"value": 1})
+		self.addCleanup(frappe.cache.hdel, "defaults", "_Test Process Cache")
+		frappe.local.cache = {}
+		frappe.cache.hget("defaults", "_Test Process Cache")
+		redis_key = (frappe.cache.make_key("defaults"), "_Test Process Cache")
+		self.assertTrue(process_cache.get(redis_key))
+
+		# like a background job, which doesn't keep the tier
+		with patch("frappe.utils.redis_wrapper._process_cache_enabled", False):
+			self.assertIsNone(frappe.cache.process_cache)
+			frappe.cache.hset("defaults", "_Test Process Cache", {"value": 2})
+
+		wait_until(lambda: process_cache.get(redis_key) is None)
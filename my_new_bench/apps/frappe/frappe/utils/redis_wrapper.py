@@ -1,13 +1,17 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
+import os
 import pickle
 import re
+import threading
+import time
+from collections import OrderedDict
 
 import redis
 from redis.commands.search import Search
 
 import frappe
-from frappe.utils import cstr
+from frappe.utils import cint, cstr
 
 
 class RedisearchWrapper(Search):
@@ -24,6 +28,142 @@ class RedisearchWrapper(Search):
 		return super().sugget(self.client.make_key(key), *args, **kwargs)
 
 
+_process_cache_lock = threading.Lock()
+_process_cache_enabled = False
+
+
+def enable_process_cache():
+	"""Use the process cache tier in this process and the processes forked from it.
+
+	Only long-lived processes like web workers enable it. Background jobs run in short-lived
+	forked processes, where starting the listener thread costs more than the cache saves."""
+	global _process_cache_enabled
+	_process_cache_enabled = True
+
+
+class ProcessCache:
+	"""In-memory copy of selected Redis keys, shared by all requests served by a worker process.
+
+	Only keys of `key_families` are kept, up to `maxsize` entries evicted in LRU order.
+	RedisWrapper publishes every such key it overwrites or deletes on `channel`, and each
+	process drops its copy when the message arrives. Values are shared between requests,
+	so they must be treated as read-only.
+	"""
+
+	channel = "process_cache_invalidation"
+	key_families = (b"doctype_meta", b"defaults")
+
+	def __init__(self, client: "RedisWrapper", maxsize: int):
+		self.client = client
+		self.maxsize = maxsize
+		self.data = OrderedDict()
+		self.lock = threading.Lock()
+		self.pid = os.getpid()
+		# bumped on every invalidation, see `set`
+		self.generation = 0
+		# values are only cached while invalidations can be received
+		self.subscribed = False
+
+		threading.Thread(target=self.listen, daemon=True).start()
+
+	@classmethod
+	def is_cached_key(cls, key: bytes | str | tuple) -> bool:
+		if isinstance(key, tuple):
+			key = key[0]
+
+		if isinstance(key, str):
+			key = key.encode()
+
+		return key.split(b"|", 1)[-1].startswith(cls.key_families)
+
+	def get(self, key: bytes | tuple):
+		if not self.subscribed:
+			return None
+
+		with self.lock:
+			value = self.data.get(key)
+			if value is not None:
+				self.data.move_to_end(key)
+
+		return value
+
+	def set(self, key: bytes | tuple, value, generation: int):
+		"""Cache a value read from Redis when `generation` was current.
+
+		If any key was invalidated since, the value may already be stale and is not kept."""
+		if value is None or not self.subscribed or not self.is_cached_key(key):
+			return
+
+		with self.lock:
+			if generation != self.generation:
+				return
+
+			self.data[key] = value
+			self.data.move_to_end(key)
+			if len(self.data) > self.maxsize:
+				self.data.popitem(last=False)
+
+	def invalidate(self, keys: list[bytes | tuple]):
+		"""Drop keys locally and in all the other processes.
+
+		A key can be a Redis key or a tuple of (hash name, field). A Redis key also drops
+		the cached fields of the hash with that name."""
+		keys = [key for key in keys if self.is_cached_key(key)]
+		if not keys:
+			return
+
+		self.evict(keys)
+		self.publish(self.client, keys)
+
+	@classmethod
+	def publish(cls, client: "RedisWrapper", keys: list[bytes | tuple]):
+		"""Drop keys in all the processes listening for invalidations"""
+		try:
+			client.publish(cls.channel, pickle.dumps(keys))
+		except redis.exceptions.ConnectionError:
+			pass
+
+	def evict(self, keys: list[bytes | tuple]):
+		with self.lock:
+			self.generation += 1
+			names = set()
+			for key in keys:
+				self.data.pop(key, None)
+				if not isinstance(key, tuple):
+					names.add(key)
+
+			if names:
+				for key in [k for k in self.data if isinstance(k, tuple) and k[0] in names]:
+					del self.data[key]
+
+	def clear(self):
+		with self.lock:
+			self.generation += 1
+			self.data.clear()
+
+	def listen(self):
+		while True:
+			pubsub = self.client.pubsub()
+			try:
+				pubsub.subscribe(self.channel)
+				for message in pubsub.listen():
+					if message["type"] == "subscribe":
+						self.subscribed = True
+					elif message["type"] == "message":
+						self.evict(pickle.loads(message["data"]))
+
+			except Exception:
+				pass
+
+			finally:
+				# invalidations may be missed until subscribed again
+				self.subscribed = False
+				self.clear()
+				pubsub.close()
+
+			time.sleep(1)
+
+
 class RedisWrapper(redis.Redis):
 	"""Redis client that will automatically prefix conf.db_name"""
 
@@ -38,6 +178,38 @@ class RedisWrapper(redis.Redis):
 		"""WARNING: Added for backward compatibility to support frappe.cache().method(...)"""
 		return self
 
+	@property
+	def process_cache(self) -> ProcessCache | None:
+		"""Cache tier that outlives `frappe.local.cache`, see `enable_process_cache`.
+
+		Disabled by setting `process_cache_size` to 0."""
+		if not _process_cache_enabled:
+			return None
+
+		process_cache = getattr(self, "_process_cache", None)
+
+		# the listener thread does not survive a fork
+		if process_cache is None or process_cache.pid != os.getpid():
+			maxsize = cint(frappe.conf.get("process_cache_size", 1024))
+			if not maxsize:
+				return None
+
+			with _process_cache_lock:
+				process_cache = getattr(self, "_process_cache", None)
+				if process_cache is None or process_cache.pid != os.getpid():
+					process_cache = self._process_cache = ProcessCache(self, maxsize)
+
+		return process_cache
+
+	def invalidate_process_cache(self, keys: list[bytes | tuple]):
+		"""Drop keys from the process cache tier of this and every other process.
+
+		Invalidations are published even where the tier is disabled, like in background jobs."""
+		if process_cache := self.process_cache:
+			process_cache.invalidate(keys)
+		elif keys := [key for key in keys if ProcessCache.is_cached_key(key)]:
+			ProcessCache.publish(self, keys)
+
 	def make_key(self, key, user=None, shared=False):
 		if shared:
 			return key
@@ -71,6 +243,8 @@ class RedisWrapper(redis.Redis):
 		except redis.exceptions.ConnectionError:
 			return None
 
+		self.invalidate_process_cache([key])
+
 	def get_value(self, key, generator=None, user=None, expires=False, shared=False):
 		"""Returns cache value. If not found and generator function is
 		        given, it will call the generator.
@@ -83,11 +257,16 @@ class RedisWrapper(redis.Redis):
 		key = self.make_key(key, user, shared)
 
 		local_cache = frappe.local.cache
+		process_cache = None if expires else self.process_cache
 		if key in local_cache:
 			val = local_cache[key]
 
+		elif process_cache and (val := process_cache.get(key)) is not None:
+			local_cache[key] = val
+
 		else:
 			val = None
+			generation = process_cache.generation if process_cache else None
 			try:
 				val = self.get(key)
 			except redis.exceptions.ConnectionError:
@@ -95,6 +274,8 @@ class RedisWrapper(redis.Redis):
 
 			if val is not None:
 				val = pickle.loads(val)
+				if process_cache:
+					process_cache.set(key, val, generation)
 
 			if not expires:
 				if val is None and generator:
@@ -150,6 +331,8 @@ class RedisWrapper(redis.Redis):
 		except redis.exceptions.ConnectionError:
 			pass
 
+		self.invalidate_process_cache(keys)
+
 	def lpush(self, key, value):
 		return super().lpush(self.make_key(key), value)
 
@@ -194,6 +377,8 @@ class RedisWrapper(redis.Redis):
 		except redis.exceptions.ConnectionError:
 			pass
 
+		self.invalidate_process_cache([(_name, key)])
+
 	def hexists(self, name: str, key: str, shared: bool = False) -> bool:
 		if key is None:
 			return False
@@ -228,7 +413,13 @@ class RedisWrapper(redis.Redis):
 		if key in local_cache[_name]:
 			return local_cache[_name][key]
 
+		process_cache = self.process_cache
+		if process_cache and (value := process_cache.get((_name, key))) is not None:
+			local_cache[_name][key] = value
+			return value
+
 		value = None
+		generation = process_cache.generation if process_cache else None
 		try:
 			value = super().hget(_name, key)
 		except redis.exceptions.ConnectionError:
@@ -237,6 +428,8 @@ class RedisWrapper(redis.Redis):
 		if value is not None:
 			value = pickle.loads(value)
 			local_cache[_name][key] = value
+			if process_cache:
+				process_cache.set((_name, key), value, generation)
 		elif generator:
 			value = generator()
 			self.hset(name, key, value, shared=shared)
@@ -253,6 +446,8 @@ class RedisWrapper(redis.Redis):
 		except redis.exceptions.ConnectionError:
 			pass
 
+		self.invalidate_process_cache([(_name, key)])
+
 	def hdel_keys(self, name_starts_with, key):
 		"""Delete hash names with wildcard `*` and key"""
 		for name in self.get_keys(name_starts_with):